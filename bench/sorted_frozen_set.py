@@ -0,0 +1,279 @@
+# pylint: disable=missing-module-docstring
+
+from __future__ import annotations
+
+import os
+import sys
+import json
+import random
+import platform
+from argparse import ArgumentParser, Namespace
+from bisect import bisect_left
+from timeit import Timer
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'coll'))
+
+from frozen_set import SortedFrozenSet  # noqa: E402
+
+
+# Number of probes per lookup benchmark. Lookups are timed as a batch, and
+# reported per probe.
+_PROBES: int = 1000
+
+# Ratio of the timings, beyond which a comparison with a baseline flags a
+# regression.
+_REGRESSION_RATIO: float = 1.1
+
+
+def generate(distribution: str, size: int) -> List[int]:
+    """Returns the input items of the given size, and distribution.
+
+    :param distribution: One of random, sorted, reverse, and duplicates
+    :type distribution: str
+    :param size: Number of items
+    :type size: int
+    :return: Input items
+    :rtype: List[int]
+    """
+    if distribution == 'sorted':
+        return list(range(0, 2 * size, 2))
+    if distribution == 'reverse':
+        return list(range(2 * size - 2, -1, -2))
+    if distribution == 'duplicates':
+        return [random.randrange(max(size // 10, 1)) for _ in range(size)]
+    return [random.randrange(4 * size) for _ in range(size)]
+
+
+def seconds_per_call(func: Callable[[], Any], repeat: int) -> float:
+    """Returns the best time of a single call of the function out of the
+    given number of repetitions. Each repetition calls the function often
+    enough to take at least 0.2 seconds.
+
+    :param func: Function to be timed
+    :type func: Callable[[], Any]
+    :param repeat: Number of repetitions
+    :type repeat: int
+    :return: Seconds per call
+    :rtype: float
+    """
+    timer: Timer = Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def subjects(items: List[int], other: List[int]) -> Dict[str, Dict[str, Any]]:
+    """Returns the operations of each of the compared collections, i.e., the
+    SortedFrozenSet, the builtin frozenset, and a sorted list, over the
+    input items, and the other items, which serve as the second operand of
+    the set algebra.
+
+    :param items: Input items
+    :type items: List[int]
+    :param other: Items of the second operand
+    :type other: List[int]
+    :return: Operations by the name of the collection
+    :rtype: Dict[str, Dict[str, Any]]
+    """
+    s: SortedFrozenSet = SortedFrozenSet(items=items)
+    t: SortedFrozenSet = SortedFrozenSet(items=other)
+    f: frozenset = frozenset(items)
+    g: frozenset = frozenset(other)
+    srt: List[int] = sorted(f)
+    # The comparands are built once, upfront, so that each of the rows
+    # times the operation alone. Each of them is a distinct, but equal
+    # object, which is never hashed, so that no equality is decided by the
+    # cached hashcodes.
+    s_eq: SortedFrozenSet = SortedFrozenSet(items=list(s))
+    s_copy: SortedFrozenSet = SortedFrozenSet(items=list(s))
+    f_copy: frozenset = frozenset(srt)
+    srt_copy: List[int] = list(srt)
+    # The hashcode of a SortedFrozenSet is cached, hence the uncached hash
+    # is timed by discarding the cached one before each call. The hashcode
+    # of a tuple is never cached. The one of the builtin frozenset can not
+    # be discarded, hence only its cached hash is timed.
+    s_hashed: SortedFrozenSet = SortedFrozenSet(items=list(s))
+    srt_tuple: Tuple[int, ...] = tuple(srt)
+    probes: List[int] = [random.randrange(len(srt) * 4 or 1)
+                         for _ in range(_PROBES)]
+    hits: List[int] = [random.choice(srt) for _ in range(_PROBES)] if srt \
+        else []
+    # The batch of the batched lookups is as large as the set itself, which
+    # is where a single merge pass pays off. Batches are timed as a whole.
+    batch: List[int] = [random.randrange(len(srt) * 4 or 1)
+                        for _ in range(len(srt))]
+
+    def uncached_hash() -> int:
+        s_hashed._hash = None  # pylint: disable=protected-access
+        return hash(s_hashed)
+
+    def sorted_index(item: int) -> int:
+        index: int = bisect_left(srt, item)
+        return index if index != len(srt) and srt[index] == item else -1
+
+    return {
+        'SortedFrozenSet': {
+            'construct': lambda: SortedFrozenSet(items=items),
+            'contains': lambda: [p in s for p in probes],
+            'contains_many': lambda: s.contains_many(batch),
+            'index': lambda: list(map(s.index, hits)),
+            'slice': lambda: s[len(s) // 4:len(s) // 2],
+            'hash': uncached_hash,
+            'hash_cached': lambda: hash(s),
+            'eq': lambda: s_eq == s_copy,
+            'and': lambda: s & t,
+            'or': lambda: s | t,
+            'sub': lambda: s - t,
+            'xor': lambda: s ^ t,
+            'intersection': lambda: s.intersection(other),
+            'union': lambda: s.union(other),
+            'difference': lambda: s.difference(other),
+            'symmetric_difference': lambda: s.symmetric_difference(other),
+            'issubset': lambda: s.issubset(other),
+            'issuperset': lambda: s.issuperset(other),
+            'isdisjoint': lambda: s.isdisjoint(t),
+            'le': lambda: s <= t,
+        },
+        'frozenset': {
+            'construct': lambda: frozenset(items),
+            'contains': lambda: [p in f for p in probes],
+            'contains_many': lambda: [p in f for p in batch],
+            'hash_cached': lambda: hash(f),
+            'eq': lambda: f == f_copy,
+            'and': lambda: f & g,
+            'or': lambda: f | g,
+            'sub': lambda: f - g,
+            'xor': lambda: f ^ g,
+            'intersection': lambda: f.intersection(other),
+            'union': lambda: f.union(other),
+            'difference': lambda: f.difference(other),
+            'symmetric_difference': lambda: f.symmetric_difference(other),
+            'issubset': lambda: f.issubset(other),
+            'issuperset': lambda: f.issuperset(other),
+            'isdisjoint': lambda: f.isdisjoint(g),
+            'le': lambda: f <= g,
+        },
+        'sorted_list': {
+            'construct': lambda: sorted(set(items)),
+            'contains': lambda: [sorted_index(p) != -1 for p in probes],
+            'contains_many': lambda: [sorted_index(p) != -1 for p in batch],
+            'index': lambda: list(map(sorted_index, hits)),
+            'slice': lambda: srt[len(srt) // 4:len(srt) // 2],
+            'hash': lambda: hash(srt_tuple),
+            'eq': lambda: srt == srt_copy,
+        },
+    }
+
+
+def run(exponents: List[int], distributions: List[str],
+        operations: List[str], repeat: int) -> List[Dict[str, Any]]:
+    """Runs the benchmarks, and returns their results.
+
+    :param exponents: Sizes as powers of ten
+    :type exponents: List[int]
+    :param distributions: Distributions of the input items
+    :type distributions: List[str]
+    :param operations: Names of the operations, all of them if empty
+    :type operations: List[str]
+    :param repeat: Number of repetitions per benchmark
+    :type repeat: int
+    :return: Results of the benchmarks
+    :rtype: List[Dict[str, Any]]
+    """
+    results: List[Dict[str, Any]] = []
+    for exponent in exponents:
+        size: int = 10 ** exponent
+        for distribution in distributions:
+            items: List[int] = generate(distribution=distribution, size=size)
+            other: List[int] = generate(distribution='random', size=size)
+            for subject, ops in subjects(items=items, other=other).items():
+                for operation, func in ops.items():
+                    if operations and operation not in operations:
+                        continue
+                    seconds: float = seconds_per_call(func=func,
+                                                      repeat=repeat)
+                    if operation in ('contains', 'index'):
+                        seconds /= _PROBES
+                    results.append({
+                        'operation': operation, 'size': size,
+                        'distribution': distribution, 'subject': subject,
+                        'seconds': seconds,
+                    })
+                    print(f'{operation:>20} {size:>10} {distribution:>10} '
+                          f'{subject:>16} {seconds:>12.3e}', flush=True)
+    return results
+
+
+def compare(results: List[Dict[str, Any]],
+            baseline: List[Dict[str, Any]]) -> List[Tuple[str, float]]:
+    """Returns the benchmarks, which have become slower than the baseline
+    by more than the regression ratio, along with their ratios.
+
+    :param results: Results of the benchmarks
+    :type results: List[Dict[str, Any]]
+    :param baseline: Results of the benchmarks of the baseline
+    :type baseline: List[Dict[str, Any]]
+    :return: Names of the regressed benchmarks, and their ratios
+    :rtype: List[Tuple[str, float]]
+    """
+    def name(result: Dict[str, Any]) -> str:
+        return '{subject}.{operation}[{size}, {distribution}]'.format(
+            **result
+        )
+
+    before: Dict[str, float] = {
+        name(result): result['seconds'] for result in baseline
+    }
+    return [
+        (name(result), result['seconds'] / before[name(result)])
+        for result in results
+        if name(result) in before and
+        result['seconds'] > before[name(result)] * _REGRESSION_RATIO
+    ]
+
+
+def main(args: Namespace) -> None:
+    random.seed(args.seed)
+    results: List[Dict[str, Any]] = run(
+        exponents=list(range(args.min_exp, args.max_exp + 1)),
+        distributions=args.distributions, operations=args.operations,
+        repeat=args.repeat
+    )
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump({
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'results': results,
+        }, file, indent=1)
+    print(f'Results written to {args.output}')
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            regressions: List[Tuple[str, float]] = compare(
+                results=results, baseline=json.load(file)['results']
+            )
+        for benchmark, ratio in regressions:
+            print(f'REGRESSION {benchmark}: {ratio:.2f}x slower')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    parser: ArgumentParser = ArgumentParser(
+        description='Benchmarks the SortedFrozenSet against the builtin '
+                    'frozenset, and sorted lists.'
+    )
+    parser.add_argument('--min-exp', type=int, default=2,
+                        help='smallest size as a power of ten')
+    parser.add_argument('--max-exp', type=int, default=5,
+                        help='largest size as a power of ten, e.g., 7')
+    parser.add_argument('--distributions', nargs='+',
+                        default=['random', 'sorted', 'reverse', 'duplicates'])
+    parser.add_argument('--operations', nargs='*', default=[],
+                        help='operations to run, all of them by default')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--baseline',
+                        help='results of a previous run to compare against')
+    main(args=parser.parse_args())
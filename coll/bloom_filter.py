@@ -0,0 +1,107 @@
+# pylint: disable=missing-module-docstring
+
+from __future__ import annotations
+
+from typing import Any, Iterator, Optional
+from collections.abc import Sequence
+from math import ceil, log
+
+
+# Multiplier of the Fibonacci hashing, which spreads the hashcodes of small
+# integers, which are the integers themselves, over all the 64 bits.
+_MULTIPLIER: int = 0x9E3779B97F4A7C15
+_MASK: int = (1 << 64) - 1
+
+
+class BloomFilter:
+    """Approximate membership filter over the items of a sequence. A lookup
+    of an item, which is not contained, is rejected by the filter with the
+    probability of 1 - error_rate, while a lookup of a contained item always
+    passes. The filter sets k bits per item in a bit array sized for the
+    error rate, and derives the k positions from two halves of a single
+    hashcode by the double hashing.
+
+    Building the filter can be deferred to its first lookup. The filter
+    counts the lookups, which it has rejected as hits, and the ones, which
+    it has passed on as misses, out of which the false positives are
+    counted by the owner of the filter, which completes the lookup.
+    """
+
+    __slots__ = ('_seq', '_error_rate', '_size', '_hashes', '_bits',
+                 'hits', 'misses', 'false_positives')
+
+    _seq: Optional[Sequence]
+    _error_rate: float
+    _size: int
+    _hashes: int
+    _bits: Optional[bytearray]
+    hits: int
+    misses: int
+    false_positives: int
+
+    def __init__(self, seq: Sequence, error_rate: float = 0.01,
+                 lazy: bool = False) -> None:
+        if not 0 < error_rate < 1:
+            raise ValueError('error_rate must be between 0 and 1')
+        n: int = max(len(seq), 1)
+        # The optimal number of bits, and of hash functions for n items at
+        # the given false positive rate.
+        self._size = max(ceil(-n * log(error_rate) / log(2) ** 2), 8)
+        self._hashes = max(round(self._size / n * log(2)), 1)
+        self._error_rate = error_rate
+        self._seq = seq
+        self._bits = None
+        self.hits = 0
+        self.misses = 0
+        self.false_positives = 0
+        if not lazy:
+            self._build()
+
+    def _build(self) -> None:
+        bits: bytearray = bytearray((self._size + 7) // 8)
+        for item in self._seq:
+            for pos in self._positions(item):
+                bits[pos >> 3] |= 1 << (pos & 7)
+        self._bits = bits
+        # The items are no longer needed, once their bits are set.
+        self._seq = None
+
+    def _positions(self, item: Any) -> Iterator[int]:
+        h: int = (hash(item) * _MULTIPLIER) & _MASK
+        h1: int = h >> 32
+        h2: int = (h & 0xFFFFFFFF) | 1
+        size: int = self._size
+        return ((h1 + i * h2) % size for i in range(self._hashes))
+
+    @property
+    def error_rate(self) -> float:
+        return self._error_rate
+
+    @property
+    def built(self) -> bool:
+        return self._bits is not None
+
+    @property
+    def nbytes(self) -> int:
+        # Memory taken by the bit array, once it is built.
+        return (self._size + 7) // 8
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + (
+            self._bits.__sizeof__() if self._bits is not None else 0
+        )
+
+    def __contains__(self, item: Any) -> bool:
+        if self._bits is None:
+            self._build()
+        bits: bytearray = self._bits
+        for pos in self._positions(item):
+            if not bits[pos >> 3] >> (pos & 7) & 1:
+                self.hits += 1
+                return False
+        self.misses += 1
+        return True
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,211 @@
+# pylint: disable=missing-module-docstring
+
+from __future__ import annotations
+
+from typing import Iterable, Any, Iterator, Union, List, Tuple
+from collections.abc import Sequence
+from itertools import accumulate, chain, count, islice
+from operator import add
+from bisect import bisect_right
+from array import array
+
+
+# Number of items per block. Only a single block is ever decoded in order to
+# access an item, hence the block size trades the cost of decoding against
+# the memory taken by the headers.
+_BLOCK_SIZE: int = 128
+
+
+def _encode(block: Sequence) -> Tuple[int, bytes]:
+    """Encodes the items of a block following the first one as the gaps
+    between the consecutive items, bit-packed at the width of the largest
+    gap. Since the items are distinct, each gap is reduced by one, so that a
+    dense run of items takes no bytes at all.
+
+    :param block: Sorted, and distinct integers
+    :type block: Sequence
+    :return: Width of a gap in bits, and the packed gaps
+    :rtype: Tuple[int, bytes]
+    """
+    gaps: List[int] = [b - a - 1 for a, b in zip(block, block[1:])]
+    width: int = max(gaps, default=0).bit_length()
+    packed: int = 0
+    for gap in reversed(gaps):
+        packed = (packed << width) | gap
+    return width, packed.to_bytes((width * len(gaps) + 7) // 8, 'little')
+
+
+def _decode(head: int, width: int, raw: bytes, size: int) -> Tuple[int, ...]:
+    """Decodes the items of a block, which has been encoded by _encode.
+
+    :param head: First item of the block
+    :type head: int
+    :param width: Width of a gap in bits
+    :type width: int
+    :param raw: Packed gaps
+    :type raw: bytes
+    :param size: Number of items in the block
+    :type size: int
+    :return: Items of the block
+    :rtype: Tuple[int, ...]
+    """
+    if not width:
+        return tuple(range(head, head + size))
+    packed: int = int.from_bytes(raw, 'little')
+    mask: int = (1 << width) - 1
+    gaps: Iterator[int] = (
+        (packed >> shift) & mask
+        for shift in range(0, width * (size - 1), width)
+    )
+    # Adding the position of each item makes up for the reduced gaps.
+    return tuple(map(add, accumulate(gaps, initial=head), count()))
+
+
+class DeltaStorage(Sequence):
+    """Compressed storage for sorted, and distinct integers. The integers are
+    split into blocks of a fixed size. The header of each block holds its
+    first item, while the remaining items are stored as the bit-packed gaps
+    between the consecutive items, i.e., a frame of reference encoding of the
+    deltas. The headers serve as the skip index, i.e., a search for an item
+    bisects the headers, and decodes the single block, which may hold it.
+    """
+
+    __slots__ = ('_block_size', '_len', '_heads', '_widths', '_offsets',
+                 '_data', '_cached')
+
+    _block_size: int
+    _len: int
+    _heads: array
+    _widths: array
+    _offsets: array
+    _data: bytes
+    _cached: Tuple[int, Tuple[int, ...]]
+
+    def __init__(self, items: Iterable = (),
+                 block_size: int = _BLOCK_SIZE) -> None:
+        # The items must be sorted, and distinct integers already.
+        if block_size < 1:
+            raise ValueError('block_size must be positive')
+        self._block_size = block_size
+        self._len = 0
+        self._heads = array('q')
+        self._widths = array('B')
+        self._offsets = array('Q', [0])
+        data: bytearray = bytearray()
+        it: Iterator = iter(items)
+        while True:
+            block: Tuple[int, ...] = tuple(islice(it, block_size))
+            if not block:
+                break
+            width, raw = _encode(block)
+            self._heads.append(block[0])
+            self._widths.append(width)
+            data += raw
+            self._offsets.append(len(data))
+            self._len += len(block)
+        self._data = bytes(data)
+        self._cached = (-1, ())
+
+    def __reduce__(self) -> Tuple[Any, tuple]:
+        # The decoded block is a cache, which is not worth pickling.
+        return _from_encoded, (self._block_size, self._len, self._heads,
+                               self._widths, self._offsets, self._data)
+
+    def __sizeof__(self) -> int:
+        return (object.__sizeof__(self) + self._heads.__sizeof__() +
+                self._widths.__sizeof__() + self._offsets.__sizeof__() +
+                self._data.__sizeof__())
+
+    @property
+    def block_size(self) -> int:
+        return self._block_size
+
+    def _block(self, block: int) -> Tuple[int, ...]:
+        # Decodes the block. The most recently decoded block is cached, so
+        # that the binary search within a block, as well as a merge walking
+        # the items one by one, decode each block only once.
+        cached_block, items = self._cached
+        if cached_block != block:
+            start: int = block * self._block_size
+            items = _decode(
+                head=self._heads[block], width=self._widths[block],
+                raw=self._data[self._offsets[block]:self._offsets[block + 1]],
+                size=min(self._block_size, self._len - start)
+            )
+            self._cached = (block, items)
+        return items
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator:
+        return chain.from_iterable(map(self._block, range(len(self._heads))))
+
+    def __reversed__(self) -> Iterator:
+        return chain.from_iterable(
+            map(reversed, map(self._block, reversed(range(len(self._heads)))))
+        )
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            rng: range = range(self._len)[index]
+            if rng.step == 1 and rng:
+                first: int = rng.start // self._block_size
+                last: int = (rng.stop - 1) // self._block_size
+                return tuple(islice(
+                    chain.from_iterable(map(self._block,
+                                            range(first, last + 1))),
+                    rng.start - first * self._block_size,
+                    rng.stop - first * self._block_size
+                ))
+            return tuple(map(self.__getitem__, rng))
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError('DeltaStorage index out of range')
+        block, pos = divmod(index, self._block_size)
+        return self._block(block)[pos]
+
+    def search_bounds(self, item: Any) -> Tuple[int, int]:
+        # Returns the positions, between which the insertion point of the
+        # item lies, i.e., the bounds of the only block, which may hold the
+        # item. A bisection within these bounds decodes only that block.
+        block: int = bisect_right(self._heads, item) - 1
+        if block < 0:
+            return 0, 0
+        start: int = block * self._block_size
+        return start, min(start + self._block_size, self._len)
+
+
+def _from_encoded(block_size: int, length: int, heads: array, widths: array,
+                  offsets: array, data: bytes) -> DeltaStorage:
+    """Restores a pickled DeltaStorage from its encoded blocks.
+
+    :param block_size: Number of items per block
+    :type block_size: int
+    :param length: Number of items
+    :type length: int
+    :param heads: First item of each block
+    :type heads: array
+    :param widths: Width of the gaps of each block
+    :type widths: array
+    :param offsets: Offsets of the packed gaps of each block
+    :type offsets: array
+    :param data: Packed gaps of all the blocks
+    :type data: bytes
+    :return: Restored DeltaStorage
+    :rtype: DeltaStorage
+    """
+    storage: DeltaStorage = DeltaStorage.__new__(DeltaStorage)
+    storage._block_size = block_size  # noqa
+    storage._len = length  # noqa
+    storage._heads = heads  # noqa
+    storage._widths = widths  # noqa
+    storage._offsets = offsets  # noqa
+    storage._data = data  # noqa
+    storage._cached = (-1, ())  # noqa
+    return storage
+
+
+if __name__ == '__main__':
+    pass
@@ -2,43 +2,1193 @@
 
 from __future__ import annotations
 
-from typing import Iterable, Tuple, Any, Iterator, Union, List
-from collections.abc import Sequence, Set
-from itertools import chain
-from bisect import bisect_left
+from typing import Iterable, Any, Iterator, Union, List, Optional, Tuple
+from typing import Callable
+import sys
+import os
+from collections.abc import Sequence, Set, Sized
+from bisect import bisect_left, bisect_right
+from itertools import groupby, chain, islice, repeat
+from functools import reduce
+from array import array
+from collections import OrderedDict
+from weakref import WeakValueDictionary
+from pickle import PickleBuffer
+from concurrent.futures import ProcessPoolExecutor, Future
+from time import perf_counter
+from persistent_tree import PersistentTree
+from delta_storage import DeltaStorage
+from roaring_storage import RoaringStorage
+from bloom_filter import BloomFilter
+import mapped_storage
+
+
+# When one operand of a set algebra operation is this many times larger than
+# the other, we stop walking the larger one element by element, and instead
+# gallop over it using exponential search.
+_GALLOP_RATIO: int = 8
+
+# Number of items per chunk, which build_parallel sorts in a worker process,
+# when the number of items is not known upfront.
+_PARALLEL_CHUNK_SIZE: int = 1 << 20
+
+# Number of items per chunk, which storages of different kinds are compared
+# by, when testing them for equality.
+_EQUALITY_CHUNK_SIZE: int = 4096
+
+# An operand of the set algebra, which is not roaring, is converted into a
+# roaring storage to meet a roaring operand only when it is at most this
+# many times smaller. Converting a larger operand costs more than decoding
+# the roaring operand, and merging both.
+_ROARING_CONVERT_RATIO: int = 4
+
+
+def _gallop_left(seq: Sequence, item: Any, lo: int) -> int:
+    """Returns the leftmost index in the sorted sequence at or after lo, where
+    item could be inserted preserving the order. Unlike a plain bisect over
+    [lo, len(seq)), the search window is grown exponentially from lo, so the
+    cost is logarithmic in the distance travelled rather than in the length
+    of the sequence.
+
+    :param seq: Sorted sequence of distinct items
+    :type seq: Sequence
+    :param item: Item to be located
+    :type item: Any
+    :param lo: Index from which the search begins
+    :type lo: int
+    :return: Insertion index of the item
+    :rtype: int
+    """
+    n: int = len(seq)
+    hi: int = lo
+    step: int = 1
+    while hi < n and seq[hi] < item:
+        lo = hi + 1
+        hi += step
+        step <<= 1
+    return bisect_left(seq, item, lo, min(hi, n))
+
+
+# The merge functions below accept any storage of a SortedFrozenSet. They
+# read the items by their positions, and extend their results with the
+# remaining run of either of the sequences by slicing it, hence a storage
+# must return a Sequence of the items, e.g., a tuple, upon slicing.
+def _merge_intersection(a: Sequence, b: Sequence) -> List[Any]:
+    """Returns the sorted items common to both of the sorted sequences.
+
+    :param a: Sorted sequence of distinct items
+    :type a: Sequence
+    :param b: Sorted sequence of distinct items
+    :type b: Sequence
+    :return: Sorted list of common items
+    :rtype: List[Any]
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    res: List[Any] = []
+    nb: int = len(b)
+    if len(a) * _GALLOP_RATIO < nb:
+        j: int = 0
+        for x in a:
+            j = _gallop_left(b, x, j)
+            if j == nb:
+                break
+            if b[j] == x:
+                res.append(x)
+                j += 1
+        return res
+    i: int = 0
+    j = 0
+    na: int = len(a)
+    while i < na and j < nb:
+        x: Any = a[i]
+        y: Any = b[j]
+        if x < y:
+            i += 1
+        elif y < x:
+            j += 1
+        else:
+            res.append(x)
+            i += 1
+            j += 1
+    return res
+
+
+def _merge_union(a: Sequence, b: Sequence) -> List[Any]:
+    """Returns the sorted items, that belong to either of the sorted
+    sequences.
+
+    :param a: Sorted sequence of distinct items
+    :type a: Sequence
+    :param b: Sorted sequence of distinct items
+    :type b: Sequence
+    :return: Sorted list of distinct items from both sequences
+    :rtype: List[Any]
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    res: List[Any] = []
+    nb: int = len(b)
+    j: int = 0
+    if len(a) * _GALLOP_RATIO < nb:
+        for x in a:
+            k: int = _gallop_left(b, x, j)
+            res.extend(b[j:k])
+            if k < nb and b[k] == x:
+                k += 1
+            res.append(x)
+            j = k
+        res.extend(b[j:])
+        return res
+    i: int = 0
+    na: int = len(a)
+    while i < na and j < nb:
+        x: Any = a[i]
+        y: Any = b[j]
+        if x < y:
+            res.append(x)
+            i += 1
+        elif y < x:
+            res.append(y)
+            j += 1
+        else:
+            res.append(x)
+            i += 1
+            j += 1
+    res.extend(a[i:])
+    res.extend(b[j:])
+    return res
+
+
+def _merge_difference(a: Sequence, b: Sequence) -> List[Any]:
+    """Returns the sorted items of the first sequence, which are not present
+    in the second one.
+
+    :param a: Sorted sequence of distinct items
+    :type a: Sequence
+    :param b: Sorted sequence of distinct items
+    :type b: Sequence
+    :return: Sorted list of items only present in a
+    :rtype: List[Any]
+    """
+    res: List[Any] = []
+    na: int = len(a)
+    nb: int = len(b)
+    i: int = 0
+    j: int = 0
+    if na * _GALLOP_RATIO < nb:
+        for x in a:
+            j = _gallop_left(b, x, j)
+            if j == nb or b[j] != x:
+                res.append(x)
+        return res
+    if nb * _GALLOP_RATIO < na:
+        for y in b:
+            k: int = _gallop_left(a, y, i)
+            res.extend(a[i:k])
+            i = k + 1 if (k < na and a[k] == y) else k
+        res.extend(a[i:])
+        return res
+    while i < na and j < nb:
+        x: Any = a[i]
+        y: Any = b[j]
+        if x < y:
+            res.append(x)
+            i += 1
+        elif y < x:
+            j += 1
+        else:
+            i += 1
+            j += 1
+    res.extend(a[i:])
+    return res
+
+
+def _merge_symmetric_difference(a: Sequence, b: Sequence) -> List[Any]:
+    """Returns the sorted items, which are present in exactly one of the
+    sorted sequences.
+
+    :param a: Sorted sequence of distinct items
+    :type a: Sequence
+    :param b: Sorted sequence of distinct items
+    :type b: Sequence
+    :return: Sorted list of items present in either, but not both sequences
+    :rtype: List[Any]
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    res: List[Any] = []
+    nb: int = len(b)
+    j: int = 0
+    if len(a) * _GALLOP_RATIO < nb:
+        for x in a:
+            k: int = _gallop_left(b, x, j)
+            res.extend(b[j:k])
+            if k < nb and b[k] == x:
+                k += 1
+            else:
+                res.append(x)
+            j = k
+        res.extend(b[j:])
+        return res
+    i: int = 0
+    na: int = len(a)
+    while i < na and j < nb:
+        x: Any = a[i]
+        y: Any = b[j]
+        if x < y:
+            res.append(x)
+            i += 1
+        elif y < x:
+            res.append(y)
+            j += 1
+        else:
+            i += 1
+            j += 1
+    res.extend(a[i:])
+    res.extend(b[j:])
+    return res
+
+
+def _merge_issubset(a: Sequence, b: Sequence) -> bool:
+    """Returns True if every item of the first sorted sequence is also present
+    in the second one, False otherwise. The walk stops at the first item,
+    that proves otherwise.
+
+    :param a: Sorted sequence of distinct items
+    :type a: Sequence
+    :param b: Sorted sequence of distinct items
+    :type b: Sequence
+    :return: If a is a subset of b
+    :rtype: bool
+    """
+    na: int = len(a)
+    nb: int = len(b)
+    if na == 0:
+        return True
+    # A subset can neither be larger than its superset, nor can it reach
+    # beyond the bounds of the superset.
+    if na > nb or a[0] < b[0] or b[-1] < a[-1]:
+        return False
+    j: int = 0
+    if na * _GALLOP_RATIO < nb:
+        for x in a:
+            j = _gallop_left(b, x, j)
+            if j == nb or b[j] != x:
+                return False
+            j += 1
+        return True
+    for x in a:
+        while b[j] < x:
+            j += 1
+        if b[j] != x:
+            return False
+        j += 1
+    return True
+
+
+def _merge_isdisjoint(a: Sequence, b: Sequence) -> bool:
+    """Returns True if the sorted sequences have no item in common, False
+    otherwise. The walk stops at the first common item.
+
+    :param a: Sorted sequence of distinct items
+    :type a: Sequence
+    :param b: Sorted sequence of distinct items
+    :type b: Sequence
+    :return: If a and b are disjoint
+    :rtype: bool
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    na: int = len(a)
+    nb: int = len(b)
+    # Sequences, whose ranges do not overlap, can not have common items.
+    if na == 0 or a[-1] < b[0] or b[-1] < a[0]:
+        return True
+    j: int = 0
+    if na * _GALLOP_RATIO < nb:
+        for x in a:
+            j = _gallop_left(b, x, j)
+            if j == nb:
+                return True
+            if b[j] == x:
+                return False
+        return True
+    i: int = 0
+    while i < na and j < nb:
+        x: Any = a[i]
+        y: Any = b[j]
+        if x < y:
+            i += 1
+        elif y < x:
+            j += 1
+        else:
+            return False
+    return True
+
+
+def _merge_union_all(seqs: List[Sequence]) -> List[Any]:
+    """Returns the union of the sorted sequences as a sorted list. The
+    sequences are merged all at once. Their concatenation consists of one
+    sorted run per sequence, which the sort detects, and merges as runs in
+    O(n log k) time for k sequences. An item shared by several of them ends
+    up adjacent to its duplicates, which are dropped.
+
+    :param seqs: Sorted sequences of distinct items
+    :type seqs: List[Sequence]
+    :return: Sorted, and distinct items of the union
+    :rtype: List[Any]
+    """
+    return [key for key, _ in groupby(sorted(chain.from_iterable(seqs)))]
+
+
+def _merge_intersection_all(seqs: List[Sequence]) -> List[Any]:
+    """Returns the intersection of the sorted sequences as a sorted list. The
+    sequences are intersected in the order of their lengths, starting with
+    the two smallest ones. The candidates shrink with each step, and once
+    they are much fewer than the items of the next sequence, the merge
+    gallops over that sequence instead of walking it item by item.
+
+    :param seqs: Sorted sequences of distinct items
+    :type seqs: List[Sequence]
+    :return: Sorted, and distinct items of the intersection
+    :rtype: List[Any]
+    """
+    seqs = sorted(seqs, key=len)
+    if not seqs:
+        return []
+    candidates: Sequence = seqs[0]
+    for seq in seqs[1:]:
+        if not candidates:
+            break
+        candidates = _merge_intersection(candidates, seq)
+    return list(candidates)
+
+
+def _sorted_run(chunk: Sequence, typecode: Optional[str]) -> Sequence:
+    """Returns the distinct items of the chunk in sorted order. This is the
+    unit of work, which build_parallel hands to a worker process.
+
+    :param chunk: Items of a SortedFrozenSet
+    :type chunk: Sequence
+    :param typecode: Typecode of the compact numeric storage if available
+    :type typecode: Optional[str]
+    :return: Sorted, and distinct items of the chunk
+    :rtype: Sequence
+    """
+    srt: List[Any] = sorted(set(chunk))
+    return array(typecode, srt) if typecode is not None else srt
+
+
+def _rank_many(seq: Sequence, keys: List[Any],
+               search: Callable[[Sequence, Any], int],
+               right: bool = False) -> List[int]:
+    """Returns the insertion index of each of the keys in the sorted sequence.
+    When the keys are about as many as the items, the keys are sorted, and
+    merged with the sequence in a single pass, which takes O(n + k log k)
+    time. Otherwise, each of the keys is located by the search function of
+    the sequence, whose calls are driven by map, rather than by a Python
+    loop, and which takes O(k log n) time.
+
+    :param seq: Sorted sequence of distinct items
+    :type seq: Sequence
+    :param keys: Keys to be located
+    :type keys: List[Any]
+    :param search: Search function of the sequence, which is consistent with
+        the right flag
+    :type search: Callable[[Sequence, Any], int]
+    :param right: If the rightmost insertion indices are wanted
+    :type right: bool
+    :return: Insertion index of each key, in the order of the keys
+    :rtype: List[int]
+    """
+    n: int = len(seq)
+    k: int = len(keys)
+    if n > k * _GALLOP_RATIO or k > n * _GALLOP_RATIO:
+        return list(map(search, repeat(seq, k), keys))
+    ranks: List[int] = [0] * k
+    it: Iterator = iter(seq)
+    item: Any = next(it, None)
+    rank: int = 0
+    for pos in sorted(range(k), key=keys.__getitem__):
+        key: Any = keys[pos]
+        while rank != n and (item < key or right and not key < item):
+            item = next(it, None)
+            rank += 1
+        ranks[pos] = rank
+    return ranks
+
+
+def _locate_many(seq: Sequence, keys: List[Any],
+                 search: Callable[[Sequence, Any], int]) -> List[int]:
+    """Returns the index of each of the keys in the sorted sequence, -1 for
+    the missing ones, following _rank_many. The merge compares each key with
+    the item, it has stopped at, so that no item is read by its position.
+
+    :param seq: Sorted sequence of distinct items
+    :type seq: Sequence
+    :param keys: Keys to be located
+    :type keys: List[Any]
+    :param search: Leftmost search function of the sequence
+    :type search: Callable[[Sequence, Any], int]
+    :return: Index of each key, in the order of the keys
+    :rtype: List[int]
+    """
+    n: int = len(seq)
+    k: int = len(keys)
+    if n > k * _GALLOP_RATIO or k > n * _GALLOP_RATIO:
+        return [
+            rank if rank != n and seq[rank] == key else -1
+            for key, rank in zip(keys, map(search, repeat(seq, k), keys))
+        ]
+    indices: List[int] = [-1] * k
+    it: Iterator = iter(seq)
+    item: Any = next(it, None)
+    rank: int = 0
+    for pos in sorted(range(k), key=keys.__getitem__):
+        key: Any = keys[pos]
+        while rank != n and item < key:
+            item = next(it, None)
+            rank += 1
+        if rank != n and item == key:
+            indices[pos] = rank
+    return indices
+
+
+def _delta_bisect_left(seq: DeltaStorage, item: Any) -> int:
+    """Returns the leftmost insertion index of the item in the compressed
+    storage. The search is narrowed down to a single block first, so that
+    only that block is decoded.
+
+    :param seq: Compressed storage
+    :type seq: DeltaStorage
+    :param item: Item to be located
+    :type item: Any
+    :return: Insertion index of the item
+    :rtype: int
+    """
+    return bisect_left(seq, item, *seq.search_bounds(item))
+
+
+def _delta_bisect_right(seq: DeltaStorage, item: Any) -> int:
+    """Returns the rightmost insertion index of the item in the compressed
+    storage, following _delta_bisect_left.
+
+    :param seq: Compressed storage
+    :type seq: DeltaStorage
+    :param item: Item to be located
+    :type item: Any
+    :return: Insertion index of the item
+    :rtype: int
+    """
+    return bisect_right(seq, item, *seq.search_bounds(item))
+
+
+def _roaring_bisect_right(seq: RoaringStorage, item: Any) -> int:
+    """Returns the rightmost insertion index of the item in the roaring
+    storage, which ranks the item within a single container.
+
+    :param seq: Roaring storage
+    :type seq: RoaringStorage
+    :param item: Item to be located
+    :type item: Any
+    :return: Insertion index of the item
+    :rtype: int
+    """
+    return seq.rank(item, right=True)
+
+
+def _searches_of(seq: Sequence) -> Tuple[Callable[[Sequence, Any], int],
+                                         Callable[[Sequence, Any], int]]:
+    """Returns the functions, which locate the leftmost, and the rightmost
+    insertion index of an item in the sorted sequence. The kind of the
+    sequence is checked once here, rather than on every search, hence the
+    searches of a tuple or an array are plain calls of the bisect module.
+
+    :param seq: Sorted sequence of distinct items
+    :type seq: Sequence
+    :return: Leftmost, and rightmost search functions
+    :rtype: Tuple[Callable[[Sequence, Any], int], Callable[[Sequence, Any],
+        int]]
+    """
+    if isinstance(seq, DeltaStorage):
+        return _delta_bisect_left, _delta_bisect_right
+    if isinstance(seq, RoaringStorage):
+        return RoaringStorage.rank, _roaring_bisect_right
+    return bisect_left, bisect_right
+
+
+def _same(x: Any, y: Any) -> bool:
+    """Returns True if the items are the same object, or equal, False
+    otherwise, i.e., the equality, which the comparison of tuples applies to
+    their items.
+
+    :param x: Item of a SortedFrozenSet
+    :type x: Any
+    :param y: Item of a SortedFrozenSet
+    :type y: Any
+    :return: If the items are the same, or equal
+    :rtype: bool
+    """
+    return x is y or x == y
+
+
+def _items_equal(a: Sequence, b: Sequence) -> bool:
+    """Returns True if the two sorted sequences hold equal items, False
+    otherwise. Tuples, arrays, memoryviews, and roaring storages are compared
+    directly, other kinds of storage are compared chunk by chunk as tuples.
+    Like the comparison of tuples, an item is equal to itself, even if it
+    does not compare equal, e.g., a NaN.
+
+    :param a: Sorted sequence of distinct items
+    :type a: Sequence
+    :param b: Sorted sequence of distinct items
+    :type b: Sequence
+    :return: If the sequences hold equal items
+    :rtype: bool
+    """
+    if len(a) != len(b):
+        return False
+    if type(a) is type(b) and isinstance(  # noqa
+            a, (tuple, array, memoryview, RoaringStorage)
+    ):
+        return a == b
+    ia: Iterator = iter(a)
+    ib: Iterator = iter(b)
+    while True:
+        chunk: tuple = tuple(islice(ia, _EQUALITY_CHUNK_SIZE))
+        if chunk != tuple(islice(ib, _EQUALITY_CHUNK_SIZE)):
+            return False
+        if not chunk:
+            return True
+
+
+class _SliceStorage(Sequence):
+    """Read-only window over the storage of a SortedFrozenSet. The window is
+    described by a range of indices into the underlying storage, which always
+    has a positive step, so that the window itself remains sorted.
+    """
+
+    __slots__ = ('_base', '_range')
+
+    _base: Sequence
+    _range: range
+
+    def __init__(self, base: Sequence, rng: range) -> None:
+        self._base = base
+        self._range = rng if rng.step > 0 else rng[::-1]
+
+    def __len__(self) -> int:
+        return len(self._range)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        # A contiguous run is sliced directly from the base storage.
+        if isinstance(index, slice):
+            rng: range = self._range[index]
+            if rng.step == 1:
+                return self._base[rng.start:rng.stop]
+            return tuple(map(self._base.__getitem__, rng))
+        return self._base[self._range[index]]
+
+    def __iter__(self) -> Iterator:
+        # Only tuples, and arrays read an item by its position cheaply. Any
+        # other storage, e.g., a roaring one, decodes the window at once.
+        if isinstance(self._base, (tuple, array)):
+            return map(self._base.__getitem__, self._range)
+        return iter(self._run())
+
+    def __reversed__(self) -> Iterator:
+        if isinstance(self._base, (tuple, array)):
+            return map(self._base.__getitem__, reversed(self._range))
+        return reversed(self._run())
+
+    def _run(self) -> Sequence:
+        # Returns the items of the window, sliced from the base storage.
+        rng: range = self._range
+        return self._base[rng.start:rng.stop:rng.step] if rng else ()
+
+
+def _window(storage: Sequence, rng: range) -> Sequence:
+    """Returns a zero-copy window over the positions of the storage given by
+    the range. A window over a range or a memoryview is a range or a
+    memoryview again, and a window over a window is a window over the same
+    underlying storage.
+
+    :param storage: Storage of a SortedFrozenSet
+    :type storage: Sequence
+    :param rng: Positions of the storage covered by the window
+    :type rng: range
+    :return: Window over the storage
+    :rtype: Sequence
+    """
+    if not rng:
+        rng = range(0)
+    elif rng.step < 0:
+        rng = rng[::-1]
+    index: slice = slice(rng.start, rng.stop, rng.step)
+    if isinstance(storage, (range, memoryview)):
+        return storage[index]
+    if isinstance(storage, _SliceStorage):
+        return _SliceStorage(base=storage._base,  # noqa
+                             rng=storage._range[index])  # noqa
+    return _SliceStorage(base=storage, rng=rng)
+
+
+def _sorted_storage_of(items: Any) -> Optional[Sequence]:
+    """Returns a storage for the provided items, which can be adopted without
+    sorting, if they are known to be sorted and distinct, None otherwise. The
+    storage of another SortedFrozenSet without a key function is shared as it
+    is, and a range is stored as a range in increasing order.
+
+    :param items: Items of a SortedFrozenSet
+    :type items: Any
+    :return: Sorted storage of the items if available
+    :rtype: Optional[Sequence]
+    """
+    if isinstance(items, SortedFrozenSet):
+        # The storage of a SortedFrozenSet with a key function is sorted by
+        # the keys, rather than by the items themselves.
+        return items._items if items._keys is None else None  # noqa
+    if isinstance(items, range):
+        return items if items.step > 0 else items[::-1]
+    return None
+
+
+def _typecode_of(storage: Sequence) -> Optional[str]:
+    """Returns the typecode of a compact numeric storage, None if the storage
+    holds Python objects.
+
+    :param storage: Storage of a SortedFrozenSet
+    :type storage: Sequence
+    :return: Typecode of the storage if available
+    :rtype: Optional[str]
+    """
+    if isinstance(storage, array):
+        return storage.typecode
+    if isinstance(storage, memoryview):
+        return storage.format
+    if isinstance(storage, _SliceStorage):
+        return _typecode_of(storage._base)  # noqa
+    return None
+
+
+def _pack(storage: Iterable, typecode: Optional[str],
+          block_size: Optional[int] = None) -> Sequence:
+    """Returns the sorted items as a storage for a SortedFrozenSet. Without a
+    typecode, items other than tuples and ranges are copied into a tuple. With
+    a typecode, items are packed into an array of that typecode. With a block
+    size, integers are compressed into a DeltaStorage instead.
+
+    :param storage: Sorted, and distinct items
+    :type storage: Iterable
+    :param typecode: Typecode of the compact numeric storage
+    :type typecode: Optional[str]
+    :param block_size: Block size of the compressed storage
+    :type block_size: Optional[int]
+    :return: Storage of a SortedFrozenSet
+    :rtype: Sequence
+    """
+    if block_size is not None:
+        return DeltaStorage(items=storage, block_size=block_size)
+    if typecode is None:
+        return (
+            storage
+            if isinstance(storage, (tuple, range))
+            else tuple(storage)
+        )
+    return array(typecode, storage)
+
+
+def _common_typecode(a: Sequence, b: Sequence) -> Optional[str]:
+    """Returns the typecode shared by the compact numeric storages, None if
+    either of them holds Python objects, or they differ in typecode.
+
+    :param a: Storage of a SortedFrozenSet
+    :type a: Sequence
+    :param b: Storage of a SortedFrozenSet
+    :type b: Sequence
+    :return: Common typecode of the storages if available
+    :rtype: Optional[str]
+    """
+    typecode: Optional[str] = _typecode_of(a)
+    return typecode if typecode == _typecode_of(b) else None
+
+
+def _roaring_of(storage: Sequence) -> Optional[RoaringStorage]:
+    """Returns the storage as a roaring storage, if it holds integers only,
+    None otherwise.
+
+    :param storage: Storage of a SortedFrozenSet
+    :type storage: Sequence
+    :return: Roaring storage of the items if available
+    :rtype: Optional[RoaringStorage]
+    """
+    if isinstance(storage, RoaringStorage):
+        return storage
+    if _typecode_of(storage) in tuple('bBhHiIlLqQ') or all(
+            type(item) is int for item in storage  # noqa
+    ):
+        return RoaringStorage(items=storage)
+    return None
+
+
+def _merge_storage_of(storage: Sequence) -> Sequence:
+    """Returns the storage in a form, which the merge functions walk
+    efficiently. A roaring storage, or a window over one, is decoded into a
+    tuple, because locating each of its items by the position takes a search
+    within its container.
+
+    :param storage: Storage of a SortedFrozenSet
+    :type storage: Sequence
+    :return: Storage to be merged
+    :rtype: Sequence
+    """
+    base: Sequence = (
+        storage._base if isinstance(storage, _SliceStorage)  # noqa
+        else storage
+    )
+    return tuple(storage) if isinstance(base, RoaringStorage) else storage
+
+
+def _storage_issubset(a: Sequence, b: Sequence) -> bool:
+    """Returns True if every item of the first storage is also present in the
+    second one, False otherwise. Two roaring storages are compared by their
+    containers. A storage, which is much smaller than a roaring one, probes
+    the membership of each of its items, rather than decoding the roaring
+    one. Otherwise, the storages are merged.
+
+    :param a: Storage of a SortedFrozenSet
+    :type a: Sequence
+    :param b: Storage of a SortedFrozenSet
+    :type b: Sequence
+    :return: If a is a subset of b
+    :rtype: bool
+    """
+    if len(a) > len(b):
+        return False
+    if isinstance(b, RoaringStorage):
+        if isinstance(a, RoaringStorage):
+            return not a - b
+        if len(a) * _GALLOP_RATIO < len(b):
+            return all(map(b.__contains__, a))
+    return _merge_issubset(_merge_storage_of(a), _merge_storage_of(b))
+
+
+def _storage_isdisjoint(a: Sequence, b: Sequence) -> bool:
+    """Returns True if the storages have no item in common, False otherwise,
+    following _storage_issubset.
+
+    :param a: Storage of a SortedFrozenSet
+    :type a: Sequence
+    :param b: Storage of a SortedFrozenSet
+    :type b: Sequence
+    :return: If a and b are disjoint
+    :rtype: bool
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    if isinstance(b, RoaringStorage):
+        if isinstance(a, RoaringStorage):
+            return not a & b
+        if len(a) * _GALLOP_RATIO < len(b):
+            return not any(map(b.__contains__, a))
+    return _merge_isdisjoint(_merge_storage_of(a), _merge_storage_of(b))
+
+
+def _block_size_of(storage: Sequence) -> Optional[int]:
+    """Returns the block size of a compressed storage, None if the storage is
+    not compressed.
+
+    :param storage: Storage of a SortedFrozenSet
+    :type storage: Sequence
+    :return: Block size of the storage if available
+    :rtype: Optional[int]
+    """
+    if isinstance(storage, DeltaStorage):
+        return storage.block_size
+    if isinstance(storage, _SliceStorage):
+        return _block_size_of(storage._base)  # noqa
+    return None
+
+
+def _common_block_size(a: Sequence, b: Sequence) -> Optional[int]:
+    """Returns the block size of the first storage, if both the storages are
+    compressed, None otherwise.
+
+    :param a: Storage of a SortedFrozenSet
+    :type a: Sequence
+    :param b: Storage of a SortedFrozenSet
+    :type b: Sequence
+    :return: Common block size of the storages if available
+    :rtype: Optional[int]
+    """
+    return _block_size_of(a) if _block_size_of(b) is not None else None
 
 
 class SortedFrozenSet(Sequence, Set):
 
-    _items: Tuple[Any]
+    # The abstract base classes declare empty __slots__, hence declaring our
+    # own ones spares each of the instances a __dict__. The __weakref__ slot
+    # allows an intern pool to refer to the instances weakly.
+    __slots__ = ('_items', '_keys', '_key', '_reverse', '_hash',
+                 '_search_left', '_search_right', '_member', '_filter',
+                 '__weakref__')
+
+    _items: Sequence
+    _keys: Optional[Sequence]
+    _key: Optional[Callable[[Any], Any]]
+    _reverse: bool
+    _hash: Optional[int]
+    _search_left: Callable[[Sequence, Any], int]
+    _search_right: Callable[[Sequence, Any], int]
+    _member: Optional[Callable[[Any], bool]]
+    _filter: Optional[BloomFilter]
+
+    def __init__(self, items: Iterable = None,
+                 typecode: Optional[str] = None,
+                 key: Optional[Callable[[Any], Any]] = None,
+                 reverse: bool = False) -> None:
+        self._hash = None
+        self._filter = None
+        self._keys = None
+        self._key = key
+        # Regardless of the order, in which the items are presented, the
+        # storage is always kept in ascending order, so that we can search it
+        # with the bisect module. With the reverse order, positions are
+        # simply mirrored between the storage and the outside world.
+        self._reverse = reverse
+        if key is not None:
+            self._init_with_key(items=items, typecode=typecode)
+            self._init_search()
+            return
+        # The optional typecode opts into a compact storage for homogeneous
+        # numeric items. Instead of a tuple of boxed Python objects, the
+        # items are packed into an array of the given typecode, e.g., 'q'
+        # for 64-bit integers, or 'd' for double precision floats.
+        storage: Optional[Sequence] = _sorted_storage_of(items)
+        if storage is not None and typecode in (None, _typecode_of(storage)):
+            # Another SortedFrozenSet or a range is already sorted and
+            # distinct, hence we can adopt its storage as it is.
+            self._items = storage
+            self._init_search()
+            return
+        if storage is None:
+            storage = sorted(
+                # Using set as an intermediate collection serves an important
+                # purpose. Set is a collection of distinct elements or null.
+                # Using set gets rid of any duplicate items, that the provided
+                # Iterable might have.
+                set(items) if (items is not None)
+                else set()
+            )
+        self._items = _pack(storage=storage, typecode=typecode)
+        self._init_search()
 
-    def __init__(self, items: Iterable = None) -> None:
-        srt: List[Any] = sorted(
-            # Using set as an intermediate collection serves an important
-            # purpose. Set is a collection of distinct elements or null.
-            # Using set gets rid of any duplicate items, that the provided
-            # Iterable might have.
-            set(items) if (items is not None)
-            else set()
+    def _init_search(self) -> None:
+        # Chooses the binary search over our sort keys once, upon the
+        # construction, so that no lookup pays for checking the kind of our
+        # storage.
+        self._search_left, self._search_right = _searches_of(
+            self._sort_keys()
+        )
+        # A roaring storage tests the membership of an item by a single bit
+        # rather than locating its position, which takes a second search
+        # within its container.
+        self._member = (
+            self._items.__contains__
+            if isinstance(self._sort_keys(), RoaringStorage) else None
+        )
+
+    def _init_with_key(self, items: Iterable,
+                       typecode: Optional[str]) -> None:
+        # The key function is called exactly once per distinct item, and the
+        # keys are kept in a storage parallel to the items. Searching only
+        # compares the precomputed keys, and never calls the key function
+        # for the stored items again.
+        distinct: List[Any] = list(set(items) if items is not None else ())
+        keys: List[Any] = list(map(self._key, distinct))
+        # Items with equal keys must not keep the iteration order of the
+        # intermediate set, which depends on the order of the insertions.
+        # Hence, we order them by themselves, or by their hashcodes, when
+        # they are not comparable, before the stable sort by the keys, so
+        # that equal contents always end up in the same order.
+        order: List[int] = list(range(len(distinct)))
+        try:
+            order.sort(key=distinct.__getitem__)
+        except TypeError:
+            order.sort(key=lambda i: hash(distinct[i]))
+        order.sort(key=keys.__getitem__)
+        self._items = _pack(storage=[distinct[i] for i in order],
+                            typecode=typecode)
+        self._keys = tuple(keys[i] for i in order)
+
+    def _from_iterable(self, it: Iterable) -> SortedFrozenSet:
+        # The Set mixins build their results through this method, which by
+        # default is a class method calling cls(it). Since a view can not be
+        # constructed from an Iterable, we always build a plain
+        # SortedFrozenSet, which keeps our order.
+        return SortedFrozenSet(items=it, key=self._key, reverse=self._reverse)
+
+    @classmethod
+    def from_sorted(cls, items: Iterable, validate: bool = True,
+                    typecode: Optional[str] = None) -> SortedFrozenSet:
+        # Builds a SortedFrozenSet from items, which are already in sorted
+        # order, but may contain duplicates, e.g., the output of an index
+        # scan. Duplicates of a sorted Iterable are adjacent to each other,
+        # hence we can drop them, and optionally validate the order in a
+        # single linear pass instead of using the intermediate set, and
+        # sorting.
+        storage: Optional[Sequence] = _sorted_storage_of(items)
+        if storage is not None:
+            return cls.from_sorted_unique(items=storage, typecode=typecode)
+        if not validate:
+            return cls._from_storage(_pack(
+                storage=[key for key, _ in groupby(items)], typecode=typecode
+            ))
+        srt: List[Any] = []
+        for item in items:
+            if srt and not srt[-1] < item:
+                if srt[-1] == item:
+                    continue
+                raise ValueError(f'{item!r} is out of sorted order')
+            srt.append(item)
+        return cls._from_storage(_pack(storage=srt, typecode=typecode))
+
+    @classmethod
+    def from_sorted_unique(cls, items: Iterable,
+                           typecode: Optional[str] = None) -> SortedFrozenSet:
+        # Builds a SortedFrozenSet from items, which are already known to be
+        # sorted and distinct, e.g., the output of one of the merge functions.
+        # The items are trusted as they are, without any validation.
+        storage: Optional[Sequence] = _sorted_storage_of(items)
+        if storage is not None and typecode in (None, _typecode_of(storage)):
+            return cls._from_storage(storage)
+        return cls._from_storage(_pack(
+            storage=storage if storage is not None else items,
+            typecode=typecode
+        ))
+
+    @classmethod
+    def build_parallel(cls, items: Iterable, workers: Optional[int] = None,
+                       typecode: Optional[str] = None,
+                       chunk_size: Optional[int] = None,
+                       timings: Optional[dict] = None) -> SortedFrozenSet:
+        # Builds a SortedFrozenSet from a large number of items using several
+        # processes. The items are split into chunks, which the worker
+        # processes sort, and deduplicate, while the following chunks are
+        # still being read. The sorted runs are merged into the storage at
+        # the end. Numeric chunks travel to, and from the workers as packed
+        # arrays, which are much cheaper to pickle than lists.
+        #
+        # The optional timings dictionary receives the seconds spent in
+        # each of the phases, i.e., reading the chunks, waiting for the
+        # remaining sorts, merging the runs, and the total.
+        workers = workers or os.cpu_count() or 1
+        if chunk_size is None:
+            chunk_size = (
+                max(-(-len(items) // workers), 1) if isinstance(items, Sized)
+                else _PARALLEL_CHUNK_SIZE
+            )
+        started: float = perf_counter()
+        it: Iterator = iter(items)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures: List[Future] = []
+            while True:
+                chunk: Sequence = (
+                    array(typecode, islice(it, chunk_size))
+                    if typecode is not None
+                    else list(islice(it, chunk_size))
+                )
+                if not chunk:
+                    break
+                futures.append(pool.submit(_sorted_run, chunk, typecode))
+            chunked: float = perf_counter()
+            runs: List[Sequence] = [future.result() for future in futures]
+        sorted_: float = perf_counter()
+        result: SortedFrozenSet = cls.from_sorted_unique(
+            items=_merge_union_all(runs), typecode=typecode
+        )
+        merged: float = perf_counter()
+        if timings is not None:
+            timings.update(chunk=chunked - started, sort=sorted_ - chunked,
+                           merge=merged - sorted_, total=merged - started)
+        return result
+
+    @classmethod
+    def intern(cls, items: Iterable) -> SortedFrozenSet:
+        # Returns the canonical instance of the module-wide intern pool, which
+        # is equal to the provided items.
+        return _intern_pool.intern(items=items)
+
+    @classmethod
+    def compressed(cls, items: Iterable,
+                   block_size: int = 128) -> SortedFrozenSet:
+        # Builds a SortedFrozenSet of integers, whose storage is compressed
+        # into blocks of delta encoded, and bit-packed items. Dense runs of
+        # integers, e.g., increasing identifiers, take only a few bits per
+        # item, instead of a boxed Python integer each.
+        storage: Optional[Sequence] = _sorted_storage_of(items)
+        return cls._from_storage(_pack(
+            storage=storage if storage is not None else sorted(set(items)),
+            typecode=None, block_size=block_size
+        ))
+
+    @classmethod
+    def roaring(cls, items: Iterable) -> SortedFrozenSet:
+        # Builds a SortedFrozenSet of integers, whose storage is a roaring
+        # bitmap. The set algebra with another SortedFrozenSet of integers
+        # runs as the bitwise operations over the bitmaps of the two, where
+        # the other storage is converted automatically, unless it is a
+        # roaring storage already.
+        storage: Optional[Sequence] = _sorted_storage_of(items)
+        return cls._from_storage(RoaringStorage(
+            items=storage if storage is not None else sorted(set(items))
+        ))
+
+    @classmethod
+    def open_mmap(cls, path: str) -> SortedFrozenSet:
+        # Opens a file written by save. The file is mapped read-only into the
+        # memory, and our storage reads the items straight from the mapping,
+        # so that opening is near-instant regardless of the size, and the
+        # processes opening the same file share its pages in the page cache.
+        storage, reverse = mapped_storage.open_mapped(path=path)
+        return cls._from_storage(storage, reverse=reverse)
+
+    def save(self, path: str) -> None:
+        # Writes our storage into a compact binary file, which can be opened
+        # with open_mmap. Fixed-width numbers are written as they are packed
+        # in an array, strings and bytes are length-prefixed by their
+        # offsets. Since a key function can not be written, a set ordered by
+        # a key function can not be saved.
+        if self._key is not None:
+            raise TypeError('SortedFrozenSet with a key can not be saved')
+        mapped_storage.save(
+            path=path, items=self._items,
+            kind=mapped_storage.kind_of(items=self._items,
+                                        typecode=_typecode_of(self._items)),
+            reverse=self._reverse
+        )
+
+    @classmethod
+    def _from_storage(cls, storage: Sequence,
+                      keys: Optional[Sequence] = None,
+                      key: Optional[Callable[[Any], Any]] = None,
+                      reverse: bool = False) -> SortedFrozenSet:
+        # We bypass the initializer, because neither the intermediate set
+        # nor the sorting is needed for a storage, which is already sorted.
+        obj: SortedFrozenSet = cls.__new__(cls)
+        obj._items = storage
+        obj._keys = keys
+        obj._key = key
+        obj._reverse = reverse
+        obj._hash = None
+        obj._filter = None
+        obj._init_search()
+        return obj
+
+    def _find(self, item: Any) -> int:
+        # Returns the position of the item in our storage, -1 if the item is
+        # not contained.
+        items: Sequence = self._items
+        if self._keys is None:
+            member: Optional[Callable[[Any], bool]] = self._member
+            if member is not None:
+                return self._search_left(items, item) if member(item) else -1
+            # We first search, which is the right index for inserting the item
+            # so that the sorted order of the collection is preserved.
+            index: int = self._search_left(items, item)
+            # If the index is equal to the length of the self._items, that
+            # would mean, the item is non-existing, and needs to be inserted
+            # at the very end in order to insert the sorted order. And we also
+            # check if the item at the current index is the one, we are
+            # concerned with. This works because the underlying collection is
+            # a collection of distinct elements.
+            return (
+                index if index != len(items) and items[index] == item
+                else -1
+            )
+        # With a key function, we search for the key of the item among the
+        # precomputed keys instead. Distinct items may have equal keys, hence
+        # we check each of the items, whose key is equal.
+        keys: Sequence = self._keys
+        probe: Any = self._key(item)
+        index = self._search_left(keys, probe)
+        while index != len(keys) and not probe < keys[index]:
+            if items[index] == item:
+                return index
+            index += 1
+        return -1
+
+    def _sort_keys(self) -> Sequence:
+        # Returns the ascending sequence, which our searches run over.
+        return self._items if self._keys is None else self._keys
+
+    def _sort_key_of(self, item: Any) -> Any:
+        return item if self._key is None else self._key(item)
+
+    def _position(self, index: int) -> int:
+        # Translates between a position in our storage, and the position of
+        # the same item in our order, which are mirrored in reverse order.
+        return len(self._items) - 1 - index if self._reverse else index
+
+    def _merges_with(self, other: Any) -> bool:
+        # We can merge our storage only with the storage of another
+        # SortedFrozenSet, and only when both are sorted by the items
+        # themselves. The order, in which they are presented, is irrelevant.
+        return (isinstance(other, SortedFrozenSet) and
+                self._keys is None and other._keys is None)  # noqa
+
+    def _roaring_with(self, other: SortedFrozenSet,
+                      op: Callable[[RoaringStorage, RoaringStorage],
+                                   RoaringStorage]
+                      ) -> Optional[SortedFrozenSet]:
+        # Combines the roaring storages, when both of us have one. When only
+        # one of us has one, the other storage is converted, if it holds
+        # integers only, and is small enough for the conversion to pay off.
+        # Returns None otherwise, so that the caller merges the two storages
+        # instead.
+        a: Sequence = self._items
+        b: Sequence = other._items  # noqa
+        a_roaring: bool = isinstance(a, RoaringStorage)
+        b_roaring: bool = isinstance(b, RoaringStorage)
+        if not (a_roaring or b_roaring):
+            return None
+        if a_roaring != b_roaring:
+            small, large = (b, a) if a_roaring else (a, b)
+            if len(small) * _ROARING_CONVERT_RATIO > len(large):
+                return None
+            a, b = _roaring_of(a), _roaring_of(b)
+            if a is None or b is None:
+                return None
+        return SortedFrozenSet._from_storage(op(a, b), reverse=self._reverse)
+
+    def _merged(self, items: List[Any], typecode: Optional[str],
+                block_size: Optional[int] = None) -> SortedFrozenSet:
+        # Builds the result of a merge, which is presented in our order.
+        return SortedFrozenSet._from_storage(
+            _pack(storage=items, typecode=typecode, block_size=block_size),
+            reverse=self._reverse
         )
-        self._items = tuple(srt)
 
     def __contains__(self, item: Any) -> bool:
-        # We first search, which is the right index for inserting the item
-        # so that the sorted order of the collection is preserved.
-        index: int = bisect_left(self._items, item)
-        # If the index is equal to the length of the self._items, that would
-        # mean, the item is non-existing, and needs to be inserted at the very
-        # end in order to insert the sorted order. And we also check if the
-        # item at the current index is the one, we are concerned with. This
-        # works because the underlying collection is a collection of distinct
-        # elements.
-        return index != len(self._items) and self._items[index] == item
+        bloom: Optional[BloomFilter] = self._filter
+        if bloom is None:
+            return self._find(item) != -1
+        # Most of the items, which are not contained, are rejected by the
+        # filter, without searching our storage.
+        if item not in bloom:
+            return False
+        if self._find(item) == -1:
+            bloom.false_positives += 1
+            return False
+        return True
 
     def __len__(self) -> int:
         return len(self._items)
 
     def __iter__(self) -> Iterator:
+        if self._reverse:
+            return reversed(self._items)
         return iter(self._items)
         # Following code is also valid for passing our test case. In this
         # approach we make use of the Generator objects. A function, that
@@ -47,6 +1197,14 @@ class SortedFrozenSet(Sequence, Set):
         # for item in self._items:
         #     yield item
 
+    def __reversed__(self) -> Iterator:
+        # The mixin implementation of the Sequence base class reads the items
+        # by their positions, which some of the storages, e.g., the roaring
+        # one, can not do cheaply. Hence, we iterate the storage instead.
+        if self._reverse:
+            return iter(self._items)
+        return reversed(self._items)
+
     def __getitem__(self, index: Union[int, slice]) -> Any:
         # Since we want to support both indexing and slicing on the
         # SortedFrozenSet object, the passed in index could be either an
@@ -54,12 +1212,18 @@ class SortedFrozenSet(Sequence, Set):
         # simply return the element. However, when index is a slice object
         # we want to return a SortedFrozenSet object. Hence, we need to be
         # careful about, how we treat the provided index object.
-        res = self._items[index]
-        return (
-            SortedFrozenSet(items=res)
-            if isinstance(index, slice)
-            else res
-        )
+        #
+        # A slice of a sorted collection of distinct elements is already
+        # sorted and distinct. Hence, instead of copying the sliced items
+        # into a new SortedFrozenSet, we return a view, which shares our
+        # storage.
+        if isinstance(index, slice):
+            return SortedFrozenSetView(parent=self, index=index)
+        if self._reverse:
+            # Mirroring the index onto our ascending storage also maps the
+            # negative indices, and the out of range ones correctly.
+            return self._items[-1 - index]
+        return self._items[index]
 
     def __repr__(self) -> str:
         # Since we have refactored our internal collection self._items to a
@@ -67,12 +1231,19 @@ class SortedFrozenSet(Sequence, Set):
         # some adjustments here in order to generate the string representation
         # of the object construction. The SortedFrozenSet object is possible
         # to construct with any Iterable such as a list. Our testcases cover
-        # that.
-        return '{type}(items={args})'.format(type=self.__class__.__name__,
+        # that. A view is not constructed from its items, hence it represents
+        # itself as the SortedFrozenSet, which it is equal to, in order to
+        # keep the representation a valid construction.
+        name: str = (
+            SortedFrozenSet.__name__
+            if isinstance(self, SortedFrozenSetView)
+            else self.__class__.__name__
+        )
+        return '{type}(items={args})'.format(type=name,
                                              args=(
                                                  '[{}]'.format(
                                                      ', '.join(map(repr,
-                                                                   self._items))
+                                                                   self))
                                                  )
                                                  if self._items else ''
                                              ))
@@ -84,9 +1255,31 @@ class SortedFrozenSet(Sequence, Set):
         # therefore, we need a completely different equality implementation.
         # Hence, we return the NotImplemented object instead of raising the
         # same.
-        if not isinstance(other, type(self)):
+        if not isinstance(other, SortedFrozenSet):
             return NotImplemented
-        return self._items == other._items # noqa
+        # Before comparing item by item, we rule out the cheap cases. The
+        # same object is always equal to itself. Sets of different lengths,
+        # different smallest or largest items, or different hashcodes, which
+        # are already known, are never equal.
+        if self is other:
+            return True
+        items: Sequence = self._items
+        other_items: Sequence = other._items  # noqa
+        if len(items) != len(other_items):
+            return False
+        if not items:
+            return True
+        if self._reverse != other._reverse:  # noqa
+            # Our storages run in the opposite directions, hence we compare
+            # the items in the order, in which they are presented.
+            return _items_equal(tuple(self), tuple(other))
+        if not (_same(items[0], other_items[0]) and
+                _same(items[-1], other_items[-1])):
+            return False
+        if (self._hash is not None and other._hash is not None  # noqa
+                and self._hash != other._hash):  # noqa
+            return False
+        return _items_equal(items, other_items)
 
     def __hash__(self) -> int:
         # One easy way to create a hashcode out of multiple hashable objects
@@ -94,20 +1287,102 @@ class SortedFrozenSet(Sequence, Set):
         # tuple. However, in this case we would also change the type of the
         # internal self._items to a tuple instead, because list objects is
         # mutable in Python, and should not have a hash value.
-        return hash(
-            (type(self), self._items)
+        #
+        # We hash with the SortedFrozenSet type rather than type(self), so
+        # that a view hashes the same as an equal SortedFrozenSet. Since our
+        # object is immutable, the hashcode is computed only once, upon the
+        # first call, and stored for the subsequent ones.
+        if self._hash is None:
+            self._hash = hash(
+                (SortedFrozenSet, tuple(self))
+            )
+        return self._hash
+
+    def __reduce_ex__(self, protocol: int) -> Tuple[Callable, tuple]:
+        # Our storage is already sorted and distinct, hence we pickle it as
+        # it is, and restore it through the trusted path, which neither uses
+        # the intermediate set, nor sorts again. The cached hashcode is left
+        # out, since the hashcodes of strings differ between processes.
+        keys: Optional[tuple] = (
+            tuple(self._keys) if self._keys is not None else None
         )
+        typecode: Optional[str] = _typecode_of(self._items)
+        if isinstance(self._items, (DeltaStorage, RoaringStorage)):
+            return _restore, (self._items, keys, self._key, self._reverse)
+        if typecode is None:
+            return _restore, (_pack(storage=self._items, typecode=None),
+                              keys, self._key, self._reverse)
+        packed: Sequence = self._items
+        if not (isinstance(packed, array) or (
+                isinstance(packed, memoryview) and packed.c_contiguous)):
+            packed = _pack(storage=packed, typecode=typecode)
+        if protocol < 5:
+            return _restore, (_pack(storage=packed, typecode=typecode)
+                              if isinstance(packed, memoryview) else packed,
+                              keys, self._key, self._reverse)
+        # With the protocol 5, a compact numeric storage is handed to the
+        # pickler as a buffer, which it may transfer out-of-band, i.e.,
+        # without copying it into the pickled bytes.
+        return _restore_buffer, (PickleBuffer(packed), typecode,
+                                 sys.byteorder, keys, self._key,
+                                 self._reverse)
 
     def __add__(self, other: Any) -> SortedFrozenSet:
-        if not isinstance(other, type(self)):
+        if not isinstance(other, SortedFrozenSet):
             # Our use of NotImplemented here has a similar reason as before.
             # Since we are supposed to return a concrete SortedFrozenSet object
             # from this method, when we are not doing it, Python treats the same
             # as TypeError due to wrong type.
             return NotImplemented
-        return SortedFrozenSet(
-            items=chain(self._items, other._items)
-        )
+        # Concatenation of two sets is their union, hence we merge the two
+        # sorted collections instead of sorting their chained items again.
+        return self | other
+
+    # Following methods derive a new version of the set with some items
+    # added or removed. Instead of copying, and sorting all the items again,
+    # the derived version is backed by a PersistentTree, which shares all
+    # the unchanged nodes with its origin. Only the very first derivation
+    # from a set, which is not backed by a tree yet, copies the items into
+    # one. Sets with a key function are rebuilt instead.
+    def with_item(self, item: Any) -> SortedFrozenSet:
+        if self._keys is not None:
+            return self._from_iterable(chain(self, (item,)))
+        tree: PersistentTree = self._tree()
+        return self._derived(tree=tree, derived=tree.insert(item))
+
+    def without_item(self, item: Any) -> SortedFrozenSet:
+        if self._keys is not None:
+            return self._from_iterable(x for x in self if x != item)
+        tree: PersistentTree = self._tree()
+        return self._derived(tree=tree, derived=tree.remove(item))
+
+    def with_items(self, items: Iterable) -> SortedFrozenSet:
+        if self._keys is not None:
+            return self._from_iterable(chain(self, items))
+        srt: List[Any] = sorted(set(items))
+        if len(srt) * _GALLOP_RATIO >= len(self._items):
+            # For a large batch, a single merge is cheaper than inserting
+            # the items one by one.
+            return self._merged(items=_merge_union(self._items, srt),
+                                typecode=_typecode_of(self._items),
+                                block_size=_block_size_of(self._items))
+        tree: PersistentTree = self._tree()
+        derived: PersistentTree = tree
+        for item in srt:
+            derived = derived.insert(item)
+        return self._derived(tree=tree, derived=derived)
+
+    def _tree(self) -> PersistentTree:
+        if isinstance(self._items, PersistentTree):
+            return self._items
+        return PersistentTree(items=self._items)
+
+    def _derived(self, tree: PersistentTree,
+                 derived: PersistentTree) -> SortedFrozenSet:
+        # A derivation, which has not changed the tree, leaves us as we are.
+        if derived is tree:
+            return self
+        return SortedFrozenSet._from_storage(derived, reverse=self._reverse)
 
     def __mul__(self, rhs: int) -> SortedFrozenSet:
         # When the right-hand side operand is 0 or less, we can simply return
@@ -122,6 +1397,21 @@ class SortedFrozenSet(Sequence, Set):
         # to the __mul__ method implementation.
         return self * lhs
 
+    def build_filter(self, error_rate: float = 0.01,
+                     lazy: bool = False) -> SortedFrozenSet:
+        # Attaches a Bloom filter over our items, which rejects most of the
+        # lookups of the items, which are not contained, in constant time.
+        # A lazy filter is built upon the first lookup. The filter is kept
+        # alongside the storage, hence we return this very set for
+        # convenience.
+        self._filter = BloomFilter(seq=self._items, error_rate=error_rate,
+                                   lazy=lazy)
+        return self
+
+    @property
+    def membership_filter(self) -> Optional[BloomFilter]:
+        return self._filter
+
     def count(self, item: Any) -> int:
         # Overrides the base implementation of the count methods from the
         # Sequence base class. We delegate to the __contains__ method
@@ -133,28 +1423,530 @@ class SortedFrozenSet(Sequence, Set):
     def index(self, item: Any, start: int = ..., stop: int = ...) -> int:
         # Overrides the base implementation of the index methods using the
         # binary search.
-        index: int = bisect_left(self._items, item)
-        if index != len(self._items) and self._items[index] == item:
-            return index
+        index: int = self._find(item)
+        if index != -1:
+            return self._position(index)
         raise ValueError(f'{item!r} not found')
 
+    # Following methods answer order-based queries. All of them rely on the
+    # binary search over our sorted collection, and take O(log n) time. The
+    # positions, and the notions of smaller and larger follow our order,
+    # i.e., they are mirrored in reverse order.
+    def bisect_left(self, item: Any) -> int:
+        probe: Any = self._sort_key_of(item)
+        if self._reverse:
+            return len(self._items) - self._search_right(self._sort_keys(),
+                                                         probe)
+        return self._search_left(self._sort_keys(), probe)
+
+    def bisect_right(self, item: Any) -> int:
+        probe: Any = self._sort_key_of(item)
+        if self._reverse:
+            return len(self._items) - self._search_left(self._sort_keys(),
+                                                        probe)
+        return self._search_right(self._sort_keys(), probe)
+
+    def rank(self, item: Any) -> int:
+        # The rank of an item is the number of items smaller than the item,
+        # regardless of whether the item is contained.
+        return self.bisect_left(item)
+
+    def select(self, rank: int) -> Any:
+        # Inverse of the rank, returns the item with the given rank.
+        if not 0 <= rank < len(self._items):
+            raise IndexError(f'rank {rank} out of range')
+        return self[rank]
+
+    def floor(self, item: Any) -> Any:
+        # Returns the largest item less than or equal to the given item, None
+        # if there is no such item.
+        index: int = self.bisect_right(item)
+        return self[index - 1] if index else None
+
+    def ceiling(self, item: Any) -> Any:
+        # Returns the smallest item greater than or equal to the given item,
+        # None if there is no such item.
+        index: int = self.bisect_left(item)
+        return self[index] if index != len(self._items) else None
+
+    def lower(self, item: Any) -> Any:
+        # Returns the largest item strictly less than the given item, None if
+        # there is no such item.
+        index: int = self.bisect_left(item)
+        return self[index - 1] if index else None
+
+    def higher(self, item: Any) -> Any:
+        # Returns the smallest item strictly greater than the given item, None
+        # if there is no such item.
+        index: int = self.bisect_right(item)
+        return self[index] if index != len(self._items) else None
+
+    def irange(self, lo: Any = None, hi: Any = None,
+               inclusive: Tuple[bool, bool] = (True, False)
+               ) -> SortedFrozenSet:
+        # Returns the items between lo and hi as a view, which shares our
+        # storage. By default, the range is half-open, i.e., [lo, hi). A
+        # bound of None leaves the range open at that end.
+        start: int = 0
+        stop: int = len(self._items)
+        if lo is not None:
+            start = (self.bisect_left(lo) if inclusive[0]
+                     else self.bisect_right(lo))
+        if hi is not None:
+            stop = (self.bisect_right(hi) if inclusive[1]
+                    else self.bisect_left(hi))
+        return self[start:max(start, stop)]
+
+    # Following methods answer membership and rank queries for a whole batch
+    # of keys at once. A batch about as large as our collection is merged
+    # with our sorted storage in a single pass. Otherwise, the keys are
+    # located by our binary search one by one, but without calling any of
+    # our methods per key. The results are reported in the order, in which
+    # the keys were provided.
+    def rank_many(self, keys: Iterable) -> List[int]:
+        # The rank of a key is the number of items smaller than the key.
+        probes: List[Any] = [self._sort_key_of(key) for key in keys]
+        if self._reverse:
+            n: int = len(self._items)
+            return [n - rank for rank in
+                    _rank_many(self._sort_keys(), probes,
+                               search=self._search_right, right=True)]
+        return _rank_many(self._sort_keys(), probes,
+                          search=self._search_left)
+
+    def contains_many(self, keys: Iterable) -> List[bool]:
+        if self._keys is None and self._member is not None:
+            return list(map(self._member, keys))
+        return [index != -1 for index in self._find_many(keys)]
+
+    def index_many(self, keys: Iterable) -> List[int]:
+        # Unlike index, which raises a ValueError for a missing item, we
+        # report -1 for each of the missing keys, so that a single missing
+        # key does not spoil the results of the whole batch.
+        return [
+            self._position(index) if index != -1 else -1
+            for index in self._find_many(keys)
+        ]
+
+    def _find_many(self, keys: Iterable) -> List[int]:
+        # Returns the storage position of each of the keys, -1 for the
+        # missing ones. With a key function, distinct items may share a key,
+        # hence we locate each of them separately.
+        if self._keys is not None:
+            return [self._find(key) for key in keys]
+        keys = list(keys)
+        items: Sequence = self._items
+        member: Optional[Callable[[Any], bool]] = self._member
+        if member is not None:
+            # Like _find, we test the membership by a single bit, and locate
+            # only the keys, which are contained.
+            return [
+                self._search_left(items, key) if found else -1
+                for key, found in zip(keys, map(member, keys))
+            ]
+        return _locate_many(items, keys, search=self._search_left)
+
+    # Likewise, the relational mixins of the Set base class probe the other
+    # operand once per item. For two SortedFrozenSet objects we walk both the
+    # sorted collections together instead, and stop at the first item, which
+    # decides the outcome. As before, we fall back to the mixins, when either
+    # of the storages is sorted by a key function.
+    def __le__(self, other: Any) -> bool:
+        if not self._merges_with(other):
+            return super().__le__(other)
+        return _storage_issubset(self._items, other._items)
+
+    def __lt__(self, other: Any) -> bool:
+        if not self._merges_with(other):
+            return super().__lt__(other)
+        return (len(self) < len(other) and
+                _storage_issubset(self._items, other._items))
+
+    def __ge__(self, other: Any) -> bool:
+        if not self._merges_with(other):
+            return super().__ge__(other)
+        return _storage_issubset(other._items, self._items)
+
+    def __gt__(self, other: Any) -> bool:
+        if not self._merges_with(other):
+            return super().__gt__(other)
+        return (len(self) > len(other) and
+                _storage_issubset(other._items, self._items))
+
+    def isdisjoint(self, other: Iterable) -> bool:
+        if not self._merges_with(other):
+            # The mixin implementation already checks the items of the
+            # Iterable one by one, and stops at the first common item.
+            return super().isdisjoint(other)
+        return _storage_isdisjoint(self._items, other._items)
+
     def issubset(self, other: Iterable) -> bool:
-        return self <= SortedFrozenSet(items=other)
+        if isinstance(other, SortedFrozenSet):
+            return self <= other
+        # Instead of building a SortedFrozenSet out of the Iterable, we locate
+        # each of its items in our own collection, and mark the ones we have
+        # seen. We are a subset as soon as all of our items are marked.
+        remaining: int = len(self._items)
+        if remaining == 0:
+            return True
+        seen: bytearray = bytearray(remaining)
+        for item in other:
+            index: int = self._find(item)
+            if index != -1 and not seen[index]:
+                seen[index] = 1
+                remaining -= 1
+                if remaining == 0:
+                    return True
+        return False
 
     def issuperset(self, other: Iterable) -> bool:
-        return self >= SortedFrozenSet(items=other)
+        if isinstance(other, SortedFrozenSet):
+            return self >= other
+        # Every item of the Iterable must be contained in our collection, and
+        # we can stop at the first one, which is not.
+        return all(item in self for item in other)
+
+    # The set algebra mixins of the Set base class probe __contains__ once
+    # per item, and rebuild the result through _from_iterable, which sorts
+    # everything again. When both the operands are SortedFrozenSet objects we
+    # can instead merge the two sorted collections in linear time, or gallop
+    # over the larger one, when the sizes are lopsided. For any other operand,
+    # or when either of the storages is sorted by a key function, we fall back
+    # to the mixin implementations.
+    def __and__(self, other: Any) -> SortedFrozenSet:
+        if not self._merges_with(other):
+            return super().__and__(other)
+        roaring: Optional[SortedFrozenSet] = self._roaring_with(
+            other=other, op=RoaringStorage.__and__
+        )
+        if roaring is not None:
+            return roaring
+        a: Sequence = _merge_storage_of(self._items)
+        b: Sequence = _merge_storage_of(other._items)  # noqa
+        return self._merged(
+            items=_merge_intersection(a, b),
+            typecode=_common_typecode(a, b),
+            block_size=_common_block_size(a, b)
+        )
+
+    __rand__ = __and__
+
+    def __or__(self, other: Any) -> SortedFrozenSet:
+        if not self._merges_with(other):
+            return super().__or__(other)
+        roaring: Optional[SortedFrozenSet] = self._roaring_with(
+            other=other, op=RoaringStorage.__or__
+        )
+        if roaring is not None:
+            return roaring
+        a: Sequence = _merge_storage_of(self._items)
+        b: Sequence = _merge_storage_of(other._items)  # noqa
+        return self._merged(
+            items=_merge_union(a, b),
+            typecode=_common_typecode(a, b),
+            block_size=_common_block_size(a, b)
+        )
+
+    __ror__ = __or__
+
+    def __sub__(self, other: Any) -> SortedFrozenSet:
+        if not self._merges_with(other):
+            return super().__sub__(other)
+        roaring: Optional[SortedFrozenSet] = self._roaring_with(
+            other=other, op=RoaringStorage.__sub__
+        )
+        if roaring is not None:
+            return roaring
+        a: Sequence = _merge_storage_of(self._items)
+        b: Sequence = _merge_storage_of(other._items)  # noqa
+        return self._merged(
+            items=_merge_difference(a, b),
+            typecode=_typecode_of(a),
+            block_size=_block_size_of(a)
+        )
+
+    def __xor__(self, other: Any) -> SortedFrozenSet:
+        if not self._merges_with(other):
+            return super().__xor__(other)
+        roaring: Optional[SortedFrozenSet] = self._roaring_with(
+            other=other, op=RoaringStorage.__xor__
+        )
+        if roaring is not None:
+            return roaring
+        a: Sequence = _merge_storage_of(self._items)
+        b: Sequence = _merge_storage_of(other._items)  # noqa
+        return self._merged(
+            items=_merge_symmetric_difference(a, b),
+            typecode=_common_typecode(a, b),
+            block_size=_common_block_size(a, b)
+        )
+
+    __rxor__ = __xor__
 
     def intersection(self, other: Iterable) -> SortedFrozenSet:
-        return SortedFrozenSet(items=self & SortedFrozenSet(items=other))
+        return self & _as_sorted_frozen_set(other)
 
     def union(self, other: Iterable) -> SortedFrozenSet:
-        return SortedFrozenSet(items=self | SortedFrozenSet(items=other))
+        return self | _as_sorted_frozen_set(other)
 
     def symmetric_difference(self, other: Iterable) -> SortedFrozenSet:
-        return SortedFrozenSet(items=self ^ SortedFrozenSet(items=other))
+        return self ^ _as_sorted_frozen_set(other)
 
     def difference(self, other: Iterable) -> SortedFrozenSet:
-        return SortedFrozenSet(items=self - SortedFrozenSet(items=other))
+        return self - _as_sorted_frozen_set(other)
+
+
+class SortedFrozenSetView(SortedFrozenSet):
+    """Zero-copy view over a slice of a SortedFrozenSet. The view shares the
+    storage of its parent, and behaves as any other SortedFrozenSet. Slicing
+    a view creates a view over the same storage, rather than a view over a
+    view. Since a view keeps the whole storage of its parent alive, it can be
+    materialized into an independent SortedFrozenSet on demand.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, parent: SortedFrozenSet, index: slice) -> None:
+        # pylint: disable=super-init-not-called
+        self._hash = None
+        self._filter = None
+        self._key = parent._key  # noqa
+        self._reverse = parent._reverse  # noqa
+        # The slice addresses the positions in the order of the parent, which
+        # we translate into the positions of its ascending storage.
+        n: int = len(parent._items)  # noqa
+        rng: range = (
+            range(n - 1, -1, -1) if parent._reverse  # noqa
+            else range(n)
+        )[index]
+        self._items = _window(storage=parent._items, rng=rng)  # noqa
+        self._keys = (
+            None if parent._keys is None  # noqa
+            else _window(storage=parent._keys, rng=rng)  # noqa
+        )
+        self._init_search()
+
+    def materialize(self) -> SortedFrozenSet:
+        return SortedFrozenSet._from_storage(
+            storage=_pack(storage=self._items,
+                          typecode=_typecode_of(self._items),
+                          block_size=_block_size_of(self._items)),
+            keys=None if self._keys is None else tuple(self._keys),
+            key=self._key,
+            reverse=self._reverse
+        )
+
+
+class SetInternPool:
+    """Pool of canonical SortedFrozenSet instances. Interning equal sets
+    through the pool yields one shared instance, so the duplicates can be
+    released, and equality checks between interned sets reduce to identity
+    checks. The pool refers to its canonical instances weakly, and holds
+    strong references only to the most recently used ones, up to maxsize.
+    """
+
+    _canonical: WeakValueDictionary
+    _recent: OrderedDict
+    _maxsize: int
+    hits: int
+    misses: int
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        # Canonical instances are keyed by their hashcodes. When two unequal
+        # sets collide on a hashcode, the latter is simply not interned.
+        self._canonical = WeakValueDictionary()
+        self._recent = OrderedDict()
+        self._maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._canonical)
+
+    def intern(self, items: Iterable) -> SortedFrozenSet:
+        s: SortedFrozenSet = _as_sorted_frozen_set(items)
+        key: int = hash(s)
+        canonical: Optional[SortedFrozenSet] = self._canonical.get(key)
+        if canonical is not None and canonical == s:
+            self.hits += 1
+            s = canonical
+        else:
+            self.misses += 1
+            if canonical is not None:
+                return s
+            # A view refers to the whole storage of the set, it is sliced
+            # from, hence it is materialized before it becomes canonical, in
+            # order not to retain that storage for the lifetime of the pool.
+            if isinstance(s, SortedFrozenSetView):
+                s = s.materialize()
+            self._canonical[key] = s
+        # The least recently used instance loses its strong reference, and
+        # lives on in the pool only as long as it is referred elsewhere.
+        self._recent[key] = s
+        self._recent.move_to_end(key)
+        if len(self._recent) > self._maxsize:
+            self._recent.popitem(last=False)
+        return s
+
+    def clear(self) -> None:
+        self._canonical.clear()
+        self._recent.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_intern_pool: SetInternPool = SetInternPool()
+
+
+def _restore(storage: Sequence, keys: Optional[Sequence],
+             key: Optional[Callable[[Any], Any]],
+             reverse: bool) -> SortedFrozenSet:
+    """Restores a pickled SortedFrozenSet from its sorted storage.
+
+    :param storage: Sorted, and distinct items
+    :type storage: Sequence
+    :param keys: Keys of the items if ordered by a key function
+    :type keys: Optional[Sequence]
+    :param key: Key function if available
+    :type key: Optional[Callable[[Any], Any]]
+    :param reverse: If the set is presented in reverse order
+    :type reverse: bool
+    :return: Restored SortedFrozenSet
+    :rtype: SortedFrozenSet
+    """
+    return SortedFrozenSet._from_storage(  # noqa
+        storage, keys=keys, key=key, reverse=reverse
+    )
+
+
+def _restore_buffer(buffer: Any, typecode: str, byteorder: str,
+                    keys: Optional[Sequence],
+                    key: Optional[Callable[[Any], Any]],
+                    reverse: bool) -> SortedFrozenSet:
+    """Restores a pickled SortedFrozenSet from the buffer of its compact
+    numeric storage. The buffer is adopted as a read-only memoryview without
+    copying, unless it was pickled in a different byte order.
+
+    :param buffer: Buffer of the sorted, and distinct items
+    :type buffer: Any
+    :param typecode: Typecode of the items
+    :type typecode: str
+    :param byteorder: Byte order, in which the buffer was pickled
+    :type byteorder: str
+    :param keys: Keys of the items if ordered by a key function
+    :type keys: Optional[Sequence]
+    :param key: Key function if available
+    :type key: Optional[Callable[[Any], Any]]
+    :param reverse: If the set is presented in reverse order
+    :type reverse: bool
+    :return: Restored SortedFrozenSet
+    :rtype: SortedFrozenSet
+    """
+    view: memoryview = memoryview(buffer).cast('B')
+    storage: Sequence
+    if byteorder == sys.byteorder:
+        storage = view.toreadonly().cast(typecode)
+    else:
+        storage = array(typecode)
+        storage.frombytes(view)
+        storage.byteswap()
+    return _restore(storage=storage, keys=keys, key=key, reverse=reverse)
+
+
+def _sorted_storage_for(items: Iterable) -> Sequence:
+    """Returns the sorted storage of the items, which is shared without
+    sorting, if they are known to be sorted and distinct.
+
+    :param items: Items of a SortedFrozenSet
+    :type items: Iterable
+    :return: Sorted, and distinct items
+    :rtype: Sequence
+    """
+    storage: Optional[Sequence] = _sorted_storage_of(items)
+    return storage if storage is not None else sorted(set(items))
+
+
+def _common_typecode_of(storages: List[Sequence]) -> Optional[str]:
+    """Returns the typecode shared by all the storages, None if any of them
+    holds Python objects, or they differ in typecode.
+
+    :param storages: Storages of SortedFrozenSets
+    :type storages: List[Sequence]
+    :return: Common typecode of the storages if available
+    :rtype: Optional[str]
+    """
+    typecodes: set = set(map(_typecode_of, storages))
+    return typecodes.pop() if len(typecodes) == 1 else None
+
+
+def union_all(*sets: Iterable) -> SortedFrozenSet:
+    """Returns the union of all the provided sets as a single
+    SortedFrozenSet. Instead of chaining the binary unions, which builds an
+    intermediate set per step, all the sorted storages are merged in a
+    single pass. Iterables other than a SortedFrozenSet, or a range, e.g.,
+    lazy iterators, are sorted first.
+
+    :param sets: SortedFrozenSets, or other Iterables of items
+    :type sets: Iterable
+    :return: Union of the sets
+    :rtype: SortedFrozenSet
+    """
+    storages: List[Sequence] = list(map(_sorted_storage_for, sets))
+    if storages and all(isinstance(storage, RoaringStorage)
+                        for storage in storages):
+        return SortedFrozenSet._from_storage(  # noqa
+            reduce(RoaringStorage.__or__, storages)
+        )
+    return SortedFrozenSet.from_sorted_unique(
+        items=_merge_union_all(storages),
+        typecode=_common_typecode_of(storages)
+    )
+
+
+def intersect_all(*sets: Iterable) -> SortedFrozenSet:
+    """Returns the intersection of all the provided sets as a single
+    SortedFrozenSet. Instead of chaining the binary intersections, which
+    builds an intermediate set per step, the sorted storages of the sets are
+    merged, starting with the smallest one, which bounds the work by the
+    size of the smallest set. If all of the sets are roaring ones, their
+    containers are intersected instead. Otherwise, any roaring storage is
+    decoded before the merge. Iterables other than a SortedFrozenSet, or a
+    range, e.g., lazy iterators, are sorted first. Without any set, the
+    intersection is empty.
+
+    :param sets: SortedFrozenSets, or other Iterables of items
+    :type sets: Iterable
+    :return: Intersection of the sets
+    :rtype: SortedFrozenSet
+    """
+    storages: List[Sequence] = sorted(map(_sorted_storage_for, sets),
+                                      key=len)
+    if storages and all(isinstance(storage, RoaringStorage)
+                        for storage in storages):
+        return SortedFrozenSet._from_storage(  # noqa
+            reduce(RoaringStorage.__and__, storages)
+        )
+    storages = list(map(_merge_storage_of, storages))
+    return SortedFrozenSet.from_sorted_unique(
+        items=_merge_intersection_all(storages),
+        typecode=_common_typecode_of(storages)
+    )
+
+
+def _as_sorted_frozen_set(items: Iterable) -> SortedFrozenSet:
+    """Returns the provided Iterable as a SortedFrozenSet, without building a
+    new object, if it already is one.
+
+    :param items: Iterable of items
+    :type items: Iterable
+    :return: SortedFrozenSet of the provided items
+    :rtype: SortedFrozenSet
+    """
+    return (
+        items
+        if isinstance(items, SortedFrozenSet)
+        else SortedFrozenSet(items=items)
+    )
 
 
 if __name__ == '__main__':
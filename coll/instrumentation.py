@@ -0,0 +1,360 @@
+# pylint: disable=missing-module-docstring
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+from collections.abc import Sized
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from threading import Lock
+from functools import wraps
+from time import perf_counter
+from frozen_set import SortedFrozenSet
+
+
+# Instrumented methods of the SortedFrozenSet, by the kind of their volume.
+# The volume of a constructor is the size of the set it builds, the volume
+# of a query is the size of the set it queries, and the volume of a binary
+# operation additionally includes the size of its other operand.
+_CONSTRUCTORS: Tuple[str, ...] = (
+    '__init__', 'from_sorted', 'from_sorted_unique', 'build_parallel',
+    'compressed', 'roaring',
+)
+_QUERIES: Tuple[str, ...] = (
+    '__contains__', '__getitem__', '__hash__', 'index', 'count', 'rank',
+    'select', 'bisect_left', 'bisect_right', 'floor', 'ceiling', 'lower',
+    'higher', 'irange',
+)
+_OPERATIONS: Tuple[str, ...] = (
+    '__eq__', '__le__', '__lt__', '__ge__', '__gt__', 'isdisjoint',
+    'issubset', 'issuperset', '__and__', '__or__', '__sub__', '__xor__',
+    'intersection', 'union', 'difference', 'symmetric_difference',
+    'contains_many', 'index_many', 'rank_many', 'with_items',
+)
+
+# Number of the most recently built, and hashed contents, which are
+# remembered per statistics in order to spot the rebuilds, and rehashes.
+_MAX_FINGERPRINTS: int = 4096
+
+
+def _seen(recent: OrderedDict, fingerprint: int) -> bool:
+    """Returns whether the fingerprint is among the recent ones, and makes it
+    the most recent one. The least recent fingerprint is forgotten, once
+    there are more than _MAX_FINGERPRINTS of them.
+
+    :param recent: Recent fingerprints in the order of their use
+    :type recent: OrderedDict
+    :param fingerprint: Fingerprint of the contents
+    :type fingerprint: int
+    :return: Whether the fingerprint has been seen recently
+    :rtype: bool
+    """
+    if fingerprint in recent:
+        recent.move_to_end(fingerprint)
+        return True
+    recent[fingerprint] = None
+    if len(recent) > _MAX_FINGERPRINTS:
+        recent.popitem(last=False)
+    return False
+
+
+class MethodStats:
+    """Statistics of the calls of a single method. The items are the total
+    volume of the calls, and the seconds are the total time spent in them,
+    including the time spent in the other instrumented methods, which they
+    call in turn.
+    """
+
+    __slots__ = ('calls', 'items', 'seconds')
+
+    calls: int
+    items: int
+    seconds: float
+
+    def __init__(self, calls: int = 0, items: int = 0,
+                 seconds: float = 0.0) -> None:
+        self.calls = calls
+        self.items = items
+        self.seconds = seconds
+
+    def __repr__(self) -> str:
+        return (f'{type(self).__name__}(calls={self.calls}, '
+                f'items={self.items}, seconds={self.seconds:.6f})')
+
+
+class InstrumentationStats:
+    """Statistics of the SortedFrozenSet collected while the instrumentation
+    is enabled. Besides the statistics per method, two patterns, which waste
+    time without being visible in any single call, are counted:
+
+    - rebuilds, i.e., constructions of a set, whose contents have already
+      been built before, instead of reusing, or interning the first set.
+    - rehashes, i.e., hashcodes computed for a set, whose contents have
+      already been hashed before, typically fresh, but equal sets used as
+      keys of a dict.
+
+    Only the most recent contents are remembered for spotting either of
+    them, so that the statistics take bounded memory.
+    """
+
+    __slots__ = ('methods', 'rebuilds', 'rehashes', '_built', '_hashed')
+
+    methods: Dict[str, MethodStats]
+    rebuilds: int
+    rehashes: int
+    _built: OrderedDict
+    _hashed: OrderedDict
+
+    def __init__(self) -> None:
+        self.methods = {}
+        self.rebuilds = 0
+        self.rehashes = 0
+        self._built = OrderedDict()
+        self._hashed = OrderedDict()
+
+    def __repr__(self) -> str:
+        return (f'{type(self).__name__}(methods={self.methods!r}, '
+                f'rebuilds={self.rebuilds}, rehashes={self.rehashes})')
+
+    def copy(self) -> InstrumentationStats:
+        stats: InstrumentationStats = InstrumentationStats()
+        stats.methods = {
+            name: MethodStats(calls=m.calls, items=m.items,
+                              seconds=m.seconds)
+            for name, m in self.methods.items()
+        }
+        stats.rebuilds = self.rebuilds
+        stats.rehashes = self.rehashes
+        stats._built = OrderedDict(self._built)
+        stats._hashed = OrderedDict(self._hashed)
+        return stats
+
+    def _record(self, name: str, items: int, seconds: float) -> None:
+        m: MethodStats = self.methods.get(name)
+        if m is None:
+            m = self.methods[name] = MethodStats()
+        m.calls += 1
+        m.items += items
+        m.seconds += seconds
+
+    def _record_built(self, fingerprint: int) -> None:
+        if _seen(self._built, fingerprint):
+            self.rebuilds += 1
+
+    def _record_hashed(self, hashcode: int) -> None:
+        if _seen(self._hashed, hashcode):
+            self.rehashes += 1
+
+
+# The instrumentation records into the global statistics, while it is
+# enabled, and into the statistics of each of the scopes, which are open in
+# the current context, i.e., thread, or task. The original methods are kept
+# aside while the instrumented ones replace them, so that the
+# SortedFrozenSet runs its original methods, without any overhead at all,
+# as soon as nothing is recorded in any context anymore.
+_global: List[InstrumentationStats] = []
+_scopes: ContextVar[Tuple[InstrumentationStats, ...]] = ContextVar(
+    'scopes', default=()
+)
+_depth: ContextVar[int] = ContextVar('depth', default=0)
+_open_scopes: int = 0
+_lock: Lock = Lock()
+_originals: Dict[str, Any] = {}
+
+
+def _volume(obj: Any) -> int:
+    """Returns the size of the object, if it is sized, or zero otherwise.
+
+    :param obj: Any object
+    :type obj: Any
+    :return: Size of the object
+    :rtype: int
+    """
+    return len(obj) if isinstance(obj, Sized) else 0
+
+
+def _fingerprint(s: SortedFrozenSet) -> int:
+    """Returns the fingerprint of the contents of the set. Unlike the
+    hashcode of the set, the fingerprint is not cached by the set, so that
+    computing it does not conceal rehashes.
+
+    :param s: Set to be fingerprinted
+    :type s: SortedFrozenSet
+    :return: Fingerprint of the contents
+    :rtype: int
+    """
+    return hash((s._reverse, tuple(s._items)))  # noqa
+
+
+def _shares_storage(built: SortedFrozenSet, args: Tuple[Any, ...],
+                    kwargs: Dict[str, Any]) -> bool:
+    """Returns whether the constructed set has simply adopted the storage of
+    the items it has been constructed from, e.g., another SortedFrozenSet,
+    or a range, in which case its contents are not worth fingerprinting.
+
+    :param built: Constructed set
+    :type built: SortedFrozenSet
+    :param args: Positional arguments of the constructor, including the set
+        or its class
+    :type args: Tuple[Any, ...]
+    :param kwargs: Keyword arguments of the constructor
+    :type kwargs: Dict[str, Any]
+    :return: Whether the set shares the storage of its items
+    :rtype: bool
+    """
+    items: Any = args[1] if len(args) > 1 else kwargs.get('items')
+    return built._items is getattr(items, '_items', items)  # noqa
+
+
+def _instrumented(name: str, func: Callable) -> Callable:
+    """Returns the instrumented version of the method of the given name,
+    which records its calls, volume, and time into all the statistics, which
+    are being collected.
+
+    :param name: Name of the method
+    :type name: str
+    :param func: Original method
+    :type func: Callable
+    :return: Instrumented method
+    :rtype: Callable
+    """
+    constructor: bool = name in _CONSTRUCTORS
+    operation: bool = name in _OPERATIONS
+
+    @wraps(func)
+    def method(*args: Any, **kwargs: Any) -> Any:
+        hashing: bool = name == '__hash__' and args[0]._hash is None  # noqa
+        depth: int = _depth.get()
+        token: Token = _depth.set(depth + 1)
+        start: float = perf_counter()
+        try:
+            result: Any = func(*args, **kwargs)
+        finally:
+            _depth.reset(token)
+        seconds: float = perf_counter() - start
+        sinks: List[InstrumentationStats] = _global + list(_scopes.get())
+        if not sinks:
+            return result
+        if constructor:
+            built: SortedFrozenSet = args[0] if result is None else result
+            items: int = len(built)
+            # Only the sets built by the caller count as rebuilds, rather
+            # than the ones built by the SortedFrozenSet itself on its way.
+            # A set, which shares the storage of another one, has cost
+            # nothing to build, hence it is not fingerprinted either.
+            if depth == 0 and not _shares_storage(built, args, kwargs):
+                fingerprint: int = _fingerprint(built)
+                for stats in sinks:
+                    stats._record_built(fingerprint)  # noqa
+        else:
+            items = len(args[0])
+            if operation:
+                operands: List[Any] = list(args[1:]) + list(kwargs.values())
+                items += _volume(operands[0]) if operands else 0
+        for stats in sinks:
+            stats._record(name=name, items=items, seconds=seconds)  # noqa
+            if hashing:
+                stats._record_hashed(result)  # noqa
+        return result
+
+    return method
+
+
+def _install() -> None:
+    # Must be called with the lock held.
+    if _originals:
+        return
+    for name in _CONSTRUCTORS + _QUERIES + _OPERATIONS:
+        attr: Any = SortedFrozenSet.__dict__[name]
+        _originals[name] = attr
+        setattr(SortedFrozenSet, name,
+                classmethod(_instrumented(name=name, func=attr.__func__))
+                if isinstance(attr, classmethod)
+                else _instrumented(name=name, func=attr))
+
+
+def _uninstall() -> None:
+    # Must be called with the lock held.
+    if _global or _open_scopes:
+        return
+    for name, attr in _originals.items():
+        setattr(SortedFrozenSet, name, attr)
+    _originals.clear()
+
+
+def enable() -> None:
+    """Enables the global statistics of the SortedFrozenSet. Enabling the
+    statistics, which are already enabled, keeps them as they are.
+    """
+    with _lock:
+        if not _global:
+            _global.append(InstrumentationStats())
+        _install()
+
+
+def disable() -> None:
+    """Disables the global statistics of the SortedFrozenSet, and discards
+    them. Once no scope is open either, the original methods are restored.
+    """
+    with _lock:
+        _global.clear()
+        _uninstall()
+
+
+def is_enabled() -> bool:
+    """Returns whether the methods of the SortedFrozenSet are instrumented.
+
+    :return: Whether the methods are instrumented
+    :rtype: bool
+    """
+    return bool(_originals)
+
+
+def snapshot() -> InstrumentationStats:
+    """Returns a copy of the global statistics collected so far, which is
+    empty, while they are disabled.
+
+    :return: Copy of the global statistics
+    :rtype: InstrumentationStats
+    """
+    return _global[0].copy() if _global else InstrumentationStats()
+
+
+def reset() -> None:
+    """Discards the global statistics collected so far, and starts over.
+    """
+    if _global:
+        _global[0] = InstrumentationStats()
+
+
+@contextmanager
+def instrumented() -> Iterator[InstrumentationStats]:
+    """Collects the statistics of the SortedFrozenSet within the scope of the
+    with statement, e.g., a single request, regardless of whether the global
+    statistics are enabled. Scopes can be nested, in which case the calls
+    are recorded into each of the open ones. A scope only records the calls
+    made in its own context, i.e., thread, or asyncio task, hence
+    concurrent requests do not record into each other's scopes.
+
+    :return: Statistics of the scope, which are updated until it is closed
+    :rtype: Iterator[InstrumentationStats]
+    """
+    # pylint: disable=global-statement
+    global _open_scopes
+    stats: InstrumentationStats = InstrumentationStats()
+    token: Token = _scopes.set(_scopes.get() + (stats,))
+    with _lock:
+        _open_scopes += 1
+        _install()
+    try:
+        yield stats
+    finally:
+        _scopes.reset(token)
+        with _lock:
+            _open_scopes -= 1
+            _uninstall()
+
+
+if __name__ == '__main__':
+    pass
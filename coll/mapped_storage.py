@@ -0,0 +1,224 @@
+# pylint: disable=missing-module-docstring
+
+from __future__ import annotations
+
+import sys
+from typing import Iterable, Any, Iterator, Union, List, Tuple, BinaryIO
+from collections.abc import Sequence
+from itertools import islice
+from tempfile import TemporaryFile
+from shutil import copyfileobj
+from array import array
+from mmap import mmap, ACCESS_READ
+from struct import Struct
+
+
+# The file starts with a fixed header, which is followed by the items. The
+# header holds a magic string, the kind of the items, the byte order, in
+# which they were written, a flags byte, and the number of items.
+#
+# Numeric items are stored as a packed array, whose kind is its typecode.
+# Strings and bytes are stored as an array of count + 1 offsets, followed by
+# the concatenated encoded items, where the i-th item spans the bytes from
+# the i-th to the (i + 1)-th offset.
+_MAGIC: bytes = b'SFS1'
+_HEADER: Struct = Struct('<4sccBxQ')
+_STR_KIND: bytes = b's'
+_BYTES_KIND: bytes = b'y'
+_NUMERIC_KINDS: str = 'bBhHiIlLqQfd'
+_BYTE_ORDER: bytes = b'<' if sys.byteorder == 'little' else b'>'
+_REVERSE_FLAG: int = 1
+# Number of items, which are encoded at once, when writing a stream of items.
+_BATCH_SIZE: int = 1 << 16
+
+
+class _MappedStrings(Sequence):
+    """Read-only sequence of strings, or bytes, which are decoded on demand
+    from the memory-mapped file.
+    """
+
+    __slots__ = ('_offsets', '_blob', '_decode')
+
+    _offsets: memoryview
+    _blob: memoryview
+    _decode: bool
+
+    def __init__(self, offsets: memoryview, blob: memoryview,
+                 decode: bool) -> None:
+        self._offsets = offsets
+        self._blob = blob
+        self._decode = decode
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return tuple(map(self.__getitem__, range(len(self))[index]))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('index out of range')
+        raw: bytes = bytes(
+            self._blob[self._offsets[index]:self._offsets[index + 1]]
+        )
+        return raw.decode('utf-8') if self._decode else raw
+
+    def __iter__(self) -> Iterator:
+        return map(self.__getitem__, range(len(self)))
+
+
+def kind_of(items: Sequence, typecode: Union[str, None]) -> bytes:
+    """Returns the kind of the items, under which they are stored in the
+    file. A compact numeric storage keeps its typecode, while the boxed
+    items must be either all integers, all floats, all strings, or all
+    bytes.
+
+    :param items: Sorted items of a SortedFrozenSet
+    :type items: Sequence
+    :param typecode: Typecode of the compact numeric storage if available
+    :type typecode: Union[str, None]
+    :return: Kind of the items
+    :rtype: bytes
+    """
+    if typecode is not None:
+        return typecode.encode()
+    types: set = set(map(type, items))
+    for kind, allowed in ((b'q', {int}), (b'd', {float}),
+                          (_STR_KIND, {str}), (_BYTES_KIND, {bytes})):
+        if types <= allowed:
+            return kind
+    raise TypeError(f'Items of type(s) {types} can not be saved')
+
+
+def write_header(file: BinaryIO, kind: bytes, count: int,
+                 reverse: bool) -> None:
+    """Writes the header of the file.
+
+    :param file: File opened for binary writing
+    :type file: BinaryIO
+    :param kind: Kind of the items
+    :type kind: bytes
+    :param count: Number of items
+    :type count: int
+    :param reverse: If the set is presented in reverse order
+    :type reverse: bool
+    """
+    file.write(_HEADER.pack(_MAGIC, kind, _BYTE_ORDER,
+                            _REVERSE_FLAG if reverse else 0, count))
+
+
+def write_items(file: BinaryIO, items: Iterable, kind: bytes) -> int:
+    """Writes the sorted items after the header, and returns their number.
+    The items are consumed in batches, so that an arbitrarily long stream of
+    items can be written with bounded memory. The offsets of strings and
+    bytes precede the encoded items, which are therefore buffered in an
+    unnamed temporary file, and appended once the offsets are written.
+
+    :param file: File opened for binary writing, and positioned after the
+        header
+    :type file: BinaryIO
+    :param items: Sorted, and distinct items
+    :type items: Iterable
+    :param kind: Kind of the items
+    :type kind: bytes
+    :return: Number of items written
+    :rtype: int
+    """
+    if isinstance(items, array) and items.typecode == kind.decode():
+        items.tofile(file)
+        return len(items)
+    it: Iterator = iter(items)
+    count: int = 0
+    if kind not in (_STR_KIND, _BYTES_KIND):
+        while True:
+            packed: array = array(kind.decode(), islice(it, _BATCH_SIZE))
+            if not packed:
+                return count
+            packed.tofile(file)
+            count += len(packed)
+    offset: int = 0
+    array('q', [offset]).tofile(file)
+    with TemporaryFile() as blob:
+        while True:
+            encoded: List[bytes] = [
+                item.encode('utf-8') if kind == _STR_KIND else bytes(item)
+                for item in islice(it, _BATCH_SIZE)
+            ]
+            if not encoded:
+                break
+            offsets: array = array('q')
+            for raw in encoded:
+                offset += len(raw)
+                offsets.append(offset)
+            offsets.tofile(file)
+            blob.write(b''.join(encoded))
+            count += len(encoded)
+        blob.seek(0)
+        copyfileobj(blob, file)
+    return count
+
+
+def save(path: str, items: Iterable, kind: bytes,
+         reverse: bool = False) -> int:
+    """Saves the sorted items into the file, and returns their number. Since
+    the number of items is only known once they are written, the header is
+    written again at the end.
+
+    :param path: Path of the file
+    :type path: str
+    :param items: Sorted, and distinct items
+    :type items: Iterable
+    :param kind: Kind of the items
+    :type kind: bytes
+    :param reverse: If the set is presented in reverse order
+    :type reverse: bool
+    :return: Number of items written
+    :rtype: int
+    """
+    with open(path, 'wb') as file:
+        write_header(file=file, kind=kind, count=0, reverse=reverse)
+        count: int = write_items(file=file, items=items, kind=kind)
+        file.seek(0)
+        write_header(file=file, kind=kind, count=count, reverse=reverse)
+    return count
+
+
+def open_mapped(path: str) -> Tuple[Sequence, bool]:
+    """Maps the file read-only into the memory, and returns the storage of
+    the items, which reads them straight from the mapping, along with the
+    reverse flag of the set. Numeric items are exposed through a memoryview,
+    so that they are never copied.
+
+    :param path: Path of the file
+    :type path: str
+    :return: Storage of the items, and if the set is in reverse order
+    :rtype: Tuple[Sequence, bool]
+    """
+    with open(path, 'rb') as file:
+        # The mapping stays valid after the file is closed. It is released,
+        # once the last view over it is gone.
+        mapped: mmap = mmap(file.fileno(), 0, access=ACCESS_READ)
+    view: memoryview = memoryview(mapped)
+    magic, kind, byte_order, flags, count = _HEADER.unpack_from(view)
+    if magic != _MAGIC:
+        raise ValueError(f'{path} is not a SortedFrozenSet file')
+    if byte_order != _BYTE_ORDER:
+        raise ValueError(f'{path} was written in a different byte order')
+    reverse: bool = bool(flags & _REVERSE_FLAG)
+    start: int = _HEADER.size
+    if kind in (_STR_KIND, _BYTES_KIND):
+        stop: int = start + (count + 1) * 8
+        offsets: memoryview = view[start:stop].cast('q')
+        return _MappedStrings(offsets=offsets,
+                              blob=view[stop:stop + offsets[-1]],
+                              decode=kind == _STR_KIND), reverse
+    typecode: str = kind.decode()
+    if typecode not in _NUMERIC_KINDS:
+        raise ValueError(f'{path} holds items of unknown kind {typecode!r}')
+    itemsize: int = array(typecode).itemsize
+    return view[start:start + count * itemsize].cast(typecode), reverse
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,228 @@
+# pylint: disable=missing-module-docstring
+
+from __future__ import annotations
+
+from typing import Iterable, Any, Iterator, Union, List, Tuple
+from collections.abc import Sequence
+from itertools import chain, islice
+from bisect import bisect_left, bisect_right
+
+
+# Leaves hold at most this many items, and internal nodes hold at most this
+# many children. A leaf is copied as a whole upon each change, which is
+# cheap for a tuple of this size, while the number of levels, which are
+# copied along the path from the root, stays small.
+_LEAF_SIZE: int = 256
+_FANOUT: int = 32
+
+
+class _Node:
+    """Immutable internal node of the PersistentTree. Alongside its children,
+    the node keeps the largest item of each child, which guides the search
+    for an item, and the number of items preceding each child, which guides
+    the search for a position.
+    """
+
+    __slots__ = ('children', 'maxes', 'offsets', 'size')
+
+    children: Tuple[Any, ...]
+    maxes: Tuple[Any, ...]
+    offsets: Tuple[int, ...]
+    size: int
+
+    def __init__(self, children: Iterable) -> None:
+        self.children = tuple(children)
+        self.maxes = tuple(_max_of(child) for child in self.children)
+        offsets: List[int] = []
+        size: int = 0
+        for child in self.children:
+            offsets.append(size)
+            size += _size_of(child)
+        self.offsets = tuple(offsets)
+        self.size = size
+
+
+def _size_of(node: Union[_Node, tuple]) -> int:
+    """Returns the number of items under the node.
+
+    :param node: Leaf or internal node
+    :type node: Union[_Node, tuple]
+    :return: Number of items
+    :rtype: int
+    """
+    return len(node) if isinstance(node, tuple) else node.size
+
+
+def _max_of(node: Union[_Node, tuple]) -> Any:
+    """Returns the largest item under the node.
+
+    :param node: Leaf or internal node
+    :type node: Union[_Node, tuple]
+    :return: Largest item
+    :rtype: Any
+    """
+    return node[-1] if isinstance(node, tuple) else node.maxes[-1]
+
+
+def _group(nodes: List[Any], size: int) -> List[Any]:
+    """Splits the nodes into groups of the given size at most, where the last
+    two groups are balanced, so that neither of them is tiny.
+
+    :param nodes: Leaves, items, or internal nodes
+    :type nodes: List[Any]
+    :param size: Maximum size of a group
+    :type size: int
+    :return: Groups of the nodes
+    :rtype: List[Any]
+    """
+    groups: List[Any] = [
+        nodes[pos:pos + size] for pos in range(0, len(nodes), size)
+    ]
+    if len(groups) > 1 and len(groups[-1]) < size // 2:
+        tail: List[Any] = groups[-2] + groups[-1]
+        half: int = len(tail) // 2
+        groups[-2:] = [tail[:half], tail[half:]]
+    return groups
+
+
+class PersistentTree(Sequence):
+    """Immutable B+ tree over sorted, and distinct items. Deriving a tree
+    with one item more or less copies only the leaf, and the internal nodes
+    along the path from the root to it. All the other nodes are shared
+    between the original, and the derived tree, so that each derived version
+    costs O(log n) time, and memory instead of a full copy.
+    """
+
+    __slots__ = ('_root',)
+
+    _root: Union[_Node, tuple]
+
+    def __init__(self, items: Sequence = ()) -> None:
+        # The items must be sorted, and distinct already. We build the tree
+        # bottom up, by grouping the items into leaves, and the leaves into
+        # internal nodes, level by level.
+        level: List[Any] = [
+            tuple(group) for group in _group(list(items), _LEAF_SIZE)
+        ]
+        while len(level) > 1:
+            level = [_Node(group) for group in _group(level, _FANOUT)]
+        self._root = level[0] if level else ()
+
+    @classmethod
+    def _from_root(cls, root: Union[_Node, tuple]) -> PersistentTree:
+        obj: PersistentTree = cls.__new__(cls)
+        # A root with a single child is collapsed, so that the height of the
+        # tree shrinks, as the items are removed.
+        while isinstance(root, _Node) and len(root.children) == 1:
+            root = root.children[0]
+        obj._root = root
+        return obj
+
+    def __len__(self) -> int:
+        return _size_of(self._root)
+
+    def __iter__(self) -> Iterator:
+        return chain.from_iterable(self._leaves(self._root, 0))
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            rng: range = range(len(self))[index]
+            if rng.step == 1:
+                return tuple(islice(
+                    chain.from_iterable(self._leaves(self._root, rng.start)),
+                    len(rng)
+                ))
+            return tuple(map(self.__getitem__, rng))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('PersistentTree index out of range')
+        node: Union[_Node, tuple] = self._root
+        while isinstance(node, _Node):
+            pos: int = bisect_right(node.offsets, index) - 1
+            index -= node.offsets[pos]
+            node = node.children[pos]
+        return node[index]
+
+    def _leaves(self, node: Union[_Node, tuple],
+                index: int) -> Iterator[tuple]:
+        # Yields the leaves from the one holding the given position onward,
+        # where the first leaf is cut at that position.
+        if isinstance(node, tuple):
+            yield node[index:] if index else node
+            return
+        pos: int = max(bisect_right(node.offsets, index) - 1, 0)
+        yield from self._leaves(node.children[pos], index - node.offsets[pos])
+        for child in node.children[pos + 1:]:
+            yield from self._leaves(child, 0)
+
+    def insert(self, item: Any) -> PersistentTree:
+        # Returns a tree with the item added, or this very tree, when the
+        # item is already present.
+        if not self._root:
+            return PersistentTree._from_root((item,))
+        nodes: List[Any] = self._insert(self._root, item)
+        if not nodes:
+            return self
+        return PersistentTree._from_root(
+            nodes[0] if len(nodes) == 1 else _Node(nodes)
+        )
+
+    def _insert(self, node: Union[_Node, tuple], item: Any) -> List[Any]:
+        # Returns the replacement of the node as a list of one node, or of
+        # two nodes, when the node has overflown and has been split. An empty
+        # list means, that the item has been present already.
+        if isinstance(node, tuple):
+            idx: int = bisect_left(node, item)
+            if idx != len(node) and node[idx] == item:
+                return []
+            leaf: tuple = node[:idx] + (item,) + node[idx:]
+            if len(leaf) <= _LEAF_SIZE:
+                return [leaf]
+            half: int = len(leaf) // 2
+            return [leaf[:half], leaf[half:]]
+        pos: int = min(bisect_left(node.maxes, item), len(node.children) - 1)
+        replacement: List[Any] = self._insert(node.children[pos], item)
+        if not replacement:
+            return []
+        children: List[Any] = list(node.children)
+        children[pos:pos + 1] = replacement
+        if len(children) <= _FANOUT:
+            return [_Node(children)]
+        half = len(children) // 2
+        return [_Node(children[:half]), _Node(children[half:])]
+
+    def remove(self, item: Any) -> PersistentTree:
+        # Returns a tree with the item removed, or this very tree, when the
+        # item is not present. Nodes are not rebalanced upon removal, only
+        # the empty ones are dropped.
+        replacement: Any = self._remove(self._root, item)
+        if replacement is self._root:
+            return self
+        return PersistentTree._from_root(replacement if replacement else ())
+
+    def _remove(self, node: Union[_Node, tuple], item: Any) -> Any:
+        # Returns the replacement of the node, None when the node has become
+        # empty, or the node itself, when the item is not present.
+        if isinstance(node, tuple):
+            idx: int = bisect_left(node, item)
+            if idx == len(node) or node[idx] != item:
+                return node
+            return (node[:idx] + node[idx + 1:]) or None
+        pos: int = bisect_left(node.maxes, item)
+        if pos == len(node.children):
+            return node
+        child: Any = node.children[pos]
+        replacement: Any = self._remove(child, item)
+        if replacement is child:
+            return node
+        children: List[Any] = list(node.children)
+        if replacement is None:
+            del children[pos]
+        else:
+            children[pos] = replacement
+        return _Node(children) if children else None
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,457 @@
+# pylint: disable=missing-module-docstring
+
+from __future__ import annotations
+
+import re
+from typing import Iterable, Any, Iterator, Union, List, Tuple, Callable
+from collections.abc import Sequence
+from itertools import chain, compress, groupby, islice, repeat
+from operator import add, and_, or_, xor
+from bisect import bisect_left, bisect_right
+from array import array
+from math import ceil, floor
+
+
+# Integers are split into their high bits, which select a container, and
+# their low 16 bits, which are stored in that container. Each container
+# holds the low bits in one of three kinds of layouts. An array container
+# is a sorted array of the low bits, a bitmap container is a Python integer
+# with one bit per possible low bit, and a run container is an array of the
+# first, and the last low bits of each run of consecutive integers. Each
+# container takes the layout, which takes the fewest bytes.
+_ARRAY: int = 0
+_BITMAP: int = 1
+_RUN: int = 2
+_LOW_BITS: int = 16
+_LOW_MASK: int = (1 << _LOW_BITS) - 1
+_BITMAP_BYTES: int = (1 << _LOW_BITS) // 8
+_BINARY_DIGITS: bytes = bytes.maketrans(b'01', b'\x00\x01')
+_RUNS: re.Pattern = re.compile('1+')
+
+
+def _kind_of(cardinality: int, runs: int) -> int:
+    """Returns the kind of the container, which takes the fewest bytes for
+    the given number of low bits and runs.
+
+    :param cardinality: Number of low bits in the container
+    :type cardinality: int
+    :param runs: Number of runs of consecutive low bits
+    :type runs: int
+    :return: Kind of the container
+    :rtype: int
+    """
+    return min((2 * cardinality, _ARRAY), (4 * runs, _RUN),
+               (_BITMAP_BYTES, _BITMAP))[1]
+
+
+def _container_of_lows(lows: List[int]) -> Tuple[int, Any]:
+    """Returns the kind, and the container for the sorted low bits.
+
+    :param lows: Sorted, and distinct low bits
+    :type lows: List[int]
+    :return: Kind of the container, and the container
+    :rtype: Tuple[int, Any]
+    """
+    # Consecutive low bits share the difference to their position.
+    runs: List[List[Tuple[int, int]]] = [
+        list(group) for _, group in groupby(enumerate(lows),
+                                            key=lambda p: p[1] - p[0])
+    ]
+    kind: int = _kind_of(cardinality=len(lows), runs=len(runs))
+    if kind == _ARRAY:
+        return kind, array('H', lows)
+    if kind == _RUN:
+        return kind, array('H', chain.from_iterable(
+            (run[0][1], run[-1][1]) for run in runs
+        ))
+    flags: bytearray = bytearray(_BITMAP_BYTES)
+    for low in lows:
+        flags[low >> 3] |= 1 << (low & 7)
+    return kind, int.from_bytes(flags, 'little')
+
+
+def _container_of_bits(bits: int) -> Tuple[int, Any]:
+    """Returns the kind, and the container for the bitmap of low bits. The
+    result equals the one of _container_of_lows for the same low bits, so
+    that equal sets always have equal containers.
+
+    :param bits: Bitmap of the low bits
+    :type bits: int
+    :return: Kind of the container, and the container
+    :rtype: Tuple[int, Any]
+    """
+    # Each run of set bits starts with a set bit, which is preceded by an
+    # unset one.
+    kind: int = _kind_of(cardinality=bits.bit_count(),
+                         runs=(bits & ~(bits << 1)).bit_count())
+    if kind == _BITMAP:
+        return kind, bits
+    binary: str = format(bits, 'b')[::-1]
+    if kind == _RUN:
+        return kind, array('H', chain.from_iterable(
+            (run.start(), run.end() - 1) for run in _RUNS.finditer(binary)
+        ))
+    return kind, array('H', _lows_of_binary(binary))
+
+
+def _lows_of_binary(binary: str) -> Iterator[int]:
+    """Returns the positions of the set bits of the binary digits, which are
+    in order from the least significant one.
+
+    :param binary: Binary digits of a bitmap
+    :type binary: str
+    :return: Positions of the set bits
+    :rtype: Iterator[int]
+    """
+    return compress(range(len(binary)),
+                    binary.encode().translate(_BINARY_DIGITS))
+
+
+def _bits_of(kind: int, container: Any) -> int:
+    """Returns the bitmap of the low bits in the container.
+
+    :param kind: Kind of the container
+    :type kind: int
+    :param container: Container of the low bits
+    :type container: Any
+    :return: Bitmap of the low bits
+    :rtype: int
+    """
+    if kind == _BITMAP:
+        return container
+    if kind == _RUN:
+        bits: int = 0
+        for first, last in zip(container[::2], container[1::2]):
+            bits |= ((1 << (last - first + 1)) - 1) << first
+        return bits
+    flags: bytearray = bytearray(_BITMAP_BYTES)
+    for low in container:
+        flags[low >> 3] |= 1 << (low & 7)
+    return int.from_bytes(flags, 'little')
+
+
+def _lows_of(kind: int, container: Any) -> Iterable[int]:
+    """Returns the low bits in the container in ascending order.
+
+    :param kind: Kind of the container
+    :type kind: int
+    :param container: Container of the low bits
+    :type container: Any
+    :return: Low bits in ascending order
+    :rtype: Iterable[int]
+    """
+    if kind == _ARRAY:
+        return container
+    if kind == _RUN:
+        return chain.from_iterable(
+            map(range, container[::2], (last + 1 for last in container[1::2]))
+        )
+    return _lows_of_binary(format(container, 'b')[::-1])
+
+
+def _cardinality_of(kind: int, container: Any) -> int:
+    """Returns the number of low bits in the container.
+
+    :param kind: Kind of the container
+    :type kind: int
+    :param container: Container of the low bits
+    :type container: Any
+    :return: Number of low bits
+    :rtype: int
+    """
+    if kind == _ARRAY:
+        return len(container)
+    if kind == _RUN:
+        return sum(container[1::2]) - sum(container[::2]) + len(container) // 2
+    return container.bit_count()
+
+
+def _rank_of(kind: int, container: Any, low: int) -> int:
+    """Returns the number of low bits in the container less than the given
+    one.
+
+    :param kind: Kind of the container
+    :type kind: int
+    :param container: Container of the low bits
+    :type container: Any
+    :param low: Low bits to be ranked
+    :type low: int
+    :return: Number of lesser low bits
+    :rtype: int
+    """
+    if kind == _ARRAY:
+        return bisect_left(container, low)
+    if kind == _BITMAP:
+        return (container & ((1 << low) - 1)).bit_count()
+    # The runs preceding the last one, which starts before the low bits,
+    # count as a whole, while that last run counts up to the low bits.
+    firsts: array = container[::2]
+    lasts: array = container[1::2]
+    k: int = bisect_left(firsts, low)
+    if not k:
+        return 0
+    return (sum(lasts[:k - 1]) - sum(firsts[:k - 1]) + k - 1 +
+            min(lasts[k - 1], low - 1) - firsts[k - 1] + 1)
+
+
+def _select_of(kind: int, container: Any, rank: int) -> int:
+    """Returns the low bits of the given rank in the container.
+
+    :param kind: Kind of the container
+    :type kind: int
+    :param container: Container of the low bits
+    :type container: Any
+    :param rank: Rank of the low bits
+    :type rank: int
+    :return: Low bits of the rank
+    :rtype: int
+    """
+    if kind == _ARRAY:
+        return container[rank]
+    if kind == _RUN:
+        for first, last in zip(container[::2], container[1::2]):
+            if rank <= last - first:
+                return first + rank
+            rank -= last - first + 1
+        raise IndexError('rank out of range')
+    # We search for the shortest prefix of the bitmap, which holds more set
+    # bits than the rank, with one population count per step.
+    lo: int = 0
+    hi: int = 1 << _LOW_BITS
+    while lo < hi:
+        mid: int = (lo + hi) // 2
+        if (container & ((2 << mid) - 1)).bit_count() > rank:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+class RoaringStorage(Sequence):
+    """Storage for sorted, and distinct integers in the style of the Roaring
+    bitmaps. The integers are grouped by their high bits into containers of
+    their low 16 bits. Each container is an array, a bitmap, or a list of
+    runs, whichever is the smallest. The set algebra of two storages
+    combines the bitmaps of the containers with the same high bits, so that
+    Python compares no items one by one.
+    """
+
+    __slots__ = ('_highs', '_kinds', '_containers', '_offsets')
+
+    _highs: List[int]
+    _kinds: bytearray
+    _containers: List[Any]
+    _offsets: List[int]
+
+    def __init__(self, items: Iterable = ()) -> None:
+        # The items must be sorted, and distinct integers already.
+        self._highs = []
+        self._kinds = bytearray()
+        self._containers = []
+        for high, group in groupby(items, key=lambda x: x >> _LOW_BITS):
+            self._append(high, *_container_of_lows(
+                [item & _LOW_MASK for item in group]
+            ))
+        self._index()
+
+    def _append(self, high: int, kind: int, container: Any) -> None:
+        self._highs.append(high)
+        self._kinds.append(kind)
+        self._containers.append(container)
+
+    def _index(self) -> None:
+        # Computes the number of items preceding each container, which
+        # guides the search for a position.
+        self._offsets = [0]
+        for kind, container in zip(self._kinds, self._containers):
+            self._offsets.append(
+                self._offsets[-1] + _cardinality_of(kind, container)
+            )
+
+    def __reduce__(self) -> Tuple[Any, tuple]:
+        return _from_containers, (self._highs, self._kinds, self._containers)
+
+    def __sizeof__(self) -> int:
+        return (object.__sizeof__(self) + self._highs.__sizeof__() +
+                self._kinds.__sizeof__() + self._offsets.__sizeof__() +
+                self._containers.__sizeof__() +
+                sum(container.__sizeof__() for container in self._containers))
+
+    def __eq__(self, other: Any) -> bool:
+        # The kind of each container is determined by its low bits alone,
+        # hence equal storages have equal containers.
+        if not isinstance(other, RoaringStorage):
+            return NotImplemented
+        return (self._highs == other._highs and  # noqa
+                self._kinds == other._kinds and  # noqa
+                self._containers == other._containers)  # noqa
+
+    __hash__ = None
+
+    def __len__(self) -> int:
+        return self._offsets[-1]
+
+    def __contains__(self, item: Any) -> bool:
+        if not isinstance(item, int):
+            try:
+                whole: int = floor(item)
+            except (OverflowError, ValueError):
+                # Neither an infinity nor a NaN equals any integer.
+                return False
+            return item == whole and whole in self
+        pos: int = bisect_left(self._highs, item >> _LOW_BITS)
+        if pos == len(self._highs) or self._highs[pos] != item >> _LOW_BITS:
+            return False
+        low: int = item & _LOW_MASK
+        kind: int = self._kinds[pos]
+        container: Any = self._containers[pos]
+        if kind == _BITMAP:
+            return bool((container >> low) & 1)
+        return (_rank_of(kind, container, low + 1)
+                != _rank_of(kind, container, low))
+
+    def _items_of(self, pos: int) -> Iterable[int]:
+        return map(add, repeat(self._highs[pos] << _LOW_BITS),
+                   _lows_of(self._kinds[pos], self._containers[pos]))
+
+    def __iter__(self) -> Iterator:
+        return chain.from_iterable(map(self._items_of,
+                                       range(len(self._highs))))
+
+    def __reversed__(self) -> Iterator:
+        return chain.from_iterable(
+            reversed(list(self._items_of(pos)))
+            for pos in reversed(range(len(self._highs)))
+        )
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            rng: range = range(len(self))[index]
+            if not rng:
+                return ()
+            if rng.step != 1:
+                # Locating each of the items by its position takes a search
+                # within its container, hence we decode the contiguous run
+                # covering the items, and pick them from the run instead.
+                lo: int = min(rng[0], rng[-1])
+                run: tuple = self[lo:max(rng[0], rng[-1]) + 1]
+                return run[rng.start - lo::rng.step]
+            pos: int = bisect_right(self._offsets, rng.start) - 1
+            return tuple(islice(
+                chain.from_iterable(map(self._items_of,
+                                        range(pos, len(self._highs)))),
+                rng.start - self._offsets[pos],
+                rng.stop - self._offsets[pos]
+            ))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('RoaringStorage index out of range')
+        pos = bisect_right(self._offsets, index) - 1
+        return (self._highs[pos] << _LOW_BITS) | _select_of(
+            self._kinds[pos], self._containers[pos],
+            index - self._offsets[pos]
+        )
+
+    def rank(self, item: Any, right: bool = False) -> int:
+        # Returns the number of our items less than the item, or less than,
+        # or equal to the item with the right flag. The containers with
+        # lesser high bits count as a whole, and the one with the same high
+        # bits counts its lesser low bits.
+        if not isinstance(item, int):
+            try:
+                item = ceil(item) if not right else floor(item)
+            except OverflowError:
+                # An infinity is beyond all of our items on its side.
+                return len(self) if item > 0 else 0
+            except ValueError:
+                # A NaN is neither less nor greater than any of our items,
+                # which the bisect module resolves to both of the ends.
+                return len(self) if right else 0
+        if right:
+            item += 1
+        high: int = item >> _LOW_BITS
+        pos: int = bisect_left(self._highs, high)
+        rank: int = self._offsets[pos]
+        if pos != len(self._highs) and self._highs[pos] == high:
+            rank += _rank_of(self._kinds[pos], self._containers[pos],
+                             item & _LOW_MASK)
+        return rank
+
+    def _combine(self, other: RoaringStorage, op: Callable[[int, int], int],
+                 left: bool, right: bool) -> RoaringStorage:
+        # Walks the containers of both the storages in the order of their
+        # high bits. Containers with the same high bits are combined by the
+        # bitwise operation on their bitmaps, while the others are kept as
+        # they are, if their side is kept by the operation.
+        result: RoaringStorage = RoaringStorage()
+        i: int = 0
+        j: int = 0
+        n: int = len(self._highs)
+        m: int = len(other._highs)  # noqa
+        while i < n and j < m:
+            a: int = self._highs[i]
+            b: int = other._highs[j]  # noqa
+            if a < b:
+                if left:
+                    result._append(a, self._kinds[i], self._containers[i])
+                i += 1
+            elif b < a:
+                if right:
+                    result._append(b, other._kinds[j],  # noqa
+                                   other._containers[j])  # noqa
+                j += 1
+            else:
+                bits: int = op(
+                    _bits_of(self._kinds[i], self._containers[i]),
+                    _bits_of(other._kinds[j], other._containers[j])  # noqa
+                )
+                if bits:
+                    result._append(a, *_container_of_bits(bits))
+                i += 1
+                j += 1
+        for pos in range(i, n) if left else ():
+            result._append(self._highs[pos], self._kinds[pos],
+                           self._containers[pos])
+        for pos in range(j, m) if right else ():
+            result._append(other._highs[pos], other._kinds[pos],  # noqa
+                           other._containers[pos])  # noqa
+        result._index()
+        return result
+
+    def __and__(self, other: RoaringStorage) -> RoaringStorage:
+        return self._combine(other, and_, left=False, right=False)
+
+    def __or__(self, other: RoaringStorage) -> RoaringStorage:
+        return self._combine(other, or_, left=True, right=True)
+
+    def __sub__(self, other: RoaringStorage) -> RoaringStorage:
+        return self._combine(other, lambda a, b: a & ~b,
+                             left=True, right=False)
+
+    def __xor__(self, other: RoaringStorage) -> RoaringStorage:
+        return self._combine(other, xor, left=True, right=True)
+
+
+def _from_containers(highs: List[int], kinds: bytearray,
+                     containers: List[Any]) -> RoaringStorage:
+    """Restores a pickled RoaringStorage from its containers.
+
+    :param highs: High bits of each container
+    :type highs: List[int]
+    :param kinds: Kind of each container
+    :type kinds: bytearray
+    :param containers: Containers of the low bits
+    :type containers: List[Any]
+    :return: Restored RoaringStorage
+    :rtype: RoaringStorage
+    """
+    storage: RoaringStorage = RoaringStorage()
+    for high, kind, container in zip(highs, kinds, containers):
+        storage._append(high, kind, container)  # noqa
+    storage._index()  # noqa
+    return storage
+
+
+if __name__ == '__main__':
+    pass
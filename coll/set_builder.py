@@ -0,0 +1,131 @@
+# pylint: disable=missing-module-docstring
+
+from __future__ import annotations
+
+import os
+from typing import Iterable, Any, List, Optional
+from collections.abc import Sequence
+from itertools import groupby
+from heapq import merge
+from tempfile import TemporaryDirectory
+from frozen_set import SortedFrozenSet
+import mapped_storage
+
+
+class SortedFrozenSetBuilder:
+    """Streaming builder of a SortedFrozenSet, whose items do not fit into
+    the memory all at once. At most max_items distinct items are buffered in
+    the memory. Once the buffer is full, its items are sorted, and spilled
+    as a run into a temporary file of the memory-mapped format. Finishing
+    the builder merges all the runs in a single pass, and writes the result
+    into the memory-mapped file, so that the peak memory stays bounded by
+    the buffer, regardless of the number of items.
+    """
+
+    _max_items: int
+    _typecode: Optional[str]
+    _dir: Optional[str]
+    _buffer: set
+    _runs: List[str]
+    _kind: Optional[bytes]
+    _spilled: int
+    _tmp: Optional[TemporaryDirectory]
+
+    def __init__(self, max_items: int = 1 << 20,
+                 typecode: Optional[str] = None,
+                 dir: Optional[str] = None) -> None:
+        # pylint: disable=redefined-builtin
+        if max_items < 1:
+            raise ValueError('max_items must be positive')
+        self._max_items = max_items
+        self._typecode = typecode
+        self._dir = dir
+        self._buffer = set()
+        self._runs = []
+        self._kind = None
+        self._spilled = 0
+        self._tmp = None
+
+    @property
+    def runs(self) -> int:
+        # Number of runs spilled into the temporary files so far.
+        return len(self._runs)
+
+    @property
+    def spilled(self) -> int:
+        # Number of items spilled into the temporary files so far, which
+        # may still hold duplicates across the runs.
+        return self._spilled
+
+    def add(self, item: Any) -> None:
+        self._buffer.add(item)
+        if len(self._buffer) >= self._max_items:
+            self._spill()
+
+    def extend(self, items: Iterable) -> None:
+        for item in items:
+            self.add(item)
+
+    def _spill(self) -> None:
+        # Writes the sorted buffer as a run into a temporary file. All the
+        # runs must be of the same kind, so that they can be merged into a
+        # single file.
+        srt: List[Any] = sorted(self._buffer)
+        kind: bytes = mapped_storage.kind_of(items=srt,
+                                             typecode=self._typecode)
+        if self._kind is None:
+            self._kind = kind
+        elif kind != self._kind:
+            raise TypeError('Items of different kinds can not be merged')
+        if self._tmp is None:
+            self._tmp = TemporaryDirectory(dir=self._dir)
+        path: str = os.path.join(self._tmp.name, f'run{len(self._runs)}')
+        self._spilled += mapped_storage.save(
+            path=path, items=srt, kind=kind
+        )
+        self._runs.append(path)
+        self._buffer = set()
+
+    def finish(self, path: Optional[str] = None) -> SortedFrozenSet:
+        # Returns the SortedFrozenSet of all the added items, and resets the
+        # builder. With a path, the set is written into the memory-mapped
+        # file, and opened from there. Without a path, the set is built in
+        # the memory.
+        try:
+            if not self._runs:
+                result: SortedFrozenSet = SortedFrozenSet.from_sorted_unique(
+                    items=sorted(self._buffer), typecode=self._typecode
+                )
+                if path is None:
+                    return result
+                result.save(path=path)
+                return SortedFrozenSet.open_mmap(path=path)
+            if self._buffer:
+                self._spill()
+            runs: List[Sequence] = [
+                mapped_storage.open_mapped(path=run)[0] for run in self._runs
+            ]
+            # Each run is distinct already, hence duplicates only occur
+            # across the runs, where they end up adjacent to each other.
+            items: Iterable = (key for key, _ in groupby(merge(*runs)))
+            if path is None:
+                return SortedFrozenSet.from_sorted_unique(
+                    items=list(items), typecode=self._typecode
+                )
+            mapped_storage.save(path=path, items=items, kind=self._kind)
+            return SortedFrozenSet.open_mmap(path=path)
+        finally:
+            self._reset()
+
+    def _reset(self) -> None:
+        self._buffer = set()
+        self._runs = []
+        self._kind = None
+        self._spilled = 0
+        if self._tmp is not None:
+            self._tmp.cleanup()
+            self._tmp = None
+
+
+if __name__ == '__main__':
+    pass
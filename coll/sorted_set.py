@@ -0,0 +1,291 @@
+# pylint: disable=missing-module-docstring
+
+from __future__ import annotations
+
+from typing import Iterable, Any, Iterator, Union, List, Optional, Tuple
+from collections.abc import Sequence, MutableSet
+from itertools import chain, islice
+from bisect import bisect_left, bisect_right
+from frozen_set import SortedFrozenSet, _merge_union, _sorted_storage_of
+
+
+class SortedSet(Sequence, MutableSet):
+    """Mutable companion of the SortedFrozenSet. Instead of a single sorted
+    collection, which would need to be rebuilt upon each insertion, the items
+    are kept in a list of sorted lists, each holding at most twice the load
+    factor items. Inserting or removing an item only touches one of these
+    lists, which keeps the mutations cheap, while the largest item of each
+    list allows us to locate the right one using the binary search.
+    """
+
+    _load: int = 1000
+
+    _lists: List[List[Any]]
+    _maxes: List[Any]
+    _offsets: Optional[List[int]]
+    _len: int
+
+    def __init__(self, items: Iterable = None) -> None:
+        storage: Optional[Sequence] = _sorted_storage_of(items)
+        self._reset(
+            storage if storage is not None
+            else sorted(set(items) if items is not None else set())
+        )
+
+    def _reset(self, srt: Sequence) -> None:
+        # Splits the sorted, and distinct items into lists of the load factor
+        # length.
+        self._lists = [
+            list(srt[pos:pos + self._load])
+            for pos in range(0, len(srt), self._load)
+        ]
+        self._maxes = [lst[-1] for lst in self._lists]
+        self._offsets = None
+        self._len = len(srt)
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+        # Translates a position in the whole set into the position of the
+        # list, and the position within that list. The offsets of the lists
+        # are computed lazily, and discarded upon each mutation.
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError('SortedSet index out of range')
+        offsets: List[int] = self._offsets_of_lists()
+        pos: int = bisect_right(offsets, index) - 1
+        return pos, index - offsets[pos]
+
+    def _position(self, pos: int, idx: int) -> int:
+        # Inverse of _locate, translates the position of the list, and the
+        # position within that list into a position in the whole set.
+        return self._offsets_of_lists()[pos] + idx
+
+    def _offsets_of_lists(self) -> List[int]:
+        if self._offsets is None:
+            self._offsets = [0]
+            for lst in self._lists[:-1]:
+                self._offsets.append(self._offsets[-1] + len(lst))
+        return self._offsets
+
+    def _expand(self, pos: int) -> None:
+        # Splits the list in half, once it has grown beyond twice the load
+        # factor.
+        lst: List[Any] = self._lists[pos]
+        if len(lst) > 2 * self._load:
+            half: List[Any] = lst[self._load:]
+            del lst[self._load:]
+            self._maxes[pos] = lst[-1]
+            self._lists.insert(pos + 1, half)
+            self._maxes.insert(pos + 1, half[-1])
+
+    def _contract(self, pos: int) -> None:
+        # Removes the list once it is empty, and merges it into its
+        # predecessor once it has shrunk below half the load factor.
+        lst: List[Any] = self._lists[pos]
+        if not lst:
+            del self._lists[pos]
+            del self._maxes[pos]
+        elif len(lst) < self._load // 2 and pos > 0:
+            self._lists[pos - 1].extend(lst)
+            self._maxes[pos - 1] = lst[-1]
+            del self._lists[pos]
+            del self._maxes[pos]
+            self._expand(pos - 1)
+        else:
+            self._maxes[pos] = lst[-1]
+
+    def add(self, value: Any) -> None:
+        if not self._maxes:
+            self._lists.append([value])
+            self._maxes.append(value)
+        else:
+            pos: int = bisect_left(self._maxes, value)
+            if pos == len(self._maxes):
+                # The value is larger than all of our items, hence it goes
+                # to the end of the last list.
+                pos -= 1
+                self._lists[pos].append(value)
+                self._maxes[pos] = value
+            else:
+                lst: List[Any] = self._lists[pos]
+                idx: int = bisect_left(lst, value)
+                if lst[idx] == value:
+                    return
+                lst.insert(idx, value)
+            self._expand(pos)
+        self._len += 1
+        self._offsets = None
+
+    def discard(self, value: Any) -> None:
+        pos: int = bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            return
+        lst: List[Any] = self._lists[pos]
+        idx: int = bisect_left(lst, value)
+        if lst[idx] != value:
+            return
+        del lst[idx]
+        self._contract(pos)
+        self._len -= 1
+        self._offsets = None
+
+    def update(self, *iterables: Iterable) -> None:
+        values: List[Any] = sorted(set(chain.from_iterable(iterables)))
+        if len(values) * 4 >= self._len:
+            # For a large batch, merging it with our items, and splitting
+            # the result again is cheaper than inserting one by one.
+            self._reset(_merge_union(list(self), values))
+        else:
+            for value in values:
+                self.add(value)
+
+    def clear(self) -> None:
+        self._reset([])
+
+    def pop(self, index: int = -1) -> Any:
+        pos, idx = self._locate(index)
+        lst: List[Any] = self._lists[pos]
+        value: Any = lst.pop(idx)
+        self._contract(pos)
+        self._len -= 1
+        self._offsets = None
+        return value
+
+    def copy(self) -> SortedSet:
+        return self._from_sorted(list(self))
+
+    def freeze(self) -> SortedFrozenSet:
+        # Our items are already sorted and distinct, hence we hand them to
+        # the trusted constructor of the SortedFrozenSet, which only
+        # concatenates the lists, and skips the intermediate set as well as
+        # the sorting.
+        return SortedFrozenSet.from_sorted_unique(
+            items=chain.from_iterable(self._lists)
+        )
+
+    @classmethod
+    def _from_sorted(cls, srt: Sequence) -> SortedSet:
+        obj: SortedSet = cls.__new__(cls)
+        obj._reset(srt)
+        return obj
+
+    def __contains__(self, item: Any) -> bool:
+        pos: int = bisect_left(self._maxes, item)
+        if pos == len(self._maxes):
+            return False
+        lst: List[Any] = self._lists[pos]
+        return lst[bisect_left(lst, item)] == item
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator:
+        return chain.from_iterable(self._lists)
+
+    def __reversed__(self) -> Iterator:
+        return chain.from_iterable(map(reversed, reversed(self._lists)))
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            # A slice of a sorted collection of distinct items is sorted and
+            # distinct again, hence we skip the sorting.
+            srt: List[Any] = list(self)[index]
+            return self._from_sorted(
+                srt[::-1] if (index.step or 1) < 0 else srt
+            )
+        pos, idx = self._locate(index)
+        return self._lists[pos][idx]
+
+    def __repr__(self) -> str:
+        return '{type}(items={args})'.format(
+            type=self.__class__.__name__,
+            args='[{}]'.format(', '.join(map(repr, self))) if self else ''
+        )
+
+    def count(self, item: Any) -> int:
+        return int(item in self)
+
+    def index(self, item: Any, start: int = ..., stop: int = ...) -> int:
+        pos: int = bisect_left(self._maxes, item)
+        if pos != len(self._maxes):
+            lst: List[Any] = self._lists[pos]
+            idx: int = bisect_left(lst, item)
+            if lst[idx] == item:
+                return self._position(pos, idx)
+        raise ValueError(f'{item!r} not found')
+
+    # Following methods mirror the order-based queries of the
+    # SortedFrozenSet. We first locate the list by its largest item, followed
+    # by the position within that list.
+    def bisect_left(self, item: Any) -> int:
+        pos: int = bisect_left(self._maxes, item)
+        if pos == len(self._maxes):
+            return self._len
+        return self._position(pos, bisect_left(self._lists[pos], item))
+
+    def bisect_right(self, item: Any) -> int:
+        pos: int = bisect_right(self._maxes, item)
+        if pos == len(self._maxes):
+            return self._len
+        return self._position(pos, bisect_right(self._lists[pos], item))
+
+    def rank(self, item: Any) -> int:
+        return self.bisect_left(item)
+
+    def select(self, rank: int) -> Any:
+        if not 0 <= rank < self._len:
+            raise IndexError(f'rank {rank} out of range')
+        return self[rank]
+
+    def floor(self, item: Any) -> Any:
+        index: int = self.bisect_right(item)
+        return self[index - 1] if index else None
+
+    def ceiling(self, item: Any) -> Any:
+        index: int = self.bisect_left(item)
+        return self[index] if index != self._len else None
+
+    def lower(self, item: Any) -> Any:
+        index: int = self.bisect_left(item)
+        return self[index - 1] if index else None
+
+    def higher(self, item: Any) -> Any:
+        index: int = self.bisect_right(item)
+        return self[index] if index != self._len else None
+
+    def irange(self, lo: Any = None, hi: Any = None,
+               inclusive: Tuple[bool, bool] = (True, False)) -> Iterator:
+        # Unlike the SortedFrozenSet, we can not hand out a view over our
+        # storage, since it may change. Instead, we return a lazy iterator.
+        start: int = 0
+        stop: int = self._len
+        if lo is not None:
+            start = (self.bisect_left(lo) if inclusive[0]
+                     else self.bisect_right(lo))
+        if hi is not None:
+            stop = (self.bisect_right(hi) if inclusive[1]
+                    else self.bisect_left(hi))
+        if start >= stop:
+            return iter(())
+        pos, idx = self._locate(start)
+        return islice(
+            chain(islice(self._lists[pos], idx, None),
+                  chain.from_iterable(islice(self._lists, pos + 1, None))),
+            stop - start
+        )
+
+    def rank_many(self, keys: Iterable) -> List[int]:
+        return [self.bisect_left(key) for key in keys]
+
+    def contains_many(self, keys: Iterable) -> List[bool]:
+        return [key in self for key in keys]
+
+    def index_many(self, keys: Iterable) -> List[int]:
+        return [
+            self.index(key) if key in self else -1
+            for key in keys
+        ]
+
+
+if __name__ == '__main__':
+    pass
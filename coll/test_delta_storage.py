@@ -0,0 +1,63 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import unittest
+from unittest import TestCase
+from typing import List
+import pickle
+from delta_storage import DeltaStorage
+
+
+class DeltaStorageTestCase(TestCase):
+    # Following testcases cover the block encoding with a block size of 4.
+    # The items mix small gaps, large gaps, and negative integers.
+
+    _items: List[int]
+    _storage: DeltaStorage
+
+    def setUp(self) -> None:
+        self._items = (list(range(-5, 10)) + [100, 1000, 10 ** 15]
+                       + list(range(10 ** 15 + 2, 10 ** 15 + 40, 3)))
+        self._storage = DeltaStorage(items=self._items, block_size=4)
+
+    def test_items(self) -> None:
+        self.assertEqual(len(self._storage), len(self._items))
+        self.assertEqual(list(self._storage), self._items)
+        self.assertEqual(list(reversed(self._storage)), self._items[::-1])
+        n: int = len(self._items)
+        self.assertEqual([self._storage[k] for k in range(-n, n)],
+                         self._items * 2)
+        with self.assertRaises(IndexError):
+            _ = self._storage[n]
+
+    def test_slice(self) -> None:
+        self.assertEqual(self._storage[3:17], tuple(self._items[3:17]))
+        self.assertEqual(self._storage[::-3], tuple(self._items[::-3]))
+        self.assertEqual(self._storage[5:5], ())
+
+    def test_search_bounds(self) -> None:
+        self.assertEqual(self._storage.search_bounds(-10), (0, 0))
+        self.assertEqual(self._storage.search_bounds(0), (4, 8))
+        self.assertEqual(self._storage.search_bounds(10 ** 16),
+                         (28, len(self._items)))
+
+    def test_dense_blocks_take_no_gaps(self) -> None:
+        dense: DeltaStorage = DeltaStorage(items=range(1000))
+        sparse: DeltaStorage = DeltaStorage(items=range(0, 10 ** 6, 1000))
+        self.assertLess(dense.__sizeof__(), sparse.__sizeof__())
+        self.assertEqual(list(dense), list(range(1000)))
+
+    def test_empty(self) -> None:
+        empty: DeltaStorage = DeltaStorage()
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(list(empty), [])
+        self.assertEqual(empty.search_bounds(1), (0, 0))
+
+    def test_pickle(self) -> None:
+        restored: DeltaStorage = pickle.loads(pickle.dumps(self._storage))
+        self.assertEqual(list(restored), self._items)
+        self.assertEqual(restored.block_size, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
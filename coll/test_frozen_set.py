@@ -4,9 +4,19 @@
 import unittest
 from unittest import TestCase
 from typing import List, Iterator, Container, Sized, Sequence, Hashable
-from typing import Iterable
-from frozen_set import SortedFrozenSet
+from typing import Iterable, Tuple, Callable
+from frozen_set import SortedFrozenSet, SortedFrozenSetView, SetInternPool
+from frozen_set import union_all, intersect_all
+from delta_storage import DeltaStorage
+from roaring_storage import RoaringStorage
+import roaring_storage
+from bloom_filter import BloomFilter
 from collections.abc import Set
+from array import array
+from bisect import bisect_left, bisect_right
+from tempfile import TemporaryDirectory
+import os
+import pickle
 
 
 class ConstructionTestCase(TestCase):
@@ -38,6 +48,59 @@ class ConstructionTestCase(TestCase):
             self.fail('Failed to construct SortedFrozenSet without arguments')
 
 
+class SortedConstructionTestCase(TestCase):
+    # Following testcases cover the constructors, which trust the provided
+    # items to be sorted already, and skip the intermediate set and sorting.
+
+    def test_from_sorted(self) -> None:
+        s: SortedFrozenSet = SortedFrozenSet.from_sorted(items=[1, 2, 2, 5])
+        self.assertEqual(s, SortedFrozenSet(items=[1, 2, 5]))
+
+    def test_from_sorted_out_of_order(self) -> None:
+        with self.assertRaises(ValueError):
+            _ = SortedFrozenSet.from_sorted(items=[1, 5, 2])
+
+    def test_from_sorted_without_validation(self) -> None:
+        s: SortedFrozenSet = SortedFrozenSet.from_sorted(
+            items=iter([1, 1, 3, 4, 4]), validate=False
+        )
+        self.assertEqual(list(s), [1, 3, 4])
+
+    def test_from_sorted_unique(self) -> None:
+        s: SortedFrozenSet = SortedFrozenSet.from_sorted_unique(
+            items=iter([2, 4, 8])
+        )
+        self.assertEqual(s, SortedFrozenSet(items=[8, 4, 2]))
+
+    def test_from_sorted_range(self) -> None:
+        s: SortedFrozenSet = SortedFrozenSet.from_sorted(
+            items=range(10, 0, -3)
+        )
+        self.assertEqual(list(s), [1, 4, 7, 10])
+        self.assertEqual(s[1:3], SortedFrozenSet(items=[4, 7]))
+        self.assertEqual(s.index(7), 2)
+
+    def test_build_parallel(self) -> None:
+        items: List[int] = [(k * 37) % 101 for k in range(300)]
+        timings: dict = {}
+        s: SortedFrozenSet = SortedFrozenSet.build_parallel(
+            items=iter(items), workers=2, chunk_size=64, timings=timings
+        )
+        self.assertEqual(s, SortedFrozenSet(items=items))
+        self.assertEqual(set(timings), {'chunk', 'sort', 'merge', 'total'})
+        t: SortedFrozenSet = SortedFrozenSet.build_parallel(
+            items=items, workers=2, typecode='q'
+        )
+        self.assertEqual(t, s)
+        self.assertIsInstance(t._items, array)  # noqa
+
+    def test_shares_storage(self) -> None:
+        s: SortedFrozenSet = SortedFrozenSet(items=[3, 1, 2])
+        self.assertIs(SortedFrozenSet.from_sorted(items=s)._items,  # noqa
+                      s._items)  # noqa
+        self.assertIs(SortedFrozenSet(items=s)._items, s._items)  # noqa
+
+
 class ContainerTestCase(TestCase):
 
     _set: SortedFrozenSet
@@ -169,6 +232,50 @@ class SequenceTestCase(TestCase):
     def test_slice_full(self) -> None:
         self.assertEqual(self._set[:], self._set)
 
+    # Following testcases cover the slice views, which share the storage of
+    # the sliced SortedFrozenSet instead of copying it.
+    def test_slice_is_view(self) -> None:
+        view: SortedFrozenSet = self._set[1:4]
+        self.assertIsInstance(view, SortedFrozenSetView)
+        self.assertIsInstance(view, SortedFrozenSet)
+        self.assertEqual(list(view), [4, 9, 13])
+
+    def test_slice_negative_step(self) -> None:
+        self.assertEqual(self._set[::-1], self._set)
+        self.assertEqual(self._set[::-2], SortedFrozenSet(items=[1, 9, 15]))
+        self.assertEqual(self._set[3:0:-1], SortedFrozenSet(items=[4, 9, 13]))
+
+    def test_slice_of_view(self) -> None:
+        view: SortedFrozenSet = self._set[1:][::2]
+        self.assertEqual(view, SortedFrozenSet(items=[4, 13]))
+        self.assertEqual(view[-1], 13)
+        self.assertEqual(view.index(13), 1)
+        self.assertTrue(4 in view)
+        self.assertFalse(9 in view)
+
+    def test_slice_view_hash(self) -> None:
+        self.assertEqual(hash(self._set[:3]),
+                         hash(SortedFrozenSet(items=[1, 4, 9])))
+
+    def test_slice_view_set_algebra(self) -> None:
+        view: SortedFrozenSet = self._set[1:4]
+        self.assertEqual(view | SortedFrozenSet(items=[2]),
+                         SortedFrozenSet(items=[2, 4, 9, 13]))
+        self.assertEqual(view & [4, 13, 15], SortedFrozenSet(items=[4, 13]))
+        self.assertTrue(view < self._set)
+        self.assertEqual(view + self._set[:1],
+                         SortedFrozenSet(items=[1, 4, 9, 13]))
+
+    def test_slice_view_materialize(self) -> None:
+        s: SortedFrozenSet = self._set[::2].materialize()
+        self.assertNotIsInstance(s, SortedFrozenSetView)
+        self.assertEqual(s, SortedFrozenSet(items=[1, 9, 15]))
+
+    def test_slice_view_repr(self) -> None:
+        view: SortedFrozenSet = self._set[:2]
+        self.assertEqual(repr(view), 'SortedFrozenSet(items=[1, 4])')
+        self.assertEqual(eval(repr(view)), view)  # pylint: disable=eval-used
+
     # Following test case validates the support for reversed Iterator for the
     # SortedFrozenSet type.
     def test_reversed(self) -> None:
@@ -276,6 +383,32 @@ class EqualityTestCase(TestCase):
         s: SortedFrozenSet = SortedFrozenSet(items=[10, 11, 12])
         self.assertTrue(s == s)
 
+    def test_different_length(self) -> None:
+        self.assertFalse(SortedFrozenSet(items=[4, 5, 6]) ==
+                         SortedFrozenSet(items=[4, 5]))
+
+    def test_different_bounds(self) -> None:
+        self.assertFalse(SortedFrozenSet(items=[4, 5, 6]) ==
+                         SortedFrozenSet(items=[4, 5, 7]))
+
+    def test_different_hashcode(self) -> None:
+        s: SortedFrozenSet = SortedFrozenSet(items=[4, 5, 6])
+        t: SortedFrozenSet = SortedFrozenSet(items=[4, 7, 6])
+        self.assertNotEqual(hash(s), hash(t))
+        self.assertFalse(s == t)
+
+    def test_empty(self) -> None:
+        self.assertTrue(SortedFrozenSet() == SortedFrozenSet(items=[]))
+
+    def test_same_unequal_item(self) -> None:
+        # Like tuples, sets holding the very same NaN object are equal, even
+        # though the NaN does not compare equal to itself.
+        nan: float = float('nan')
+        s: SortedFrozenSet = SortedFrozenSet(items=[nan])
+        self.assertTrue(s == SortedFrozenSet(items=[nan]))
+        self.assertTrue(s[:] == s)
+        self.assertFalse(s == SortedFrozenSet(items=[float('nan')]))
+
 
 class InequalityTestCase(TestCase):
 
@@ -301,6 +434,17 @@ class HashableTestCase(TestCase):
         self.assertEqual(hash(SortedFrozenSet(items=[5, 2, 1, 4])),
                          hash(SortedFrozenSet(items=[4, 1, 5, 2])))
 
+    def test_hashcode_is_cached(self) -> None:
+        s: SortedFrozenSet = SortedFrozenSet(items=[3, 1, 2])
+        self.assertIsNone(s._hash)  # noqa
+        self.assertEqual(hash(s), hash(s))
+        self.assertEqual(s._hash, hash(s))  # noqa
+
+    def test_no_instance_dict(self) -> None:
+        self.assertFalse(hasattr(SortedFrozenSet(items=[1]), '__dict__'))
+        self.assertFalse(hasattr(SortedFrozenSet(items=[1, 2])[:1],
+                                 '__dict__'))
+
     def test_protocol(self) -> None:
         self.assertTrue(issubclass(SortedFrozenSet, Hashable))
 
@@ -401,6 +545,50 @@ class SetRelationalMethodsTestCase(TestCase):
         self.assertFalse(s.isdisjoint(t))
 
 
+class RelationalMergeTestCase(TestCase):
+    # Following testcases cover the merge walk, the galloping search, and the
+    # bounds checks, which the relational operators rely upon.
+
+    _large: SortedFrozenSet
+
+    def setUp(self) -> None:
+        self._large = SortedFrozenSet(items=range(0, 1000, 2))
+
+    def test_subset_galloping(self) -> None:
+        self.assertTrue(SortedFrozenSet(items=[0, 500, 998]) <= self._large)
+        self.assertFalse(SortedFrozenSet(items=[0, 501, 998]) <= self._large)
+
+    def test_subset_linear(self) -> None:
+        s: SortedFrozenSet = SortedFrozenSet(items=range(0, 800, 4))
+        self.assertTrue(s < self._large)
+        self.assertTrue(self._large > s)
+        self.assertFalse(self._large < s)
+
+    def test_subset_out_of_bounds(self) -> None:
+        self.assertFalse(SortedFrozenSet(items=[-2, 0]) <= self._large)
+        self.assertFalse(SortedFrozenSet(items=[0, 1000]) <= self._large)
+
+    def test_empty_subset(self) -> None:
+        self.assertTrue(SortedFrozenSet() <= self._large)
+        self.assertTrue(SortedFrozenSet() <= SortedFrozenSet())
+
+    def test_isdisjoint(self) -> None:
+        odd: SortedFrozenSet = SortedFrozenSet(items=range(1, 1000, 2))
+        self.assertTrue(self._large.isdisjoint(odd))
+        self.assertTrue(self._large.isdisjoint(SortedFrozenSet(items=[3, 7])))
+        self.assertFalse(self._large.isdisjoint(SortedFrozenSet(items=[3, 8])))
+        self.assertTrue(self._large.isdisjoint(SortedFrozenSet(items=[2000])))
+
+    def test_issubset_iterable_with_duplicates(self) -> None:
+        s: SortedFrozenSet = SortedFrozenSet(items=[1, 2, 3])
+        self.assertFalse(s.issubset([1, 1, 2, 2]))
+        self.assertTrue(s.issubset(iter([5, 1, 1, 2, 3])))
+
+    def test_issuperset_iterator(self) -> None:
+        self.assertTrue(self._large.issuperset(iter([4, 4, 8])))
+        self.assertFalse(self._large.issuperset(iter([4, 5])))
+
+
 class SetAlgebraMethodsInfixNotationTestCase(TestCase):
 
     def test_intersection(self) -> None:
@@ -424,6 +612,105 @@ class SetAlgebraMethodsInfixNotationTestCase(TestCase):
         self.assertEqual(s - t, SortedFrozenSet(items={1}))
 
 
+class SetAlgebraMergeTestCase(TestCase):
+    # Following testcases cover both the linear merge, and the galloping
+    # merge, which is used when one operand is much larger than the other.
+    # We validate the results against the builtin set type.
+
+    _small: SortedFrozenSet
+    _medium: SortedFrozenSet
+    _large: SortedFrozenSet
+
+    def setUp(self) -> None:
+        self._small = SortedFrozenSet(items=[-5, 3, 18, 250, 999, 2000])
+        self._medium = SortedFrozenSet(items=range(0, 300, 3))
+        self._large = SortedFrozenSet(items=range(0, 1000, 2))
+
+    def _check(self, s: SortedFrozenSet, t: SortedFrozenSet) -> None:
+        self.assertEqual(list(s & t), sorted(set(s) & set(t)))
+        self.assertEqual(list(s | t), sorted(set(s) | set(t)))
+        self.assertEqual(list(s - t), sorted(set(s) - set(t)))
+        self.assertEqual(list(s ^ t), sorted(set(s) ^ set(t)))
+
+    def test_linear_merge(self) -> None:
+        self._check(self._medium, self._large)
+        self._check(self._large, self._medium)
+
+    def test_galloping_merge(self) -> None:
+        self._check(self._small, self._large)
+        self._check(self._large, self._small)
+
+    def test_empty_operand(self) -> None:
+        self._check(SortedFrozenSet(), self._large)
+        self._check(self._large, SortedFrozenSet())
+
+    def test_result_type(self) -> None:
+        self.assertIsInstance(self._small & self._large, SortedFrozenSet)
+        self.assertIsInstance(self._small.union([1, 2]), SortedFrozenSet)
+
+    def test_mixed_operand(self) -> None:
+        self.assertEqual(self._small & {3, 18, 19},
+                         SortedFrozenSet(items=[3, 18]))
+        self.assertEqual([3, 4] & self._small, SortedFrozenSet(items=[3]))
+
+
+class SetAlgebraAllTestCase(TestCase):
+    # Following testcases cover the union, and the intersection of many sets
+    # at once.
+
+    _sets: List[SortedFrozenSet]
+
+    def setUp(self) -> None:
+        self._sets = [
+            SortedFrozenSet(items=range(0, 60, 2)),
+            SortedFrozenSet(items=range(0, 60, 3)),
+            SortedFrozenSet(items=[0, 6, 30, 31, 54, 59]),
+        ]
+
+    def test_union_all(self) -> None:
+        s: SortedFrozenSet = union_all(*self._sets)
+        self.assertEqual(s, self._sets[0] | self._sets[1] | self._sets[2])
+
+    def test_intersect_all(self) -> None:
+        s: SortedFrozenSet = intersect_all(*self._sets)
+        self.assertEqual(list(s), [0, 6, 30, 54])
+
+    def test_lazy_iterators(self) -> None:
+        self.assertEqual(list(union_all(iter([3, 1, 3]), (2, 1))), [1, 2, 3])
+        self.assertEqual(
+            list(intersect_all(self._sets[0], (x for x in [8, 3, 4, 8]))),
+            [4, 8]
+        )
+
+    def test_degenerate(self) -> None:
+        self.assertEqual(union_all(), SortedFrozenSet())
+        self.assertEqual(intersect_all(), SortedFrozenSet())
+        self.assertEqual(intersect_all(self._sets[2]), self._sets[2])
+        self.assertEqual(intersect_all(self._sets[0], []), SortedFrozenSet())
+
+    def test_keeps_storage(self) -> None:
+        a: SortedFrozenSet = SortedFrozenSet(items=[1, 2, 3], typecode='q')
+        b: SortedFrozenSet = SortedFrozenSet(items=[2, 3, 4], typecode='q')
+        self.assertIsInstance(union_all(a, b)._items, array)  # noqa
+        self.assertIsInstance(intersect_all(a, b)._items, array)  # noqa
+        r: SortedFrozenSet = intersect_all(SortedFrozenSet.roaring(items=a),
+                                           SortedFrozenSet.roaring(items=b))
+        self.assertIsInstance(r._items, RoaringStorage)  # noqa
+        self.assertEqual(list(r), [2, 3])
+
+    def test_intersect_all_mixed_with_roaring(self) -> None:
+        # The roaring set consists of bitmap containers, which are costly
+        # to read by position.
+        r: SortedFrozenSet = SortedFrozenSet.roaring(
+            items=range(0, 300000, 3)
+        )
+        plain: SortedFrozenSet = SortedFrozenSet(items=range(0, 300000, 2))
+        s: SortedFrozenSet = intersect_all(r, plain, r[:50000])
+        self.assertNotIsInstance(s._items, RoaringStorage)  # noqa
+        self.assertEqual(s, SortedFrozenSet(items=range(0, 150000, 6)))
+        self.assertEqual(intersect_all(plain, r), r & plain)
+
+
 class SetAlgebraNamedMethodsTestCase(TestCase):
 
     def test_intersection(self) -> None:
@@ -448,6 +735,664 @@ class SetAlgebraNamedMethodsTestCase(TestCase):
         self.assertEqual(s.difference(t), SortedFrozenSet(items={1}))
 
 
+class RangeQueryTestCase(TestCase):
+
+    _set: SortedFrozenSet
+
+    def setUp(self) -> None:
+        self._set = SortedFrozenSet(items=[2, 4, 6, 8, 10])
+
+    def test_bisect(self) -> None:
+        self.assertEqual(self._set.bisect_left(6), 2)
+        self.assertEqual(self._set.bisect_right(6), 3)
+        self.assertEqual(self._set.bisect_left(7), 3)
+
+    def test_rank_select(self) -> None:
+        self.assertEqual(self._set.rank(8), 3)
+        self.assertEqual(self._set.rank(1), 0)
+        self.assertEqual(self._set.select(3), 8)
+        with self.assertRaises(IndexError):
+            _ = self._set.select(5)
+        with self.assertRaises(IndexError):
+            _ = self._set.select(-1)
+
+    def test_floor_ceiling(self) -> None:
+        self.assertEqual(self._set.floor(6), 6)
+        self.assertEqual(self._set.floor(7), 6)
+        self.assertIsNone(self._set.floor(1))
+        self.assertEqual(self._set.ceiling(6), 6)
+        self.assertEqual(self._set.ceiling(7), 8)
+        self.assertIsNone(self._set.ceiling(11))
+
+    def test_lower_higher(self) -> None:
+        self.assertEqual(self._set.lower(6), 4)
+        self.assertIsNone(self._set.lower(2))
+        self.assertEqual(self._set.higher(6), 8)
+        self.assertIsNone(self._set.higher(10))
+
+    def test_irange(self) -> None:
+        self.assertEqual(list(self._set.irange(4, 8)), [4, 6])
+        self.assertEqual(list(self._set.irange(4, 8, inclusive=(False, True))),
+                         [6, 8])
+        self.assertEqual(list(self._set.irange(hi=5)), [2, 4])
+        self.assertEqual(list(self._set.irange(lo=7)), [8, 10])
+        self.assertEqual(list(self._set.irange(9, 3)), [])
+
+    def test_irange_is_view(self) -> None:
+        self.assertIsInstance(self._set.irange(3, 7), SortedFrozenSetView)
+
+
+class KeyOrderTestCase(TestCase):
+    # Following testcases cover the sets ordered by a key function, whose
+    # keys are computed once, and kept in a storage parallel to the items.
+
+    _set: SortedFrozenSet
+    _calls: int
+
+    def _key(self, item: Tuple[str, int]) -> int:
+        self._calls += 1
+        return item[1]
+
+    def setUp(self) -> None:
+        self._calls = 0
+        self._set = SortedFrozenSet(
+            items=[('c', 3), ('a', 1), ('b', 2), ('a', 1), ('z', 2)],
+            key=self._key
+        )
+
+    def test_order(self) -> None:
+        self.assertEqual([item[1] for item in self._set], [1, 2, 2, 3])
+        self.assertEqual(len(self._set), 4)
+
+    def test_key_not_called_for_stored_items(self) -> None:
+        calls: int = self._calls
+        self.assertTrue(('z', 2) in self._set)
+        self.assertFalse(('y', 2) in self._set)
+        self.assertEqual(self._set.index(('c', 3)), 3)
+        self.assertEqual(self._calls - calls, 3)
+
+    def test_range_queries(self) -> None:
+        self.assertEqual(self._set.rank(('?', 2)), 1)
+        self.assertEqual(self._set.bisect_right(('?', 2)), 3)
+        self.assertEqual(self._set.ceiling(('?', 3)), ('c', 3))
+        self.assertEqual(len(self._set.irange(('?', 2), ('?', 3))), 2)
+
+    def test_batch_queries(self) -> None:
+        self.assertEqual(self._set.index_many([('a', 1), ('x', 1)]), [0, -1])
+
+    def test_slice_keeps_key(self) -> None:
+        view: SortedFrozenSet = self._set[2:]
+        self.assertTrue(('c', 3) in view)
+        self.assertEqual(view.index(('c', 3)), 1)
+        self.assertEqual(view.materialize().index(('c', 3)), 1)
+
+    def test_set_algebra_keeps_key(self) -> None:
+        union: SortedFrozenSet = self._set | SortedFrozenSet(items=[('d', 0)])
+        self.assertEqual(union[0], ('d', 0))
+        self.assertEqual(len(self._set - [('a', 1)]), 3)
+        self.assertTrue(self._set > SortedFrozenSet(items=[('a', 1)]))
+
+    def test_equal_keys_in_deterministic_order(self) -> None:
+        # Items with equal keys are ordered regardless of the order, in
+        # which they are presented, even when they are not comparable.
+        for items in ([0, 8, 16, 3], ['x', 1, (2,)]):
+            a: SortedFrozenSet = SortedFrozenSet(items=items,
+                                                 key=lambda x: 0)
+            b: SortedFrozenSet = SortedFrozenSet(items=items[::-1],
+                                                 key=lambda x: 0)
+            self.assertEqual(list(a), list(b))
+            self.assertEqual(a, b)
+            self.assertEqual(hash(a), hash(b))
+        s: SortedFrozenSet = SortedFrozenSet(items=[8, 0],
+                                             key=lambda x: x % 8)
+        self.assertEqual(list(s), [0, 8])
+        self.assertEqual(s, SortedFrozenSet(items=[0, 8],
+                                            key=lambda x: x % 8))
+
+
+class ReverseOrderTestCase(TestCase):
+
+    _set: SortedFrozenSet
+
+    def setUp(self) -> None:
+        self._set = SortedFrozenSet(items=[3, 9, 1, 5, 7], reverse=True)
+
+    def test_order(self) -> None:
+        self.assertEqual(list(self._set), [9, 7, 5, 3, 1])
+        self.assertEqual(list(reversed(self._set)), [1, 3, 5, 7, 9])
+        self.assertEqual(repr(self._set),
+                         'SortedFrozenSet(items=[9, 7, 5, 3, 1])')
+
+    def test_indexing(self) -> None:
+        self.assertEqual(self._set[0], 9)
+        self.assertEqual(self._set[-1], 1)
+        self.assertEqual(self._set.index(7), 1)
+        with self.assertRaises(IndexError):
+            _ = self._set[5]
+        with self.assertRaises(IndexError):
+            _ = self._set[-6]
+
+    def test_slicing(self) -> None:
+        self.assertEqual(list(self._set[1:3]), [7, 5])
+        self.assertEqual(list(self._set[::-2]), [9, 5, 1])
+        self.assertEqual(list(self._set[1:][::2]), [7, 3])
+        self.assertEqual(list(self._set[4:1]), [])
+
+    def test_range_queries(self) -> None:
+        self.assertEqual(self._set.bisect_left(5), 2)
+        self.assertEqual(self._set.bisect_right(5), 3)
+        self.assertEqual(self._set.rank(6), 2)
+        self.assertEqual(self._set.floor(6), 7)
+        self.assertEqual(self._set.ceiling(6), 5)
+        self.assertEqual(self._set.lower(9), None)
+        self.assertEqual(self._set.higher(9), 7)
+        self.assertEqual(list(self._set.irange(8, 3)), [7, 5])
+        self.assertEqual(self._set.rank_many([6, 10, 0]),
+                         [self._set.rank(6), 0, 5])
+        self.assertEqual(self._set.index_many([1, 2, 9]), [4, -1, 0])
+
+    def test_equality(self) -> None:
+        self.assertEqual(self._set,
+                         SortedFrozenSet(items=[1, 3, 5, 7, 9], reverse=True))
+        self.assertNotEqual(self._set, SortedFrozenSet(items=[1, 3, 5, 7, 9]))
+        self.assertEqual(self._set,
+                         SortedFrozenSet(items=[1, 3, 5, 7, 9],
+                                         key=lambda item: -item))
+        self.assertEqual(hash(self._set),
+                         hash(SortedFrozenSet(items=[1, 3, 5, 7, 9],
+                                              key=lambda item: -item)))
+
+    def test_set_algebra(self) -> None:
+        union: SortedFrozenSet = self._set | SortedFrozenSet(items=[4])
+        self.assertEqual(list(union), [9, 7, 5, 4, 3, 1])
+        self.assertTrue(SortedFrozenSet(items=[3, 5]) < self._set)
+
+
+class MembershipFilterTestCase(TestCase):
+
+    _set: SortedFrozenSet
+
+    def setUp(self) -> None:
+        self._set = SortedFrozenSet(items=range(0, 2000, 2))
+
+    def test_no_false_negatives(self) -> None:
+        self._set.build_filter(error_rate=0.05)
+        self.assertTrue(all(item in self._set for item in range(0, 2000, 2)))
+        self.assertEqual(self._set.membership_filter.misses, 1000)
+        self.assertEqual(self._set.membership_filter.false_positives, 0)
+
+    def test_rejects_most_negatives(self) -> None:
+        self._set.build_filter(error_rate=0.01)
+        self.assertFalse(any(item in self._set
+                             for item in range(1, 20001, 2)))
+        bloom: BloomFilter = self._set.membership_filter
+        self.assertEqual(bloom.hits + bloom.false_positives, 10000)
+        self.assertEqual(bloom.misses, bloom.false_positives)
+        self.assertLess(bloom.false_positives, 300)
+
+    def test_lazy(self) -> None:
+        s: SortedFrozenSet = SortedFrozenSet(items=['b', 'a']).build_filter(
+            lazy=True
+        )
+        self.assertFalse(s.membership_filter.built)
+        self.assertTrue('a' in s)
+        self.assertTrue(s.membership_filter.built)
+        self.assertGreater(s.membership_filter.nbytes, 0)
+
+    def test_error_rate(self) -> None:
+        with self.assertRaises(ValueError):
+            self._set.build_filter(error_rate=1.5)
+        small: int = self._set.build_filter(0.1).membership_filter.nbytes
+        large: int = self._set.build_filter(0.001).membership_filter.nbytes
+        self.assertLess(small, large)
+
+
+class BatchQueryTestCase(TestCase):
+
+    _set: SortedFrozenSet
+
+    def setUp(self) -> None:
+        self._set = SortedFrozenSet(items=range(0, 100, 10))
+
+    def test_contains_many(self) -> None:
+        self.assertEqual(self._set.contains_many([50, 5, 90, 100, -1, 0]),
+                         [True, False, True, False, False, True])
+
+    def test_index_many(self) -> None:
+        self.assertEqual(self._set.index_many(iter([90, 15, 0, 90])),
+                         [9, -1, 0, 9])
+
+    def test_rank_many(self) -> None:
+        self.assertEqual(self._set.rank_many([95, 10, -3, 11]), [10, 1, 0, 2])
+
+    def test_empty(self) -> None:
+        self.assertEqual(self._set.contains_many([]), [])
+        self.assertEqual(SortedFrozenSet().index_many([1, 2]), [-1, -1])
+
+    def test_agrees_with_single_queries(self) -> None:
+        keys: List[int] = [k * 7 % 113 for k in range(200)]
+        self.assertEqual(self._set.contains_many(keys),
+                         [k in self._set for k in keys])
+
+    def test_merged_and_searched_batches(self) -> None:
+        # A batch about as large as the set is merged with the storage,
+        # while a much smaller, or a much larger one is searched key by key.
+        items: List[int] = list(range(0, 400, 3))
+        for s in (SortedFrozenSet(items=items),
+                  SortedFrozenSet(items=items, reverse=True),
+                  SortedFrozenSet.compressed(items=items),
+                  SortedFrozenSet.roaring(items=items),
+                  SortedFrozenSet(items=items)[10:-10],
+                  SortedFrozenSet(items=items, key=lambda x: -x)):
+            for size in (5, 100, 3000):
+                keys: List[int] = [k * 37 % 409 - 2 for k in range(size)]
+                self.assertEqual(s.contains_many(keys),
+                                 [k in s for k in keys])
+                self.assertEqual(s.rank_many(keys), list(map(s.rank, keys)))
+                self.assertEqual(s.index_many(keys),
+                                 [s.index(k) if k in s else -1 for k in keys])
+
+
+class CompactStorageTestCase(TestCase):
+    # Following testcases cover the compact storage of homogeneous numeric
+    # items, which is opted into with an array typecode.
+
+    _set: SortedFrozenSet
+
+    def setUp(self) -> None:
+        self._set = SortedFrozenSet(items=[9, 3, 3, 7, 1], typecode='q')
+
+    def test_storage(self) -> None:
+        self.assertIsInstance(self._set._items, array)  # noqa
+        self.assertEqual(list(self._set), [1, 3, 7, 9])
+
+    def test_sequence(self) -> None:
+        self.assertTrue(7 in self._set)
+        self.assertFalse(8 in self._set)
+        self.assertEqual(self._set.index(7), 2)
+        self.assertEqual(self._set.count(3), 1)
+        self.assertEqual(self._set[-1], 9)
+        self.assertEqual(self._set[1:3], SortedFrozenSet(items=[3, 7]))
+
+    def test_equality_and_hash(self) -> None:
+        plain: SortedFrozenSet = SortedFrozenSet(items=[1, 3, 7, 9])
+        self.assertEqual(self._set, plain)
+        self.assertEqual(hash(self._set), hash(plain))
+
+    def test_set_algebra_keeps_storage(self) -> None:
+        other: SortedFrozenSet = SortedFrozenSet(items=[3, 4], typecode='q')
+        union: SortedFrozenSet = self._set | other
+        self.assertEqual(union, SortedFrozenSet(items=[1, 3, 4, 7, 9]))
+        self.assertIsInstance(union._items, array)  # noqa
+        self.assertIsInstance(self._set.difference([3])._items,  # noqa
+                              array)
+        self.assertNotIsInstance(
+            (self._set | SortedFrozenSet(items=[2]))._items, array  # noqa
+        )
+
+    def test_materialize_keeps_storage(self) -> None:
+        s: SortedFrozenSet = self._set[::2].materialize()
+        self.assertIsInstance(s._items, array)  # noqa
+        self.assertEqual(list(s), [1, 7])
+
+    def test_float(self) -> None:
+        s: SortedFrozenSet = SortedFrozenSet(items=[2.5, 0.5], typecode='d')
+        self.assertEqual(list(s), [0.5, 2.5])
+
+
+class CompressedStorageTestCase(TestCase):
+    # Following testcases cover the compressed storage of integers, which is
+    # opted into with the compressed class method.
+
+    _set: SortedFrozenSet
+
+    def setUp(self) -> None:
+        self._set = SortedFrozenSet.compressed(
+            items=[900, 5, 1, 3, 2, 5, 40], block_size=2
+        )
+
+    def test_storage(self) -> None:
+        self.assertIsInstance(self._set._items, DeltaStorage)  # noqa
+        self.assertEqual(list(self._set), [1, 2, 3, 5, 40, 900])
+
+    def test_sequence(self) -> None:
+        self.assertTrue(40 in self._set)
+        self.assertFalse(4 in self._set)
+        self.assertFalse(1000 in self._set)
+        self.assertEqual(self._set.index(40), 4)
+        self.assertEqual(self._set.bisect_right(5), 4)
+        self.assertEqual(list(self._set.irange(lo=2, hi=40)), [2, 3, 5])
+        self.assertEqual(self._set[1:3], SortedFrozenSet(items=[2, 3]))
+
+    def test_search_chosen_once(self) -> None:
+        # Only the compressed storage searches block by block, the plain
+        # storages are searched by the bisect module directly.
+        plain: SortedFrozenSet = SortedFrozenSet(items=[1, 2, 3])
+        self.assertIs(plain._search_left, bisect_left)  # noqa
+        self.assertIs(SortedFrozenSet(items=[1], typecode='q')._search_right,
+                      bisect_right)  # noqa
+        self.assertIsNot(self._set._search_left, bisect_left)  # noqa
+        self.assertEqual(self._set[2:].index(40), 2)
+        self.assertEqual(self._set[2:].bisect_left(41), 3)
+
+    def test_equality_and_hash(self) -> None:
+        plain: SortedFrozenSet = SortedFrozenSet(items=[1, 2, 3, 5, 40, 900])
+        self.assertEqual(self._set, plain)
+        self.assertEqual(hash(self._set), hash(plain))
+
+    def test_set_algebra_keeps_storage(self) -> None:
+        other: SortedFrozenSet = SortedFrozenSet.compressed(items=[3, 4])
+        union: SortedFrozenSet = self._set | other
+        self.assertEqual(list(union), [1, 2, 3, 4, 5, 40, 900])
+        self.assertIsInstance(union._items, DeltaStorage)  # noqa
+        self.assertIsInstance((self._set - other)._items,  # noqa
+                              DeltaStorage)
+        mixed: SortedFrozenSet = self._set & SortedFrozenSet(items=[3, 4])
+        self.assertEqual(list(mixed), [3])
+
+
+class RoaringStorageTestCase(TestCase):
+    # Following testcases cover the roaring storage of integers, which is
+    # opted into with the roaring class method.
+
+    _set: SortedFrozenSet
+
+    def setUp(self) -> None:
+        self._set = SortedFrozenSet.roaring(items=[70000, 5, 1, 3, 3])
+
+    def test_sequence(self) -> None:
+        self.assertIsInstance(self._set._items, RoaringStorage)  # noqa
+        self.assertEqual(list(self._set), [1, 3, 5, 70000])
+        self.assertTrue(70000 in self._set)
+        self.assertFalse(4 in self._set)
+        self.assertEqual(self._set.index(5), 2)
+        self.assertEqual(self._set.bisect_right(5), 3)
+        self.assertEqual(self._set[1:3], SortedFrozenSet(items=[3, 5]))
+
+    def test_equality_and_hash(self) -> None:
+        plain: SortedFrozenSet = SortedFrozenSet(items=[1, 3, 5, 70000])
+        self.assertEqual(self._set, plain)
+        self.assertEqual(hash(self._set), hash(plain))
+        self.assertEqual(self._set, SortedFrozenSet.roaring(items=plain))
+
+    def test_membership(self) -> None:
+        for item in (float('inf'), float('-inf'), float('nan'), 4, 5.5):
+            self.assertNotIn(item, self._set)
+        self.assertIn(5.0, self._set)
+        self.assertEqual(self._set.index(70000), 3)
+        with self.assertRaises(ValueError):
+            self._set.index(4)
+        self.assertEqual(self._set.bisect_left(float('inf')), 4)
+
+    def test_set_algebra_converts_small_operands(self) -> None:
+        # A plain operand is converted only when it is small compared with
+        # the roaring one.
+        other: SortedFrozenSet = SortedFrozenSet(items=[5, 6], typecode='q')
+        large: SortedFrozenSet = SortedFrozenSet.roaring(items=range(10))
+        for result in (large | other, other | large):
+            self.assertEqual(list(result), list(range(10)))
+            self.assertIsInstance(result._items, RoaringStorage)  # noqa
+        self.assertEqual(list(large - [3, 70000]), [0, 1, 2, 4, 5, 6, 7, 8, 9])
+        self.assertEqual(list(large.intersection([3, 5.0])), [3, 5])
+
+    def test_set_algebra_merges_large_operands(self) -> None:
+        other: SortedFrozenSet = SortedFrozenSet(items=[3, 4], typecode='q')
+        for result in (self._set | other, other | self._set):
+            self.assertEqual(list(result), [1, 3, 4, 5, 70000])
+            self.assertNotIsInstance(result._items, RoaringStorage)  # noqa
+        self.assertEqual(list(self._set - [3, 70000]), [1, 5])
+        self.assertEqual(list(self._set ^ other), [1, 4, 5, 70000])
+        self.assertEqual(list(self._set & other), [3])
+
+    def test_set_algebra_with_other_items(self) -> None:
+        union: SortedFrozenSet = self._set | SortedFrozenSet(items=[2.5])
+        self.assertEqual(list(union), [1, 2.5, 3, 5, 70000])
+
+    def test_no_positional_reads(self) -> None:
+        # Every third integer makes up bitmap containers, in which locating
+        # an item by its position takes a search. Reading 100k items one by
+        # one took several seconds, hence the following queries may locate
+        # only a few of the items, e.g., the endpoints, by their positions.
+        large: SortedFrozenSet = SortedFrozenSet.roaring(
+            items=range(0, 300000, 3)
+        )
+        plain: SortedFrozenSet = SortedFrozenSet(items=range(0, 300000, 3))
+        odd: SortedFrozenSet = SortedFrozenSet(items=range(1, 300000, 3))
+        select: Callable = roaring_storage._select_of  # noqa
+        reads: List[int] = []
+
+        def counted(*args) -> int:
+            reads.append(args[-1])
+            return select(*args)
+
+        roaring_storage._select_of = counted
+        try:
+            self.assertTrue(plain <= large)
+            self.assertTrue(large >= plain)
+            self.assertFalse(plain < large)
+            self.assertTrue(odd.isdisjoint(large))
+            self.assertFalse(plain.isdisjoint(large))
+            self.assertTrue(SortedFrozenSet(items=[3, 6]) < large)
+            self.assertEqual(list(large[:50000]), list(range(0, 150000, 3)))
+            self.assertEqual(hash(large[:50000]), hash(plain[:50000]))
+            self.assertEqual(list(reversed(large[10:20])),
+                             list(range(57, 29, -3)))
+            self.assertEqual(list(large[::7]), list(range(0, 300000, 21)))
+            self.assertEqual(len(large.irange(0, 150000)), 50000)
+            self.assertEqual(large[:50000], plain[:50000])
+            self.assertTrue(large[:50000] <= plain)
+            self.assertEqual(len(large[:50000] & plain), 50000)
+            self.assertLess(len(reads), 100)
+        finally:
+            roaring_storage._select_of = select
+
+
+class DerivedVersionTestCase(TestCase):
+
+    _set: SortedFrozenSet
+
+    def setUp(self) -> None:
+        self._set = SortedFrozenSet(items=range(0, 2000, 2))
+
+    def test_with_item(self) -> None:
+        s: SortedFrozenSet = self._set.with_item(7)
+        self.assertEqual(len(s), 1001)
+        self.assertTrue(7 in s)
+        self.assertFalse(7 in self._set)
+        self.assertEqual(s.index(8), 5)
+        self.assertIs(self._set.with_item(8), self._set)
+
+    def test_without_item(self) -> None:
+        s: SortedFrozenSet = self._set.without_item(8)
+        self.assertEqual(len(s), 999)
+        self.assertFalse(8 in s)
+        self.assertIs(self._set.without_item(7), self._set)
+
+    def test_chained_versions(self) -> None:
+        s: SortedFrozenSet = self._set
+        for item in range(1, 100, 2):
+            s = s.with_item(item)
+        s = s.without_item(0)
+        self.assertEqual(list(s[:5]), [1, 2, 3, 4, 5])
+        self.assertEqual(s, SortedFrozenSet(
+            items=[k for k in range(2000) if k % 2 == 0 or k < 100][1:]
+        ))
+
+    def test_with_items(self) -> None:
+        s: SortedFrozenSet = self._set.with_items([3, 5, 4])
+        self.assertEqual(list(s[:6]), [0, 2, 3, 4, 5, 6])
+        t: SortedFrozenSet = self._set.with_items(range(1, 2000, 2))
+        self.assertEqual(t, SortedFrozenSet(items=range(2000)))
+
+    def test_set_algebra_on_derived(self) -> None:
+        s: SortedFrozenSet = self._set.with_item(3)
+        self.assertEqual(s - self._set, SortedFrozenSet(items=[3]))
+        self.assertTrue(self._set < s)
+
+    def test_reverse_and_key(self) -> None:
+        r: SortedFrozenSet = SortedFrozenSet(items=[1, 5], reverse=True)
+        self.assertEqual(list(r.with_item(3)), [5, 3, 1])
+        k: SortedFrozenSet = SortedFrozenSet(items=[1, 5], key=lambda x: -x)
+        self.assertEqual(list(k.with_item(3).without_item(5)), [3, 1])
+
+
+class InternPoolTestCase(TestCase):
+
+    _pool: SetInternPool
+
+    def setUp(self) -> None:
+        self._pool = SetInternPool(maxsize=2)
+
+    def test_equal_sets_are_shared(self) -> None:
+        s: SortedFrozenSet = self._pool.intern(items=[3, 1, 2])
+        t: SortedFrozenSet = self._pool.intern(
+            items=SortedFrozenSet(items=[1, 2, 3])
+        )
+        self.assertIs(s, t)
+        self.assertEqual((self._pool.hits, self._pool.misses), (1, 1))
+
+    def test_unequal_sets_are_distinct(self) -> None:
+        s: SortedFrozenSet = self._pool.intern(items=[1, 2])
+        t: SortedFrozenSet = self._pool.intern(items=[1, 3])
+        self.assertIsNot(s, t)
+        self.assertEqual(len(self._pool), 2)
+        self.assertEqual(self._pool.misses, 2)
+
+    def test_views_are_materialized(self) -> None:
+        view: SortedFrozenSet = SortedFrozenSet(items=range(1000))[10:12]
+        s: SortedFrozenSet = self._pool.intern(items=view)
+        self.assertNotIsInstance(s, SortedFrozenSetView)
+        self.assertEqual(len(s._items), 2)  # noqa
+        self.assertEqual(s, view)
+        self.assertIs(self._pool.intern(items=view), s)
+
+    def test_evicted_sets_are_released(self) -> None:
+        for i in range(5):
+            _ = self._pool.intern(items=[i])
+        self.assertEqual(len(self._pool), 2)
+
+    def test_referenced_sets_outlive_eviction(self) -> None:
+        s: SortedFrozenSet = self._pool.intern(items=[42])
+        for i in range(5):
+            _ = self._pool.intern(items=[i])
+        self.assertIs(self._pool.intern(items=[42]), s)
+
+    def test_clear(self) -> None:
+        _ = self._pool.intern(items=[1])
+        self._pool.clear()
+        self.assertEqual(len(self._pool), 0)
+        self.assertEqual(self._pool.misses, 0)
+
+    def test_class_method(self) -> None:
+        self.assertIs(SortedFrozenSet.intern(items=(7, 8)),
+                      SortedFrozenSet.intern(items=[8, 7]))
+
+
+class MappedStorageTestCase(TestCase):
+
+    _dir: TemporaryDirectory
+    _path: str
+
+    def setUp(self) -> None:
+        self._dir = TemporaryDirectory()
+        self._path = os.path.join(self._dir.name, 'set.sfs')
+
+    def tearDown(self) -> None:
+        self._dir.cleanup()
+
+    def _reopen(self, s: SortedFrozenSet) -> SortedFrozenSet:
+        s.save(path=self._path)
+        return SortedFrozenSet.open_mmap(path=self._path)
+
+    def test_numeric_queries(self) -> None:
+        m: SortedFrozenSet = self._reopen(
+            SortedFrozenSet(items=range(0, 30, 3), typecode='i')
+        )
+        self.assertIsInstance(m._items, memoryview)  # noqa
+        self.assertEqual(m, SortedFrozenSet(items=range(0, 30, 3)))
+        self.assertIn(9, m)
+        self.assertNotIn(10, m)
+        self.assertEqual(m.index(9), 3)
+        self.assertEqual(list(m[2:5]), [6, 9, 12])
+        self.assertEqual(list(m.irange(lo=10, hi=20)), [12, 15, 18])
+
+    def test_boxed_numbers(self) -> None:
+        m: SortedFrozenSet = self._reopen(SortedFrozenSet(items=[5, -1, 3]))
+        self.assertEqual(list(m), [-1, 3, 5])
+        m = self._reopen(SortedFrozenSet(items=[0.5, 2.5]))
+        self.assertEqual(list(m), [0.5, 2.5])
+
+    def test_strings_and_bytes(self) -> None:
+        m: SortedFrozenSet = self._reopen(
+            SortedFrozenSet(items=['pear', '', 'äpfel'])
+        )
+        self.assertEqual(list(m), ['', 'pear', 'äpfel'])
+        self.assertEqual(m.index('pear'), 1)
+        m = self._reopen(SortedFrozenSet(items=[b'b', b'a']))
+        self.assertIn(b'a', m)
+
+    def test_reverse_order(self) -> None:
+        m: SortedFrozenSet = self._reopen(
+            SortedFrozenSet(items=[1, 2, 3], reverse=True)
+        )
+        self.assertEqual(list(m), [3, 2, 1])
+
+    def test_set_algebra(self) -> None:
+        m: SortedFrozenSet = self._reopen(SortedFrozenSet(items=[1, 2, 3]))
+        self.assertEqual(m | SortedFrozenSet(items=[4]),
+                         SortedFrozenSet(items=[1, 2, 3, 4]))
+        self.assertEqual(list(m.with_item(0)), [0, 1, 2, 3])
+
+    def test_unsupported_items(self) -> None:
+        with self.assertRaises(TypeError):
+            SortedFrozenSet(items=[1, 'a'], key=str).save(path=self._path)
+        with self.assertRaises(TypeError):
+            SortedFrozenSet(items=[(1, 2)]).save(path=self._path)
+
+    def test_not_a_set_file(self) -> None:
+        with open(self._path, 'wb') as file:
+            file.write(bytes(32))
+        with self.assertRaises(ValueError):
+            SortedFrozenSet.open_mmap(path=self._path)
+
+
+class PicklingTestCase(TestCase):
+
+    def _round_trips(self, s: SortedFrozenSet) -> None:
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            t: SortedFrozenSet = pickle.loads(
+                pickle.dumps(s, protocol=protocol)
+            )
+            self.assertIs(type(t), SortedFrozenSet)
+            self.assertEqual(list(t), list(s))
+            self.assertEqual(t, s)
+
+    def test_round_trips(self) -> None:
+        self._round_trips(SortedFrozenSet(items=[3, 1, 2]))
+        self._round_trips(SortedFrozenSet(items=['b', 'a']))
+        self._round_trips(SortedFrozenSet(items=range(5), typecode='q'))
+        self._round_trips(SortedFrozenSet(items=[1, 2], reverse=True))
+        self._round_trips(SortedFrozenSet(items=[-2, 1], key=abs))
+        self._round_trips(SortedFrozenSet(items=range(9))[1:8:2])
+        self._round_trips(SortedFrozenSet(items=[1]).with_item(0))
+
+    def test_storage_kind_is_kept(self) -> None:
+        s: SortedFrozenSet = SortedFrozenSet(items=range(100))
+        self.assertIsInstance(pickle.loads(pickle.dumps(s))._items,  # noqa
+                              range)
+
+    def test_out_of_band_buffer(self) -> None:
+        s: SortedFrozenSet = SortedFrozenSet(items=range(1000), typecode='q')
+        buffers: List[pickle.PickleBuffer] = []
+        data: bytes = pickle.dumps(s, protocol=5,
+                                   buffer_callback=buffers.append)
+        self.assertEqual(len(buffers), 1)
+        self.assertLess(len(data), 1000)
+        t: SortedFrozenSet = pickle.loads(data, buffers=buffers)
+        self.assertIsInstance(t._items, memoryview)  # noqa
+        self.assertEqual(t, s)
+
+
 class SetProtocolTestCase(TestCase):
 
     def test_protocol(self) -> None:
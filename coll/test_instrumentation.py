@@ -0,0 +1,156 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import unittest
+from unittest import TestCase
+from typing import Any, Dict, List
+from threading import Thread
+from frozen_set import SortedFrozenSet
+import instrumentation
+from instrumentation import InstrumentationStats
+
+
+class InstrumentationTestCase(TestCase):
+
+    _methods: Dict[str, Any]
+
+    def setUp(self) -> None:
+        self._methods = dict(SortedFrozenSet.__dict__)
+
+    def tearDown(self) -> None:
+        instrumentation.disable()
+
+    def test_disabled_by_default(self) -> None:
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertEqual(instrumentation.snapshot().methods, {})
+
+    def test_disable_restores_original_methods(self) -> None:
+        instrumentation.enable()
+        self.assertTrue(instrumentation.is_enabled())
+        self.assertIsNot(SortedFrozenSet.__dict__['__contains__'],
+                         self._methods['__contains__'])
+        instrumentation.disable()
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertEqual(dict(SortedFrozenSet.__dict__), self._methods)
+
+    def test_counts_calls_and_volume(self) -> None:
+        instrumentation.enable()
+        s: SortedFrozenSet = SortedFrozenSet(items=[3, 1, 2, 3])
+        for item in range(5):
+            _ = item in s
+        _ = s.issubset([1, 2, 3, 4])
+        stats: InstrumentationStats = instrumentation.snapshot()
+        self.assertEqual(stats.methods['__init__'].calls, 1)
+        self.assertEqual(stats.methods['__init__'].items, 3)
+        self.assertEqual(stats.methods['__contains__'].calls, 5)
+        self.assertEqual(stats.methods['__contains__'].items, 15)
+        self.assertEqual(stats.methods['issubset'].calls, 1)
+        self.assertEqual(stats.methods['issubset'].items, 7)
+        self.assertGreaterEqual(stats.methods['issubset'].seconds, 0.0)
+
+    def test_classmethod_constructors(self) -> None:
+        instrumentation.enable()
+        s: SortedFrozenSet = SortedFrozenSet.from_sorted(items=[1, 1, 2])
+        self.assertEqual(s, SortedFrozenSet(items=[1, 2]))
+        stats: InstrumentationStats = instrumentation.snapshot()
+        self.assertEqual(stats.methods['from_sorted'].calls, 1)
+        self.assertEqual(stats.methods['from_sorted'].items, 2)
+
+    def test_snapshot_is_a_copy(self) -> None:
+        instrumentation.enable()
+        _ = SortedFrozenSet(items=[1])
+        stats: InstrumentationStats = instrumentation.snapshot()
+        _ = SortedFrozenSet(items=[2])
+        self.assertEqual(stats.methods['__init__'].calls, 1)
+        self.assertEqual(
+            instrumentation.snapshot().methods['__init__'].calls, 2
+        )
+        instrumentation.reset()
+        self.assertEqual(instrumentation.snapshot().methods, {})
+
+    def test_rebuilds(self) -> None:
+        instrumentation.enable()
+        for _ in range(3):
+            _ = SortedFrozenSet(items=[2, 1])
+        _ = SortedFrozenSet(items=[1, 2], reverse=True)
+        # Sets built internally, e.g., the operand of the union, do not
+        # count as rebuilds.
+        _ = SortedFrozenSet(items=[1]).union([1, 2])
+        self.assertEqual(instrumentation.snapshot().rebuilds, 2)
+
+    def test_shared_storage_is_not_a_rebuild(self) -> None:
+        instrumentation.enable()
+        s: SortedFrozenSet = SortedFrozenSet(items=range(10 ** 7))
+        copies: List[SortedFrozenSet] = [SortedFrozenSet(items=s)
+                                         for _ in range(3)]
+        self.assertIs(copies[0]._items, s._items)  # noqa
+        self.assertEqual(instrumentation.snapshot().rebuilds, 0)
+
+    def test_fingerprints_are_bounded(self) -> None:
+        limit: int = instrumentation._MAX_FINGERPRINTS  # noqa
+        instrumentation._MAX_FINGERPRINTS = 4  # noqa
+        try:
+            instrumentation.enable()
+            for item in range(6):
+                _ = SortedFrozenSet(items=[item])
+            # The first contents have been forgotten by now.
+            _ = SortedFrozenSet(items=[0])
+            _ = SortedFrozenSet(items=[5])
+            stats: InstrumentationStats = instrumentation.snapshot()
+            self.assertEqual(stats.rebuilds, 1)
+            self.assertEqual(len(stats._built), 4)  # noqa
+        finally:
+            instrumentation._MAX_FINGERPRINTS = limit  # noqa
+
+    def test_rehashes(self) -> None:
+        instrumentation.enable()
+        s: SortedFrozenSet = SortedFrozenSet(items=[1, 2])
+        counts: Dict[SortedFrozenSet, int] = {s: 0}
+        counts[s] += 1
+        self.assertEqual(instrumentation.snapshot().rehashes, 0)
+        for _ in range(3):
+            counts[SortedFrozenSet(items=[1, 2])] += 1
+        stats: InstrumentationStats = instrumentation.snapshot()
+        self.assertEqual(stats.rehashes, 3)
+        # Each augmented assignment hashes its key twice, but only the
+        # first hash of each set is computed, rather than cached.
+        self.assertEqual(stats.methods['__hash__'].calls, 9)
+
+    def test_scopes(self) -> None:
+        s: SortedFrozenSet = SortedFrozenSet(items=[1, 2])
+        with instrumentation.instrumented() as outer:
+            self.assertTrue(instrumentation.is_enabled())
+            _ = 1 in s
+            with instrumentation.instrumented() as inner:
+                _ = 2 in s
+        _ = 3 in s
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertEqual(dict(SortedFrozenSet.__dict__), self._methods)
+        self.assertEqual(outer.methods['__contains__'].calls, 2)
+        self.assertEqual(inner.methods['__contains__'].calls, 1)
+
+    def test_scope_ignores_other_threads(self) -> None:
+        def build() -> None:
+            for item in range(100):
+                _ = SortedFrozenSet(items=[item])
+
+        with instrumentation.instrumented() as stats:
+            thread: Thread = Thread(target=build)
+            thread.start()
+            thread.join()
+            _ = SortedFrozenSet(items=[1])
+        self.assertEqual(stats.methods['__init__'].calls, 1)
+
+    def test_scope_within_enabled(self) -> None:
+        instrumentation.enable()
+        with instrumentation.instrumented() as stats:
+            _ = SortedFrozenSet(items=[1])
+        self.assertTrue(instrumentation.is_enabled())
+        self.assertEqual(stats.methods['__init__'].calls, 1)
+        self.assertEqual(
+            instrumentation.snapshot().methods['__init__'].calls, 1
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
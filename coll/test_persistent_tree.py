@@ -0,0 +1,90 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import unittest
+from unittest import TestCase
+from typing import List
+import persistent_tree
+from persistent_tree import PersistentTree
+
+
+class PersistentTreeTestCase(TestCase):
+    # Following testcases shrink the leaves to 4 items, and the nodes to 3
+    # children, hence even the short inputs build trees of several levels.
+
+    _leaf_size: int
+    _fanout: int
+
+    def setUp(self) -> None:
+        self._leaf_size = persistent_tree._LEAF_SIZE  # noqa
+        self._fanout = persistent_tree._FANOUT  # noqa
+        persistent_tree._LEAF_SIZE = 4  # noqa
+        persistent_tree._FANOUT = 3  # noqa
+
+    def tearDown(self) -> None:
+        persistent_tree._LEAF_SIZE = self._leaf_size  # noqa
+        persistent_tree._FANOUT = self._fanout  # noqa
+
+    def test_build(self) -> None:
+        t: PersistentTree = PersistentTree(items=range(50))
+        self.assertEqual(len(t), 50)
+        self.assertEqual(list(t), list(range(50)))
+        self.assertEqual([t[k] for k in range(-50, 50)],
+                         list(range(50)) * 2)
+        with self.assertRaises(IndexError):
+            _ = t[50]
+
+    def test_slice(self) -> None:
+        t: PersistentTree = PersistentTree(items=range(50))
+        self.assertEqual(t[7:23], tuple(range(7, 23)))
+        self.assertEqual(t[40:], tuple(range(40, 50)))
+        self.assertEqual(t[::10], (0, 10, 20, 30, 40))
+
+    def test_insert(self) -> None:
+        t: PersistentTree = PersistentTree()
+        expected: List[int] = []
+        for item in [k * 37 % 101 for k in range(101)]:
+            t = t.insert(item)
+            expected.append(item)
+            self.assertEqual(len(t), len(expected))
+        self.assertEqual(list(t), list(range(101)))
+
+    def test_insert_present(self) -> None:
+        t: PersistentTree = PersistentTree(items=range(10))
+        self.assertIs(t.insert(5), t)
+
+    def test_remove(self) -> None:
+        t: PersistentTree = PersistentTree(items=range(60))
+        for item in range(0, 60, 2):
+            t = t.remove(item)
+        self.assertEqual(list(t), list(range(1, 60, 2)))
+        for item in range(1, 60, 2):
+            t = t.remove(item)
+        self.assertEqual(len(t), 0)
+        self.assertEqual(list(t), [])
+
+    def test_remove_missing(self) -> None:
+        t: PersistentTree = PersistentTree(items=range(10))
+        self.assertIs(t.remove(50), t)
+        self.assertIs(t.remove(-1), t)
+
+    def test_versions_are_independent(self) -> None:
+        t: PersistentTree = PersistentTree(items=range(0, 40, 2))
+        u: PersistentTree = t.insert(15)
+        v: PersistentTree = t.remove(20)
+        self.assertEqual(list(t), list(range(0, 40, 2)))
+        self.assertEqual(list(u), sorted(list(range(0, 40, 2)) + [15]))
+        self.assertEqual(list(v), [k for k in range(0, 40, 2) if k != 20])
+
+    def test_structural_sharing(self) -> None:
+        t: PersistentTree = PersistentTree(items=range(100))
+        u: PersistentTree = t.insert(1000)
+        shared: int = sum(
+            a is b for a, b in zip(t._root.children,  # noqa
+                                   u._root.children)  # noqa
+        )
+        self.assertEqual(shared, len(t._root.children) - 1)  # noqa
+
+
+if __name__ == '__main__':
+    unittest.main()
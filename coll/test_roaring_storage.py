@@ -0,0 +1,79 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import unittest
+from unittest import TestCase
+from typing import List
+import pickle
+from roaring_storage import RoaringStorage
+
+
+class RoaringStorageTestCase(TestCase):
+    # Following testcases use items, which make containers of each kind, a
+    # sparse array, a long run, and a dense bitmap, under different high
+    # bits, including the negative ones.
+
+    _items: List[int]
+    _storage: RoaringStorage
+
+    def setUp(self) -> None:
+        self._items = ([-70000, -3, 5, 700] + list(range(65536, 70000))
+                       + list(range(131072, 196608, 3)))
+        self._storage = RoaringStorage(items=self._items)
+
+    def test_kinds(self) -> None:
+        self.assertEqual(list(self._storage._kinds), [0, 0, 0, 2, 1])  # noqa
+
+    def test_items(self) -> None:
+        self.assertEqual(len(self._storage), len(self._items))
+        self.assertEqual(list(self._storage), self._items)
+        self.assertEqual(list(reversed(self._storage)), self._items[::-1])
+        for k in range(-len(self._items), len(self._items), 97):
+            self.assertEqual(self._storage[k], self._items[k])
+        with self.assertRaises(IndexError):
+            _ = self._storage[len(self._items)]
+
+    def test_slice(self) -> None:
+        self.assertEqual(self._storage[2:5000], tuple(self._items[2:5000]))
+        self.assertEqual(self._storage[::-101], tuple(self._items[::-101]))
+
+    def test_contains_and_rank(self) -> None:
+        for item in (-70000, 5, 66000, 131075, 700.0):
+            self.assertIn(item, self._storage)
+        for item in (-4, 6, 70000, 131073, 5.5):
+            self.assertNotIn(item, self._storage)
+        self.assertEqual(self._storage.rank(65536), 4)
+        self.assertEqual(self._storage.rank(65536, right=True), 5)
+        self.assertEqual(self._storage.rank(4.5), 2)
+        self.assertEqual(self._storage.rank(10 ** 9), len(self._items))
+
+    def test_non_finite(self) -> None:
+        # Infinities, and NaNs compare with the integers as they do in a
+        # tuple, rather than raising.
+        for item in (float('inf'), float('-inf'), float('nan')):
+            self.assertNotIn(item, self._storage)
+        self.assertEqual(self._storage.rank(float('inf')), len(self._items))
+        self.assertEqual(self._storage.rank(float('-inf'), right=True), 0)
+        self.assertEqual(self._storage.rank(float('nan')), 0)
+        self.assertEqual(self._storage.rank(float('nan'), right=True),
+                         len(self._items))
+
+    def test_set_algebra(self) -> None:
+        other: List[int] = list(range(-10, 140000, 7))
+        storage: RoaringStorage = RoaringStorage(items=other)
+        a: set = set(self._items)
+        b: set = set(other)
+        self.assertEqual(list(self._storage & storage), sorted(a & b))
+        self.assertEqual(list(self._storage | storage), sorted(a | b))
+        self.assertEqual(list(self._storage - storage), sorted(a - b))
+        self.assertEqual(list(self._storage ^ storage), sorted(a ^ b))
+        self.assertEqual(self._storage - storage,
+                         RoaringStorage(items=sorted(a - b)))
+
+    def test_pickle(self) -> None:
+        self.assertEqual(pickle.loads(pickle.dumps(self._storage)),
+                         self._storage)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import unittest
+from unittest import TestCase
+from typing import List
+from tempfile import TemporaryDirectory
+import os
+from frozen_set import SortedFrozenSet
+from set_builder import SortedFrozenSetBuilder
+
+
+class SortedFrozenSetBuilderTestCase(TestCase):
+    # Following testcases cover the spilling of sorted runs to disk, which
+    # the builder does after every 8 distinct items.
+
+    _dir: TemporaryDirectory
+    _path: str
+    _builder: SortedFrozenSetBuilder
+
+    def setUp(self) -> None:
+        self._dir = TemporaryDirectory()
+        self._path = os.path.join(self._dir.name, 'set.sfs')
+        self._builder = SortedFrozenSetBuilder(max_items=8,
+                                               dir=self._dir.name)
+
+    def tearDown(self) -> None:
+        self._dir.cleanup()
+
+    def test_spills_runs(self) -> None:
+        items: List[int] = [(k * 37) % 101 for k in range(100)]
+        self._builder.extend(items)
+        self.assertEqual(self._builder.runs, 12)
+        self.assertEqual(self._builder.spilled, 96)
+        s: SortedFrozenSet = self._builder.finish(path=self._path)
+        self.assertIsInstance(s._items, memoryview)  # noqa
+        self.assertEqual(s, SortedFrozenSet(items=items))
+
+    def test_duplicates_across_runs(self) -> None:
+        for k in range(50):
+            self._builder.add(k % 10)
+        self.assertEqual(list(self._builder.finish()), list(range(10)))
+
+    def test_strings(self) -> None:
+        words: List[str] = [str(k % 30) for k in range(100)]
+        self._builder.extend(words)
+        s: SortedFrozenSet = self._builder.finish(path=self._path)
+        self.assertEqual(s, SortedFrozenSet(items=words))
+
+    def test_without_spilling(self) -> None:
+        self._builder.extend([3, 1, 2, 1])
+        self.assertEqual(self._builder.runs, 0)
+        self.assertEqual(list(self._builder.finish(path=self._path)),
+                         [1, 2, 3])
+
+    def test_reset_after_finish(self) -> None:
+        self._builder.extend(range(20))
+        _ = self._builder.finish()
+        self.assertEqual(self._builder.runs, 0)
+        self._builder.add(5)
+        self.assertEqual(list(self._builder.finish()), [5])
+
+    def test_different_kinds(self) -> None:
+        self._builder.extend(range(8))
+        with self.assertRaises(TypeError):
+            self._builder.extend(map(str, range(8)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import unittest
+from unittest import TestCase
+from typing import List, MutableSet, Sequence, Hashable
+from sorted_set import SortedSet
+from frozen_set import SortedFrozenSet
+
+
+class ConstructionTestCase(TestCase):
+
+    def test_construct_no_args(self) -> None:
+        self.assertEqual(len(SortedSet()), 0)
+
+    def test_construct_from_list(self) -> None:
+        s: SortedSet = SortedSet(items=[4, 1, 6, 1, 10])
+        self.assertEqual(list(s), [1, 4, 6, 10])
+
+    def test_construct_from_sorted_frozen_set(self) -> None:
+        s: SortedSet = SortedSet(items=SortedFrozenSet(items=[3, 2, 1]))
+        self.assertEqual(list(s), [1, 2, 3])
+
+    def test_protocol(self) -> None:
+        self.assertTrue(issubclass(SortedSet, MutableSet))
+        self.assertTrue(issubclass(SortedSet, Sequence))
+        self.assertFalse(issubclass(SortedSet, Hashable))
+
+
+class MutationTestCase(TestCase):
+    # Following testcases cover the insertions, and the removals, which
+    # split and merge the sublists at a load factor of 4.
+
+    _set: SortedSet
+    _expected: List[int]
+
+    def setUp(self) -> None:
+        self._set = SortedSet()
+        self._set._load = 4  # noqa
+        self._expected = []
+
+    def test_add(self) -> None:
+        for item in [k * 37 % 101 for k in range(101)]:
+            self._set.add(item)
+            self._set.add(item)
+        self.assertEqual(list(self._set), list(range(101)))
+        self.assertEqual(len(self._set), 101)
+        self.assertTrue(len(self._set._lists) > 1)  # noqa
+
+    def test_discard(self) -> None:
+        self._set.update(range(50))
+        for item in range(0, 60, 3):
+            self._set.discard(item)
+        self.assertEqual(list(self._set),
+                         [k for k in range(50) if k % 3 != 0])
+        self.assertEqual(len(self._set), 33)
+
+    def test_remove_missing(self) -> None:
+        with self.assertRaises(KeyError):
+            self._set.remove(1)
+
+    def test_update(self) -> None:
+        self._set.update([5, 3], range(10, 0, -2))
+        self._set.update([7])
+        self.assertEqual(list(self._set), [2, 3, 4, 5, 6, 7, 8, 10])
+
+    def test_pop(self) -> None:
+        self._set.update(range(10))
+        self.assertEqual(self._set.pop(), 9)
+        self.assertEqual(self._set.pop(0), 0)
+        self.assertEqual(list(self._set), list(range(1, 9)))
+
+    def test_clear_and_copy(self) -> None:
+        self._set.update(range(10))
+        c: SortedSet = self._set.copy()
+        self._set.clear()
+        self.assertEqual(len(self._set), 0)
+        self.assertEqual(list(c), list(range(10)))
+
+    def test_in_place_operators(self) -> None:
+        self._set.update(range(10))
+        self._set -= {1, 2, 3}
+        self._set |= {20}
+        self.assertEqual(list(self._set), [0, 4, 5, 6, 7, 8, 9, 20])
+
+
+class QueryTestCase(TestCase):
+
+    _set: SortedSet
+
+    def setUp(self) -> None:
+        self._set = SortedSet()
+        self._set._load = 4  # noqa
+        self._set.update(range(0, 100, 5))
+
+    def test_contains(self) -> None:
+        self.assertTrue(35 in self._set)
+        self.assertFalse(36 in self._set)
+        self.assertFalse(200 in self._set)
+
+    def test_indexing(self) -> None:
+        self.assertEqual(self._set[0], 0)
+        self.assertEqual(self._set[7], 35)
+        self.assertEqual(self._set[-1], 95)
+        with self.assertRaises(IndexError):
+            _ = self._set[20]
+
+    def test_slicing(self) -> None:
+        self.assertEqual(list(self._set[2:5]), [10, 15, 20])
+        self.assertEqual(list(self._set[3::-1]), [0, 5, 10, 15])
+
+    def test_index(self) -> None:
+        self.assertEqual(self._set.index(45), 9)
+        with self.assertRaises(ValueError):
+            _ = self._set.index(46)
+
+    def test_reversed(self) -> None:
+        self.assertEqual(list(reversed(self._set)),
+                         list(range(95, -1, -5)))
+
+    def test_range_queries(self) -> None:
+        self.assertEqual(self._set.bisect_left(45), 9)
+        self.assertEqual(self._set.bisect_right(45), 10)
+        self.assertEqual(self._set.rank(46), 10)
+        self.assertEqual(self._set.select(10), 50)
+        self.assertEqual(self._set.floor(44), 40)
+        self.assertEqual(self._set.ceiling(44), 45)
+        self.assertEqual(self._set.lower(40), 35)
+        self.assertEqual(self._set.higher(40), 45)
+        self.assertIsNone(self._set.higher(95))
+        self.assertEqual(list(self._set.irange(12, 33)), [15, 20, 25, 30])
+        self.assertEqual(list(self._set.irange(33, 12)), [])
+
+    def test_batch_queries(self) -> None:
+        self.assertEqual(self._set.contains_many([5, 6]), [True, False])
+        self.assertEqual(self._set.index_many([95, 6]), [19, -1])
+        self.assertEqual(self._set.rank_many([6, 100]), [2, 20])
+
+    def test_equality(self) -> None:
+        self.assertEqual(self._set, SortedSet(items=range(0, 100, 5)))
+        self.assertEqual(self._set, SortedFrozenSet(items=range(0, 100, 5)))
+        self.assertNotEqual(self._set, SortedSet(items=range(0, 100, 10)))
+
+
+class FreezeTestCase(TestCase):
+
+    def test_freeze(self) -> None:
+        s: SortedSet = SortedSet()
+        s._load = 4  # noqa
+        s.update(range(30, 0, -1))
+        f: SortedFrozenSet = s.freeze()
+        self.assertIsInstance(f, SortedFrozenSet)
+        self.assertEqual(f, SortedFrozenSet(items=range(1, 31)))
+
+    def test_freeze_is_independent(self) -> None:
+        s: SortedSet = SortedSet(items=[1, 2])
+        f: SortedFrozenSet = s.freeze()
+        s.add(3)
+        self.assertEqual(list(f), [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
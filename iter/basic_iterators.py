@@ -1,7 +1,10 @@
 # pylint: disable=missing-module-docstring
 
-from typing import List, Iterator, Any, Sequence
+from typing import List, Iterator, Iterable, Any, Sequence, Union, \
+    Callable, Dict
 from argparse import ArgumentParser, Namespace
+from array import array
+from functools import lru_cache
 
 
 def _is_perfect_length(seq: Sequence) -> bool:
@@ -17,136 +20,207 @@ def _is_perfect_length(seq: Sequence) -> bool:
     return ((n + 1) & n == 0) and (n != 0)
 
 
-def _left_child_index_of(idx: int) -> int:
-    """Returns the index of the left child of the element in the provided
-    index.
+def _pre_order_indices(n: int) -> Iterator[int]:
+    """Generates the indices of a perfect binary tree of n nodes in the
+    preorder. Numbering the nodes from 1 instead, the left child of the node
+    k is 2k, and its right child is 2k+1, i.e., the binary digits of k spell
+    out the path from the root. After a leaf, the traversal continues with
+    the right sibling of the closest ancestor, which is a left child. That
+    ancestor is found by stripping the trailing ones off k, hence no stack is
+    needed.
 
-    :param idx: Provided index of a given element
-    :type: int
-    :return: Index of the left child
-    :rtype: int
+    :param n: Number of nodes, which is 2^h-1
+    :type n: int
+    :return: Indices in the preorder
+    :rtype: Iterator[int]
     """
-    return 2 * idx + 1
+    half: int = (n + 1) >> 1
+    k: int = 1
+    while True:
+        yield k - 1
+        if k < half:
+            k <<= 1
+            continue
+        # The number of trailing ones is the position of the lowest bit,
+        # which differs between k and k+1.
+        k >>= (k ^ (k + 1)).bit_length() - 1
+        if not k:
+            return
+        k |= 1
 
 
-def _right_child_index_of(idx: int) -> int:
-    """Returns the index of the right child of the element in the provided
-    index.
+def _in_order_indices(n: int) -> Iterator[int]:
+    """Generates the indices of a perfect binary tree of n nodes in the
+    inorder. The j-th node of the inorder, counting from 1, has the height t
+    of the number of trailing zeros of j, and is the (j >> t+1)-th node of
+    its level, hence each index follows from j in a closed form. Every odd j
+    is a leaf, hence the leaves, and the inner nodes simply alternate.
 
-    :param idx: Provided index of a given element
-    :type: int
-    :return: Index of the right child
-    :rtype: int
+    :param n: Number of nodes, which is 2^h-1
+    :type n: int
+    :return: Indices in the inorder
+    :rtype: Iterator[int]
     """
-    return 2 * idx + 2
+    half: int = (n + 1) >> 1
+    leaf: int = half - 1
+    for j in range(2, n + 1, 2):
+        yield leaf
+        leaf += 1
+        t: int = (j & -j).bit_length() - 1
+        yield (half >> t) + (j >> (t + 1)) - 1
+    yield leaf
 
 
-class LevelOrderIterator:
-    _seq: Sequence
-    _idx: int
+def _post_order_indices(n: int) -> Iterator[int]:
+    """Generates the indices of a perfect binary tree of n nodes in the
+    postorder. Numbering the nodes from 1, a right child, i.e., an odd k, is
+    followed by its parent, and a left child is followed by the leftmost
+    leaf under its right sibling, which is the sibling shifted down to the
+    level of the leaves.
 
-    def __init__(self, seq: Sequence) -> None:
-        if not _is_perfect_length(seq=seq):
-            raise ValueError(f'Sequence of length {len(seq)} does not '
-                             f'represent a perfect binary tree')
-        self._seq = seq
-        self._idx = 0
+    :param n: Number of nodes, which is 2^h-1
+    :type n: int
+    :return: Indices in the postorder
+    :rtype: Iterator[int]
+    """
+    half: int = (n + 1) >> 1
+    height: int = half.bit_length()
+    k: int = half
+    while True:
+        yield k - 1
+        if k == 1:
+            return
+        if k & 1:
+            k >>= 1
+        else:
+            k += 1
+            k <<= height - k.bit_length()
 
-    def __next__(self) -> Any:
-        if self._idx >= len(self._seq):
-            raise StopIteration
-        res: Any = self._seq[self._idx]
-        self._idx += 1
-        return res
 
-    def __iter__(self) -> Iterator:
-        return self
+# Generators of the indices by the name of the traversal order.
+_ORDERS: Dict[str, Callable[[int], Iterable[int]]] = {
+    'level': range,
+    'pre': _pre_order_indices,
+    'in': _in_order_indices,
+    'post': _post_order_indices,
+}
+
+# Permutations of trees larger than this are generated on every traversal
+# instead of being cached, because each one takes 4 bytes per node.
+_MAX_CACHED_LENGTH: int = 1 << 24
 
 
-class PreOrderIterator:
-    """For the preorder traversal we need a stack to keep track of the indices.
-    Python does not have a stack out of the box. However, we can simulate one
-    using the ist methods.
+@lru_cache(maxsize=32)
+def _cached_permutation(order: str, n: int) -> array:
+    """Returns the indices of a perfect binary tree of n nodes in the given
+    order, packed into an array. The most recently used permutations are
+    cached, so that repeated traversals of trees of the same size reuse them
+    instead of generating them again.
+
+    :param order: Name of the traversal order
+    :type order: str
+    :param n: Number of nodes, which is 2^h-1
+    :type n: int
+    :return: Indices in the given order
+    :rtype: array
     """
+    return array('I', _ORDERS[order](n))
 
-    _seq: Sequence
-    _stack: List[int]
 
-    def __init__(self, seq: Sequence) -> None:
-        if not _is_perfect_length(seq=seq):
-            raise ValueError(f'Sequence of length {len(seq)} does not '
-                             f'represent a perfect binary tree')
-        self._seq = seq
-        self._stack = [0]
+def _permutation(order: str, n: int) -> Iterable[int]:
+    """Returns the indices of a perfect binary tree of n nodes in the given
+    order, which are cached, unless the tree is too large, or the order is
+    the level order, i.e., the identity.
 
-    def __iter__(self) -> Iterator:
-        return self
+    :param order: Name of the traversal order
+    :type order: str
+    :param n: Number of nodes, which is 2^h-1
+    :type n: int
+    :return: Indices in the given order
+    :rtype: Iterable[int]
+    """
+    if order not in _ORDERS:
+        raise ValueError(f'Unsupported traversal order {order!r}')
+    if order == 'level' or n > _MAX_CACHED_LENGTH:
+        return _ORDERS[order](n)
+    return _cached_permutation(order=order, n=n)
 
-    def __next__(self) -> Any:
-        # Exit condition - If the stack is empty, we have no more elements to
-        # iterate over.
-        if len(self._stack) == 0:
-            raise StopIteration
-        idx: int = self._stack.pop()
-        res: Any = self._seq[idx]
-        # Ensure preorder traversal by first pushing the right child index,
-        # followed by the left child to the left child index to the stack.
-        # Because the sack is LIFO data structure, while popping from the stack
-        # in the next call, we'd get the left child index first, followed by the
-        # right child index in the subsequent call.
-        right_idx: int = _right_child_index_of(idx)
-        if right_idx < len(self._seq):
-            self._stack.append(right_idx)
-        left_idx: int = _left_child_index_of(idx)
-        if left_idx < len(self._seq):
-            self._stack.append(left_idx)
-        return res
-
-
-class InOrderIterator:
-    """For the inorder traversal we need a stack to keep track of the indices.
-    Python does not have a stack out of the box. However, we can simulate one
-    using the ist methods.
+
+def traverse(seq: Sequence, order: str = 'in') -> Union[List, array]:
+    """Returns all the elements of a perfect binary tree, which is
+    represented by the level order sequence of its nodes, in the given order
+    at once. The elements are gathered through the cached permutation of the
+    order, hence repeated traversals of trees of the same size cost a single
+    pass over the permutation. An array is traversed into an array of the
+    same typecode, and any other sequence into a list.
+
+    :param seq: Level order sequence of the nodes
+    :type seq: Sequence
+    :param order: One of level, pre, in, and post
+    :type order: str
+    :return: Elements in the given order
+    :rtype: Union[List, array]
     """
+    if not _is_perfect_length(seq=seq):
+        raise ValueError(f'Sequence of length {len(seq)} does not '
+                         f'represent a perfect binary tree')
+    items: Iterator = map(seq.__getitem__, _permutation(order=order,
+                                                        n=len(seq)))
+    if isinstance(seq, array):
+        return array(seq.typecode, items)
+    return list(items)
 
-    _seq: Sequence
-    _stack: List[int]
-    _idx: int
+
+class _TreeIterator:
+    """Base of the iterators over a perfect binary tree, which is represented
+    by the level order sequence of its nodes. Each traversal is an order of
+    the indices of the sequence, which is generated by a tight generator, or
+    a closed-form formula, rather than a stack of indices, and cached for
+    the subsequent traversals of trees of the same size. The elements are
+    looked up through the map builtin, hence the traversal runs at the speed
+    of the iteration over the indices, without any attribute lookups per
+    element.
+    """
+
+    _order: str
+    _it: Iterator
 
     def __init__(self, seq: Sequence) -> None:
         if not _is_perfect_length(seq=seq):
             raise ValueError(f'Sequence of length {len(seq)} does not '
                              f'represent a perfect binary tree')
-        self._seq = seq
-        self._stack = []
-        self._idx = 0
+        self._it = map(seq.__getitem__, _permutation(order=self._order,
+                                                     n=len(seq)))
 
     def __iter__(self) -> Iterator:
         return self
 
     def __next__(self) -> Any:
-        # Exit condition - Now we have a more complex exit condition. We keep
-        # track of the currently running index as well as the stack, and we
-        # exit, iff stack is empty and the index is out of bound of the
-        # sequence.
-        if len(self._stack) == 0 and self._idx >= len(self._seq):
-            raise StopIteration
-        # We iteratively look for the left child in each subtree from our
-        # sequence, using the _idx attribute, and we'd stop only when the
-        # _idx goes out of bound of the sequence. This iteration would
-        # stop, when we reach the left most leaf node of a subtree.
-        while self._idx < len(self._seq):
-            self._stack.append(self._idx)
-            self._idx = _left_child_index_of(self._idx)
-        # When we have reached at the leaf node, and now we pop the
-        # last pushed index from the stack, and corresponding, and we are going
-        # to yield the corresponding element.
-        idx: int = self._stack.pop()
-        res: Any = self._seq[idx]
-        # Finally, we are going to point right child index of the retrieved
-        # index to he _idx attribute, which the Iterator keep track of.
-        self._idx = _right_child_index_of(idx)
-        return res
+        return next(self._it)
+
+
+class LevelOrderIterator(_TreeIterator):
+    """The level order is the order of the sequence itself."""
+
+    _order = 'level'
+
+
+class PreOrderIterator(_TreeIterator):
+    """Visits each node before its left, and right subtree."""
+
+    _order = 'pre'
+
+
+class InOrderIterator(_TreeIterator):
+    """Visits each node between its left, and right subtree."""
+
+    _order = 'in'
+
+
+class PostOrderIterator(_TreeIterator):
+    """Visits each node after its left, and right subtree."""
+
+    _order = 'post'
 
 
 if __name__ == '__main__':
@@ -218,5 +292,18 @@ if __name__ == '__main__':
         joined: str = ' '.join(in_itr)
         print(f'Expression joined using the InOrderIterator as Iterable: '
               f'{joined}')
+    elif args.target == 'post_order_iterable':
+        #                   *
+        #           +               -
+        #       a       b       c       d
+        #      [*   +   -   a   b   c   d] <- This is the level order expression
+        #      [a   b   +   c   d   -   *] <- This is the postorder expression
+        # The result of the PostOrderIterator is the Postfix notation, i.e.,
+        # the Reverse Polish notation of the expression.
+        print('Demonstrate PostOrderIterator as an Iterable')
+        post_itr: PostOrderIterator = PostOrderIterator(seq=iter_exp)
+        joined: str = ' '.join(post_itr)
+        print(f'Expression joined using the PostOrderIterator as Iterable: '
+              f'{joined}')
     else:
         raise ValueError('Unsupported value provided as argument')
@@ -0,0 +1,151 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import unittest
+from unittest import TestCase
+from typing import List, Iterator, Any, Sequence
+from array import array
+import basic_iterators
+from basic_iterators import LevelOrderIterator, PreOrderIterator, \
+    InOrderIterator, PostOrderIterator, traverse
+
+
+def _pre_order(seq: Sequence, idx: int = 0) -> List[Any]:
+    if idx >= len(seq):
+        return []
+    return ([seq[idx]] + _pre_order(seq, 2 * idx + 1)
+            + _pre_order(seq, 2 * idx + 2))
+
+
+def _in_order(seq: Sequence, idx: int = 0) -> List[Any]:
+    if idx >= len(seq):
+        return []
+    return (_in_order(seq, 2 * idx + 1) + [seq[idx]]
+            + _in_order(seq, 2 * idx + 2))
+
+
+def _post_order(seq: Sequence, idx: int = 0) -> List[Any]:
+    if idx >= len(seq):
+        return []
+    return (_post_order(seq, 2 * idx + 1) + _post_order(seq, 2 * idx + 2)
+            + [seq[idx]])
+
+
+class TreeIteratorTestCase(TestCase):
+    # Following testcases compare the iterators against the recursive
+    # definitions of the traversals over the perfect binary trees of the
+    # heights 1 to 12.
+
+    _expression: List[str]
+
+    def setUp(self) -> None:
+        self._expression = ['*', '+', '-', 'a', 'b', 'c', 'd']
+
+    def test_expression(self) -> None:
+        self.assertEqual(' '.join(LevelOrderIterator(self._expression)),
+                         '* + - a b c d')
+        self.assertEqual(' '.join(PreOrderIterator(self._expression)),
+                         '* + a b - c d')
+        self.assertEqual(' '.join(InOrderIterator(self._expression)),
+                         'a + b * c - d')
+        self.assertEqual(' '.join(PostOrderIterator(self._expression)),
+                         'a b + c d - *')
+
+    def test_orders(self) -> None:
+        for height in range(1, 13):
+            seq: List[int] = list(range(2 ** height - 1))
+            self.assertEqual(list(LevelOrderIterator(seq)), seq)
+            self.assertEqual(list(PreOrderIterator(seq)), _pre_order(seq))
+            self.assertEqual(list(InOrderIterator(seq)), _in_order(seq))
+            self.assertEqual(list(PostOrderIterator(seq)), _post_order(seq))
+
+    def test_iterator_protocol(self) -> None:
+        for cls in (LevelOrderIterator, PreOrderIterator, InOrderIterator,
+                    PostOrderIterator):
+            it: Iterator = cls(self._expression)
+            self.assertIs(iter(it), it)
+            first: Any = next(it)
+            self.assertEqual([first] + list(it), list(cls(self._expression)))
+            with self.assertRaises(StopIteration):
+                next(it)
+
+    def test_imperfect_length(self) -> None:
+        for cls in (LevelOrderIterator, PreOrderIterator, InOrderIterator,
+                    PostOrderIterator):
+            for seq in ([], [1, 2], list(range(6))):
+                with self.assertRaises(ValueError):
+                    cls(seq)
+
+
+class TraverseTestCase(TestCase):
+    # Following testcases cover the bulk traversal, and the cache of the
+    # permutations behind it.
+
+    def setUp(self) -> None:
+        basic_iterators._cached_permutation.cache_clear()  # noqa
+
+    def test_orders(self) -> None:
+        for height in range(1, 11):
+            seq: List[int] = list(range(2 ** height - 1))
+            self.assertEqual(traverse(seq, 'level'), seq)
+            self.assertEqual(traverse(seq, 'pre'), _pre_order(seq))
+            self.assertEqual(traverse(seq), _in_order(seq))
+            self.assertEqual(traverse(seq, 'post'), _post_order(seq))
+
+    def test_result_types(self) -> None:
+        self.assertEqual(traverse('*+-abcd', 'pre'),
+                         ['*', '+', 'a', 'b', '-', 'c', 'd'])
+        result: array = traverse(array('d', [4.0, 2.0, 6.0]), 'in')
+        self.assertIsInstance(result, array)
+        self.assertEqual(result.typecode, 'd')
+        self.assertEqual(list(result), [2.0, 4.0, 6.0])
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            traverse([1, 2, 3], 'zigzag')
+        with self.assertRaises(ValueError):
+            traverse([1, 2], 'in')
+
+    def test_permutations_cached(self) -> None:
+        cached: Any = basic_iterators._cached_permutation  # noqa
+        traverse(list(range(15)), 'pre')
+        list(PreOrderIterator(list(range(15))))
+        traverse(list(range(15)), 'post')
+        info: Any = cached.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 2))
+        perm: array = cached(order='pre', n=15)
+        self.assertEqual(perm.typecode, 'I')
+        # The level order is the identity, which is never cached.
+        traverse(list(range(15)), 'level')
+        self.assertEqual(cached.cache_info().currsize, 2)
+
+    def test_cache_evicts_least_recent(self) -> None:
+        cached: Any = basic_iterators._cached_permutation  # noqa
+        maxsize: int = cached.cache_info().maxsize
+        keys: List[Any] = [(order, height) for height in range(1, 12)
+                           for order in ('pre', 'in', 'post')]
+        self.assertGreater(len(keys), maxsize)
+        for order, height in keys:
+            traverse(list(range(2 ** height - 1)), order)
+        self.assertEqual(cached.cache_info().currsize, maxsize)
+        # The first permutation has been evicted, the last one has not.
+        traverse([1], 'pre')
+        traverse(list(range(2 ** 11 - 1)), 'post')
+        info: Any = cached.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, len(keys) + 1))
+
+    def test_large_trees_not_cached(self) -> None:
+        limit: int = basic_iterators._MAX_CACHED_LENGTH  # noqa
+        basic_iterators._MAX_CACHED_LENGTH = 7  # noqa
+        try:
+            seq: List[int] = list(range(15))
+            self.assertEqual(traverse(seq, 'post'), _post_order(seq))
+            self.assertEqual(
+                basic_iterators._cached_permutation.cache_info().currsize, 0
+            )  # noqa
+        finally:
+            basic_iterators._MAX_CACHED_LENGTH = limit  # noqa
+
+
+if __name__ == '__main__':
+    unittest.main()